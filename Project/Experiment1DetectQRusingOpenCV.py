@@ -2,6 +2,10 @@
 import cv2
 import numpy as np
 import mvsdk
+import detector_pool
+import decoders
+from denoise import NoiseGatedDenoiser
+from stage_timer import StageTimers, enabled_from_env
 import time
 import platform
 import ctypes
@@ -126,6 +130,12 @@ crosshair_colors = [
     (0, 255, 0),    # Warna hijau untuk crosshair 3
 ]
 
+# Denoise hanya saat noise sensor tinggi, dengan anggaran waktu, pada area QR frame sebelumnya.
+# QR_STAGE_TIMERS=1 mencetak waktu tahap noise/denoise/detect saat keluar.
+timers = StageTimers(enabled_from_env())
+denoiser = NoiseGatedDenoiser(threshold=6.0, budget_ms=5.0, timers=timers)
+qr_box = None
+
 last_qr_print_time = 0
 last_no_qr_print_time = 0
 qr_print_interval = 0.5 # Interval waktu untuk mencetak informasi QR code (dalam detik)
@@ -154,14 +164,15 @@ while (cv2.waitKey(1) & 0xFF) != 27: # use ESC to exit
 		frame = np.frombuffer(frame_data, dtype=np.uint8)
 		frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3) )
 
-		# Hapus denoising, atau lakukan hanya di interval tertentu
-		if frame_count % 30 == 0:
-			frame = cv2.fastNlMeansDenoisingColored(frame, None, 10, 10, 7, 21)
-
 		if frame_count % 0.5 == 0:  # Hanya lakukan deteksi QR setiap 10 frame
-			qr_code_detector = cv2.QRCodeDetector()
+			qr_code_detector = detector_pool.get("opencv")
 			gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)  # QR lebih baik di grayscale
+			# Pengganti fastNlMeansDenoisingColored pada frame warna penuh
+			gray = denoiser.denoise(gray, qr_box)
+			t = timers.start()
 			decoded_text, points, _ = qr_code_detector.detectAndDecode(gray)
+			timers.lap("detect", t)
+			qr_box = decoders.crop_box(gray.shape, points, pad=1.0) if points is not None else None
 
 			current_time = time.time()  
 			# Check if QR code was detected in the original image
@@ -189,6 +200,9 @@ while (cv2.waitKey(1) & 0xFF) != 27: # use ESC to exit
 		if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
 			print("CameraGetImageBuffer failed({}): {}".format(e.error_code, e.message) )
 
+if timers.enabled:
+	timers.dump()
+
 # Matikan Kamera
 mvsdk.CameraUnInit(hCamera)
 
@@ -2,6 +2,7 @@
 import cv2
 import numpy as np
 import mvsdk
+import detector_pool
 import time
 import platform
 import ctypes
@@ -106,7 +107,7 @@ while (cv2.waitKey(1) & 0xFF) != 27:
 
         # Deteksi QR setiap 30 frame
         if frame_count % 1 == 0:
-            qr_code_detector = cv2.QRCodeDetector()
+            qr_code_detector = detector_pool.get("opencv")
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             _, otsu_thresh = cv2.threshold(gray,81,255,cv2.THRESH_TOZERO_INV+cv2.THRESH_OTSU)
             decoded_text, points, _ = qr_code_detector.detectAndDecode(otsu_thresh)
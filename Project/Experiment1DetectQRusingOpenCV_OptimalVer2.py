@@ -2,6 +2,10 @@
 import cv2
 import numpy as np
 import mvsdk
+import detector_pool
+import decoders
+from denoise import NoiseGatedDenoiser
+from stage_timer import StageTimers, enabled_from_env
 import time
 import platform
 import ctypes
@@ -95,6 +99,12 @@ def draw_crosshairs(frame, crosshair_positions, crosshair_colors):
 
 crosshair_positions = [(640, 512), (426, 341), (853, 682)]
 crosshair_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0)]
+# Denoise hanya saat noise sensor tinggi, dengan anggaran waktu, pada area QR frame sebelumnya.
+# QR_STAGE_TIMERS=1 mencetak waktu tahap noise/denoise/detect saat keluar.
+timers = StageTimers(enabled_from_env())
+denoiser = NoiseGatedDenoiser(threshold=6.0, budget_ms=5.0, timers=timers)
+qr_box = None
+
 last_qr_print_time = 0
 last_no_qr_print_time = 0
 qr_print_interval = 0.5
@@ -106,15 +116,16 @@ while (cv2.waitKey(1) & 0xFF) != 27:
             continue
         displayed_frame = frame.copy()
 
-    # Hanya lakukan denoising di interval tertentu
-    if frame_count % 120 == 0:
-        displayed_frame = cv2.fastNlMeansDenoisingColored(displayed_frame, None, 10, 10, 7, 21)
-
     # Deteksi QR setiap 30 frame
     if frame_count % 30 == 0:
-        qr_code_detector = cv2.QRCodeDetector()
+        qr_code_detector = detector_pool.get("opencv")
         gray = cv2.cvtColor(displayed_frame, cv2.COLOR_BGR2GRAY)
+        # Pengganti fastNlMeansDenoisingColored pada frame warna penuh
+        gray = denoiser.denoise(gray, qr_box)
+        t = timers.start()
         decoded_text, points, _ = qr_code_detector.detectAndDecode(gray)
+        timers.lap("detect", t)
+        qr_box = decoders.crop_box(gray.shape, points, pad=1.0) if points is not None else None
 
         current_time = time.time()
         if decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
@@ -136,6 +147,9 @@ while (cv2.waitKey(1) & 0xFF) != 27:
 
     frame_count += 1
 
+if timers.enabled:
+    timers.dump()
+
 # Matikan Kamera
 mvsdk.CameraUnInit(hCamera)
 
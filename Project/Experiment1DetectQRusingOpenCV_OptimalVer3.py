@@ -1,11 +1,14 @@
 # Modifikasi optimasi untuk mengurangi lag dengan threading
 import cv2
-import numpy as np
 import mvsdk
+import detector_pool
+import decoders
+from denoise import NoiseGatedDenoiser
+from stage_timer import StageTimers, enabled_from_env
 import time
-import platform
 import ctypes
 import threading
+import frame_ring
 
 # Kamera inisialisasi
 DevList = mvsdk.CameraEnumerateDevice()
@@ -63,31 +66,16 @@ mvsdk.CameraSetGamma(hCamera, gamma_value)
 contrast_value = 152  # Sesuaikan dengan nilai yang diinginkan
 mvsdk.CameraSetContrast(hCamera, contrast_value)
 
-# Frame Buffer
-FrameBufferSize = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if modeMono else 3)
-pFrameBuffer = mvsdk.CameraAlignMalloc(FrameBufferSize, 16)
+# Frame Buffer: beberapa slot, capture tidak pernah menimpa frame yang sedang diproses
+ring = frame_ring.FrameRing.for_camera(cap, modeMono, n_slots=4)
 
-# Fungsi untuk pengambilan frame di thread terpisah
-frame = None
-lock = threading.Lock()
+# Fungsi untuk pengambilan frame di thread terpisah, berhenti saat stop_capture di-set
+stop_capture = threading.Event()
 
 def capture_frame():
-    global frame
-    while True:
+    while not stop_capture.is_set():
         try:
-            pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, 200)
-            mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
-            mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
-
-            if platform.system() == "Windows":
-                mvsdk.CameraFlipFrameBuffer(pFrameBuffer, FrameHead, 1)
-            
-            frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
-            captured_frame = np.frombuffer(frame_data, dtype=np.uint8)
-            captured_frame = captured_frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
-
-            with lock:
-                frame = captured_frame
+            frame_ring.grab(hCamera, ring, 200)
 
         except mvsdk.CameraException as e:
             if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
@@ -108,51 +96,69 @@ def draw_crosshairs(frame, crosshair_positions, crosshair_colors):
 
 crosshair_positions = [(640, 512), (426, 341), (853, 682)]
 crosshair_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0)]
+# Denoise hanya saat noise sensor tinggi, dengan anggaran waktu, pada area QR frame sebelumnya.
+# QR_STAGE_TIMERS=1 mencetak waktu tahap noise/denoise/detect saat keluar.
+timers = StageTimers(enabled_from_env())
+denoiser = NoiseGatedDenoiser(threshold=6.0, budget_ms=5.0, timers=timers)
+qr_box = None
+
 last_qr_print_time = 0
 last_no_qr_print_time = 0
 qr_print_interval = 0.5
 frame_count = 0
 
 while (cv2.waitKey(1) & 0xFF) != 27:
-    with lock:
-        if frame is None:
-            continue
-        displayed_frame = frame.copy()
-
-    # Hanya lakukan denoising di interval tertentu
-    if frame_count % 120 == 0:
-        displayed_frame = cv2.fastNlMeansDenoisingColored(displayed_frame, None, 10, 10, 7, 21)
-
-    # Deteksi QR setiap 30 frame
-    if frame_count % 30 == 0:
-        qr_code_detector = cv2.QRCodeDetector()
-        gray = cv2.cvtColor(displayed_frame, cv2.COLOR_BGR2GRAY)
-        decoded_text, points, _ = qr_code_detector.detectAndDecode(gray)
-
-        current_time = time.time()
-        if decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
-            print(f"QR Code detected: {decoded_text}")
-            last_qr_print_time = time.time()
-            last_no_qr_print_time = time.time()
-        elif not decoded_text and (time.time() - last_no_qr_print_time) >= qr_print_interval:
-            print("No QR Code detected")
-            last_no_qr_print_time = time.time()
-
-    # Memanggil fungsi crosshairs
-    draw_crosshairs(displayed_frame, crosshair_positions, crosshair_colors)
-
-    # Jika perlu, resize gambar sebelum ditampilkan
-    displayed_frame = cv2.resize(displayed_frame, (640, 480))
+    slot = ring.get(timeout=0.1)
+    if slot is None:
+        continue
+
+    # Slot dipegang sampai blok selesai, frame dibaca langsung tanpa copy
+    with slot:
+        displayed_frame = slot.frame
+
+        # Deteksi QR setiap 30 frame
+        if frame_count % 30 == 0:
+            qr_code_detector = detector_pool.get("opencv")
+            gray = cv2.cvtColor(displayed_frame, cv2.COLOR_BGR2GRAY)
+            # Pengganti fastNlMeansDenoisingColored pada frame warna penuh
+            gray = denoiser.denoise(gray, qr_box)
+            t = timers.start()
+            decoded_text, points, _ = qr_code_detector.detectAndDecode(gray)
+            timers.lap("detect", t)
+            qr_box = decoders.crop_box(gray.shape, points, pad=1.0) if points is not None else None
+
+            current_time = time.time()
+            if decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
+                print(f"QR Code detected: {decoded_text}")
+                last_qr_print_time = time.time()
+                last_no_qr_print_time = time.time()
+            elif not decoded_text and (time.time() - last_no_qr_print_time) >= qr_print_interval:
+                print("No QR Code detected")
+                last_no_qr_print_time = time.time()
+
+        # Memanggil fungsi crosshairs
+        draw_crosshairs(displayed_frame, crosshair_positions, crosshair_colors)
+
+        # Jika perlu, resize gambar sebelum ditampilkan
+        displayed_frame = cv2.resize(displayed_frame, (640, 480))
 
     # Hanya tampilkan satu channel warna
     cv2.imshow("Press ESC to end", displayed_frame[:,:,2])
 
     frame_count += 1
 
+if timers.enabled:
+    timers.dump()
+
+# Hentikan thread capture sebelum kamera dan buffer ring dilepas: grab() yang sedang berjalan masih
+# menulis ke slot ring
+stop_capture.set()
+thread.join()
+
 # Matikan Kamera
 mvsdk.CameraUnInit(hCamera)
 
 # Lepaskan cache frame
-mvsdk.CameraAlignFree(pFrameBuffer)
+ring.close()
 
 cv2.destroyAllWindows()
\ No newline at end of file
@@ -1,9 +1,12 @@
 import cv2
-import numpy as np
 import mvsdk
+import detector_pool
+import decoders
+from denoise import NoiseGatedDenoiser
+from stage_timer import StageTimers, enabled_from_env
 import time
-import platform
 import threading
+import frame_ring
 
 # Inisialisasi Kamera
 DevList = mvsdk.CameraEnumerateDevice()
@@ -61,9 +64,8 @@ mvsdk.CameraSetGamma(hCamera, gamma_value)
 contrast_value = 200  # Sesuaikan dengan nilai yang diinginkan
 mvsdk.CameraSetContrast(hCamera, contrast_value)
 
-# Frame Buffer
-FrameBufferSize = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if modeMono else 3)
-pFrameBuffer = mvsdk.CameraAlignMalloc(FrameBufferSize, 16)
+# Frame Buffer: beberapa slot, capture tidak pernah menimpa frame yang sedang diproses
+ring = frame_ring.FrameRing.for_camera(cap, modeMono, n_slots=4)
 
 # Crosshairs
 def draw_crosshairs(frame, crosshair_positions, crosshair_colors):
@@ -76,37 +78,47 @@ def draw_crosshairs(frame, crosshair_positions, crosshair_colors):
 
 crosshair_positions = [(640, 512), (426, 341), (853, 682)]
 crosshair_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0)]
+# Denoise hanya saat noise sensor tinggi, dengan anggaran waktu, pada area QR frame sebelumnya.
+# QR_STAGE_TIMERS=1 mencetak waktu tahap noise/denoise/detect saat keluar.
+timers = StageTimers(enabled_from_env())
+denoiser = NoiseGatedDenoiser(threshold=6.0, budget_ms=5.0, timers=timers)
+qr_box = None
+
 last_qr_print_time = 0
 last_no_qr_print_time = 0
 qr_print_interval = 0.5
 frame_count = 0
 previous_decoded_text = ""
 
-# Fungsi Multithreading
+# Fungsi Multithreading, kedua thread berhenti saat stop_threads di-set
+stop_threads = threading.Event()
+
 def capture_frame():
-    global frame
-    while True:
-        pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, 100)  # Timeout dikurangi
-        mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
-        mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
-        frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
-        frame = np.frombuffer(frame_data, dtype=np.uint8).reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+    while not stop_threads.is_set():
+        try:
+            frame_ring.grab(hCamera, ring, 100)  # Timeout dikurangi
+        except mvsdk.CameraException as e:
+            if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                print("CameraGetImageBuffer failed({}): {}".format(e.error_code, e.message))
 
 def process_frame():
-    global frame_count, previous_decoded_text, last_qr_print_time, last_no_qr_print_time
-    while True:
-        if frame is not None:
-            # Denoising jika ada noise yang signifikan
-            if frame_count % 60 == 0:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                noise_level = np.std(gray)
-                if noise_level > 50:  # Threshold
-                    frame = cv2.fastNlMeansDenoisingColored(frame, None, 10, 10, 7, 21)
-
+    global frame_count, previous_decoded_text, last_qr_print_time, last_no_qr_print_time, qr_box
+    while not stop_threads.is_set():
+        slot = ring.get(timeout=0.1)
+        if slot is None:
+            continue
+        with slot:
+            frame = slot.frame
             # Deteksi QR di setiap frame dengan adaptif
-            qr_code_detector = cv2.QRCodeDetector()
+            qr_code_detector = detector_pool.get("opencv")
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            # Denoising jika ada noise yang signifikan: sigma noise sensor (bukan np.std adegan),
+            # filter murah sesuai anggaran hanya pada area QR frame sebelumnya
+            gray = denoiser.denoise(gray, qr_box)
+            t = timers.start()
             decoded_text, points, _ = qr_code_detector.detectAndDecode(gray)
+            timers.lap("detect", t)
+            qr_box = decoders.crop_box(gray.shape, points, pad=1.0) if points is not None else None
 
             current_time = time.time()
             if decoded_text != previous_decoded_text:
@@ -138,7 +150,15 @@ processing_thread.start()
 while (cv2.waitKey(1) & 0xFF) != 27:
     pass
 
+if timers.enabled:
+    timers.dump()
+
+# Hentikan thread sebelum kamera dan buffer ring dilepas: grab() yang sedang berjalan masih menulis ke slot ring
+stop_threads.set()
+frame_thread.join()
+processing_thread.join()
+
 # Matikan Kamera dan bersihkan resources
 mvsdk.CameraUnInit(hCamera)
-mvsdk.CameraAlignFree(pFrameBuffer)
+ring.close()
 cv2.destroyAllWindows()
\ No newline at end of file
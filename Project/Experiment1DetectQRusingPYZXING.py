@@ -4,7 +4,7 @@ import mvsdk
 import time
 import platform
 import threading
-import pyzxing
+import decoders
 
 # Inisialisasi Kamera
 DevList = mvsdk.CameraEnumerateDevice()
@@ -83,8 +83,8 @@ qr_print_interval = 0.5
 frame_count = 0
 previous_decoded_text = ""
 
-# Inisialisasi ZXing reader
-reader = pyzxing.BarCodeReader()
+# Inisialisasi ZXing reader (zxing-cpp di dalam proses, tanpa file PNG dan JVM per frame)
+reader = decoders.create("zxing")
 
 # Fungsi Multithreading
 def capture_frame():
@@ -107,12 +107,9 @@ def process_frame():
                 if noise_level > 50:  # Threshold
                     frame = cv2.fastNlMeansDenoisingColored(frame, None, 10, 10, 7, 21)
 
-            # Simpan sementara frame sebagai file untuk diproses oleh pyzxing
-            cv2.imwrite("temp_frame.png", frame)
-
-            # Deteksi QR menggunakan ZXing
-            result = reader.decode("temp_frame.png")
-            decoded_text = result[0]['raw'] if result else ""
+            # Deteksi QR menggunakan ZXing langsung dari buffer frame
+            gray = frame[:, :, 0] if frame.shape[2] == 1 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            decoded_text = reader.decode(gray).text
 
             current_time = time.time()
 
@@ -1,10 +1,10 @@
 import cv2
 import numpy as np
 import mvsdk
+import detector_pool
 import time
 import platform
 import ctypes
-import qreader  # Import qreader
 
 # Kamera inisialisasi
 DevList = mvsdk.CameraEnumerateDevice()
@@ -77,7 +77,7 @@ qr_print_interval = 0.5
 frame_count = 0
 
 # Buat objek QReader
-qr_reader = qreader.QReader()
+qr_reader = detector_pool.get("qreader")
 
 while (cv2.waitKey(1) & 0xFF) != 27:
     try:
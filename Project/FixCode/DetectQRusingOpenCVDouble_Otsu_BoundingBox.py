@@ -1,7 +1,13 @@
 # Modifikasi optimasi untuk mengurangi lag
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 import mvsdk
+import decoders
+from qr_tracker import MultiTracker
 import time
 import platform
 import ctypes
@@ -82,6 +88,9 @@ def draw_crosshairs(frame, crosshair_positions, crosshair_colors):
 
 crosshair_positions = [(640, 512), (426, 341), (853, 682)]
 crosshair_colors = [(0, 0, 255), (255, 0, 0), (0, 255, 0)]
+# Semua kode dalam satu pass detectAndDecodeMulti, masing-masing dengan track sendiri (produk dua label)
+qr_decoder = decoders.create("opencv_multi")
+tracks = MultiTracker()
 last_qr_print_time = 0
 last_no_qr_print_time = 0
 qr_print_interval = 0.5
@@ -106,24 +115,24 @@ while (cv2.waitKey(1) & 0xFF) != 27:
 
         # Deteksi QR setiap 30 frame
         if frame_count % 1 == 0:
-            qr_code_detector = cv2.QRCodeDetector()
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            ret,th = cv2.threshold(gray,81,255,cv2.THRESH_BINARY+cv2.THRESH_OTSU)
-            ret_qr, decoded_text, points, _ = qr_code_detector.detectAndDecodeMulti(th)
+            gray = frame[:, :, 0] if frame.shape[2] == 1 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            results = qr_decoder.decode_all(gray)
+            decoded_text = [r.text for r in results if r.text]
 
-            current_time = time.time()
-
-            if points is not None:
-                # Menggambar bounding box jika QR Code terdeteksi
-                points = points[0].astype(int)  # Koordinat harus dalam bentuk integer
+            for track, _ in tracks.update(results, FrameHead.uiTimeStamp / 10000.0):
+                # Menggambar bounding box setiap QR Code yang terdeteksi
+                points = track.quad.astype(int)  # Koordinat harus dalam bentuk integer
                 for j in range(len(points)):
                     pt1 = tuple(points[j])
                     pt2 = tuple(points[(j + 1) % len(points)])  # Loop ke titik awal
                     cv2.line(frame, pt1, pt2, (255, 0, 255), 2)  # Warna Kotak
+                cv2.putText(frame, str(track.id), tuple(points[0]), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 0, 255), 2)
+                if track.text_acquired:
+                    # Setiap kode dicetak sekali per track, bukan setiap frame
+                    print(f"QR Code detected (track {track.id}): ")
+                    print(f"{track.text}")
 
             if decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
-                print("QR Code detected: ")
-                print(f"{decoded_text}")
                 last_qr_print_time = time.time()
                 last_no_qr_print_time = time.time()
             elif not decoded_text and (time.time() - last_no_qr_print_time) >= qr_print_interval:
@@ -1,7 +1,12 @@
 # Modifikasi optimasi untuk mengurangi lag
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 import mvsdk
+import detector_pool
 import time
 import platform
 import ctypes
@@ -106,7 +111,7 @@ while (cv2.waitKey(1) & 0xFF) != 27:
 
         # Deteksi QR setiap 30 frame
         if frame_count % 1 == 0:
-            qr_code_detector = cv2.QRCodeDetector()
+            qr_code_detector = detector_pool.get("opencv")
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             ret,th = cv2.threshold(gray,0,255,cv2.THRESH_BINARY+cv2.THRESH_OTSU)
             decoded_text, points, _ = qr_code_detector.detectAndDecode(th)
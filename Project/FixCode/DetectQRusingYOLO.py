@@ -1,12 +1,17 @@
 # Modifikasi optimasi untuk mengurangi lag
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 import mvsdk
+import detector_pool
+import dnn_localizer
 import time
 import platform
 import ctypes
 import threading
-import qreader  # Import qreader
 
 # Kamera inisialisasi
 DevList = mvsdk.CameraEnumerateDevice()
@@ -88,6 +93,15 @@ last_no_qr_print_time = 0
 qr_print_interval = 0.5
 frame_count = 0
 
+# Model dimuat sekali sebelum loop, bukan per frame. Utamakan YOLO cv2.dnn di CPU (input 416, kotak
+# kandidat di-decode OpenCV); tanpa file weights kembali ke QReader.
+try:
+    dnn_decoder = dnn_localizer.DnnDecoder(dnn_localizer.DnnLocalizer(input_size=416))
+except (IOError, cv2.error) as e:
+    print("DNN localizer unavailable ({}), using QReader".format(e))
+    dnn_decoder = None
+    detector_pool.preload("qreader")
+
 while (cv2.waitKey(1) & 0xFF) != 27:
     try:
         pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, 200)
@@ -107,10 +121,16 @@ while (cv2.waitKey(1) & 0xFF) != 27:
 
         # Deteksi QR setiap 30 frame
         if frame_count % 1 == 0:
-            qr_reader = qreader.QReader()
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            ret,th = cv2.threshold(gray,0,255,cv2.THRESH_BINARY+cv2.THRESH_OTSU)
-            decoded_data = qr_reader.detect_and_decode(th)
+            if dnn_decoder is not None:
+                result = dnn_decoder.decode(gray)
+                decoded_data = result.text
+                if result.quad is not None:
+                    cv2.polylines(frame, [result.quad.astype(np.int32)], True, (0, 255, 0), 2)
+            else:
+                qr_reader = detector_pool.get("qreader")
+                ret,th = cv2.threshold(gray,0,255,cv2.THRESH_BINARY+cv2.THRESH_OTSU)
+                decoded_data = qr_reader.detect_and_decode(th)
 
             current_time = time.time()
 
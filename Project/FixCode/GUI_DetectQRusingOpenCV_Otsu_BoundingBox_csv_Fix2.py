@@ -1,13 +1,17 @@
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 import mvsdk
+import detector_pool
 import time
 import platform
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 import csv
-import os
 import subprocess
 
 class CameraApp:
@@ -278,7 +282,7 @@ class CameraApp:
             messagebox.showerror("Error", "Invalid input. Please enter a valid integer.")
 
     def detect_qr_code(self, frame):
-        qr_code_detector = cv2.QRCodeDetector()
+        qr_code_detector = detector_pool.get("opencv")
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         decoded_text, points, _ = qr_code_detector.detectAndDecode(th)
@@ -1,14 +1,24 @@
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
 import mvsdk
+import detector_pool
+import decoders
 import time
 import platform
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 import csv
-import os
 import subprocess
+from gray_pipeline import GrayPipeline
+from auto_roi import AutoRoi
+from frame_meta import CSV_COLUMNS, prepare_csv
+from stage_timer import StageTimers, enabled_from_env
+from decode_cache import DecodeCache, fingerprint
 
 class CameraApp:
     def __init__(self, root):
@@ -33,6 +43,15 @@ class CameraApp:
         self.running = False
         self.stop_event = threading.Event()
 
+        # Timer per tahap (QR_STAGE_TIMERS=1), ringkasan p50/p95/p99 dicetak saat aplikasi ditutup
+        self.timers = StageTimers(enabled_from_env())
+
+        # Payload QR yang sama di-decode berulang selama produk lewat; decode dilewati jika patch QR dikenal
+        self.decode_cache = DecodeCache()
+
+        # QR ditemukan tetapi Otsu gagal di-decode (pencahayaan Sedang/Terang): coba binarisasi lain pada crop QR
+        self.cascade = decoders.create("cascade", steps=("raw", "adaptive", "clahe_otsu", "inverted"))
+
         # Inisialisasi untuk penyimpanan hasil ke CSV
         self.csv_filename = 'qr_code_detection.csv'
         self.last_decoded_text = ""
@@ -53,11 +72,12 @@ class CameraApp:
         self.hCamera = mvsdk.CameraInit(DevInfo, -1, -1)
         cap = mvsdk.CameraGetCapability(self.hCamera)
 
-        modeMono = (cap.sIspCapacity.bMonoSensor != 0)
-        if modeMono:
-            mvsdk.CameraSetIspOutFormat(self.hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8)
-        else:
-            mvsdk.CameraSetIspOutFormat(self.hCamera, mvsdk.CAMERA_MEDIA_TYPE_BGR8)
+        # ISP mengeluarkan MONO8 untuk deteksi; BGR hanya dibuat untuk preview mode "Original"
+        self.pipeline = GrayPipeline(self.hCamera, cap, color_consumer=True, timers=self.timers)
+
+        # ROI hardware otomatis, diaktifkan lewat checkbox "Auto ROI"
+        self.auto_roi = AutoRoi(self.hCamera, cap)
+        self.auto_roi.enabled = False
 
         # Set trigger mode, AE state, and exposure time
         mvsdk.CameraSetTriggerMode(self.hCamera, 0)
@@ -70,18 +90,9 @@ class CameraApp:
 
         mvsdk.CameraPlay(self.hCamera)
 
-        self.pFrameBuffer = mvsdk.CameraAlignMalloc(
-            cap.sResolutionRange.iWidthMax * 
-            cap.sResolutionRange.iHeightMax * (1 if modeMono else 3), 16
-        )
-
     def init_csv_file(self):
-        """Inisialisasi file CSV, menambahkan header jika file belum ada."""
-        file_exists = os.path.isfile(self.csv_filename)
-        if not file_exists:
-            with open(self.csv_filename, mode='w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['Timestamp', 'No. Produksi', 'No. Seri', 'Jenis Produk'])
+        """Inisialisasi file CSV dengan header; file lama berformat lain dipindah ke *_old<N>.csv."""
+        prepare_csv(self.csv_filename, ['Timestamp', 'No. Produksi', 'No. Seri', 'Jenis Produk'] + CSV_COLUMNS)
 
     def build_gui(self):
         # Main layout
@@ -207,6 +218,11 @@ class CameraApp:
         self.apply_roi_button = ttk.Button(roi_frame, text="Apply ROI", command=self.apply_roi_settings)
         self.apply_roi_button.grid(row=5, column=0, columnspan=2, pady=10)
 
+        # Auto ROI: readout sensor mengikuti QR code, kembali ke full frame setelah beberapa frame gagal
+        self.auto_roi_var = tk.BooleanVar(value=False)
+        self.auto_roi_check = ttk.Checkbutton(roi_frame, text="Auto ROI", variable=self.auto_roi_var, command=self.toggle_auto_roi)
+        self.auto_roi_check.grid(row=6, column=0, columnspan=2, pady=5)
+
         # Start, Stop, and Exit buttons
         self.start_button = ttk.Button(frame, text="Start", command=self.start_stream)
         self.start_button.grid(row=2, column=0, padx=20, pady=10)
@@ -258,11 +274,24 @@ class CameraApp:
                 iWidth=width, 
                 iHeight=height
             )
+            # ROI manual menggantikan Auto ROI
+            self.auto_roi_var.set(False)
+            self.auto_roi.enabled = False
             mvsdk.CameraSetImageResolution(self.hCamera, resize)
             messagebox.showinfo("Success", "ROI settings applied successfully.")
         except ValueError:
             messagebox.showerror("Error", "Invalid input for ROI settings. Please enter integer values.")
     
+    def toggle_auto_roi(self):
+        """Aktifkan/nonaktifkan Auto ROI di dalam resolusi aktif; saat dimatikan kamera kembali ke resolusi itu."""
+        if self.auto_roi_var.get():
+            self.auto_roi.rebase()
+            self.auto_roi.enabled = True
+        else:
+            self.auto_roi.enabled = False
+            if self.auto_roi.roi is not None:
+                self.auto_roi.reset()
+
     def set_white_balance(self):
         """Mengatur white balance sekali saat tombol ditekan."""
         try:
@@ -318,13 +347,39 @@ class CameraApp:
         except ValueError:
             messagebox.showerror("Error", "Invalid input. Please enter a valid integer.")
 
-    def detect_qr_code(self, frame):
-        qr_code_detector = cv2.QRCodeDetector()
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def detect_qr_code(self, gray, frame=None, meta=None):
+        """Deteksi pada citra abu-abu; bounding box dan teks digambar ke frame preview jika ada.
+
+        meta (FrameMeta frame ini) ikut ditulis ke baris CSV beserta latency sensor -> hasil.
+
+        Mengembalikan (citra threshold, sudut QR atau None).
+        """
+        timers = self.timers
+        t = timers.start()
+        qr_code_detector = detector_pool.get("opencv")
         _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        decoded_text, points, _ = qr_code_detector.detectAndDecode(th)
+        t = timers.lap("threshold", t)
+        found, points = qr_code_detector.detect(th)
+        t = timers.lap("detect", t)
+        decoded_text = ""
+        if found:
+            fp = fingerprint(th, points)
+            decoded_text = self.decode_cache.lookup(fp)
+            if decoded_text is None:
+                start = time.perf_counter()
+                decoded_text, _ = qr_code_detector.decode(th, points)
+                self.decode_cache.store(fp, decoded_text, (time.perf_counter() - start) * 1000)
+            t = timers.lap("decode", t)
+            if not decoded_text:
+                x0, y0, x1, y1 = decoders.crop_box(gray.shape, points)
+                decoded_text = self.cascade.decode(gray[y0:y1, x0:x1]).text
+                if decoded_text:
+                    self.decode_cache.store(fp, decoded_text)
+                t = timers.lap("cascade", t)
+        else:
+            points = None
 
-        if points is not None:
+        if points is not None and frame is not None:
             points = points[0].astype(int)
             for j in range(len(points)):
                 pt1 = tuple(points[j])
@@ -342,21 +397,29 @@ class CameraApp:
                 for i, line in enumerate(lines):
                     text_position = (top_left[0], top_left[1] - 80 + i * line_height)
                     cv2.putText(frame, line, text_position, font, font_scale, text_color, font_thickness)
-
-                # Save to CSV if new QR code detected
-                if decoded_text != self.last_decoded_text and (time.time() - self.last_qr_print_time) >= self.qr_print_interval:
-                    timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
-                    data_lines = decoded_text.split('\n')
-                    no_produksi = data_lines[0].replace('No. Produksi: ', '') if 'No. Produksi' in data_lines[0] else ''
-                    no_seri = data_lines[1].replace('No. Seri: ', '') if 'No. Seri' in data_lines[1] else ''
-                    jenis_produk = data_lines[2].replace('Jenis Produk: ', '') if len(data_lines) > 2 and 'Jenis Produk' in data_lines[2] else ''
-                    
-                    with open(self.csv_filename, mode='a', newline='') as file:
-                        writer = csv.writer(file)
-                        writer.writerow([timestamp, no_produksi, no_seri, jenis_produk])
-
-                    self.last_decoded_text = decoded_text
-                    self.last_qr_print_time = time.time()
+            t = timers.lap("overlay", t)
+
+        # Save to CSV if new QR code detected
+        if points is not None and decoded_text:
+            if decoded_text != self.last_decoded_text and (time.time() - self.last_qr_print_time) >= self.qr_print_interval:
+                timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
+                data_lines = decoded_text.split('\n')
+                no_produksi = data_lines[0].replace('No. Produksi: ', '') if 'No. Produksi' in data_lines[0] else ''
+                no_seri = data_lines[1].replace('No. Seri: ', '') if 'No. Seri' in data_lines[1] else ''
+                jenis_produk = data_lines[2].replace('Jenis Produk: ', '') if len(data_lines) > 2 and 'Jenis Produk' in data_lines[2] else ''
+                
+                row = [timestamp, no_produksi, no_seri, jenis_produk]
+                if meta is not None:
+                    row += meta.csv_fields(self.pipeline.tracker.latency_ms(meta))
+                with open(self.csv_filename, mode='a', newline='') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(row)
+
+                self.last_decoded_text = decoded_text
+                self.last_qr_print_time = time.time()
+                timers.lap("csv", t)
+
+        return th, points
 
     def start_stream(self):
         """Memulai stream kamera dalam thread terpisah."""
@@ -370,25 +433,26 @@ class CameraApp:
         self.stop_event.set()
 
     def update_frame(self):
+        # Detektor milik thread stream ini dibuat dan di-warm-up sebelum frame pertama
+        detector_pool.preload("opencv")
         while self.running and not self.stop_event.is_set():
             try:
-                pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, 200)
-                mvsdk.CameraImageProcess(self.hCamera, pRawData, self.pFrameBuffer, FrameHead)
-                mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
-
-                if platform.system() == "Windows":
-                    mvsdk.CameraFlipFrameBuffer(self.pFrameBuffer, FrameHead, 1)
-
-                frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(self.pFrameBuffer)
-                frame = np.frombuffer(frame_data, dtype=np.uint8).reshape(
-                    (FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
-
-                self.detect_qr_code(frame)
-
-                if self.display_mode.get() == "Threshold":
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    _, frame = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-                    frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+                # Frame warna hanya dibutuhkan oleh preview mode "Original"
+                show_original = self.display_mode.get() != "Threshold"
+                self.pipeline.color_consumer = show_original
+                gray, frame, preview = self.pipeline.grab(200)
+                if preview and show_original and frame is None:
+                    # Sensor mono: preview memakai citra abu-abu
+                    frame = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+                th, points = self.detect_qr_code(gray, frame, self.pipeline.meta)
+                self.auto_roi.update(points, self.pipeline.head)
+                if not preview:
+                    continue
+
+                t = self.timers.start()
+                if not show_original:
+                    frame = cv2.cvtColor(th, cv2.COLOR_GRAY2RGB)
 
                 frame = cv2.resize(frame, (640, 480))
                 img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -397,6 +461,7 @@ class CameraApp:
 
                 self.video_label.config(image=photo)
                 self.video_label.image = photo
+                self.timers.lap("display", t)
 
             except mvsdk.CameraException as e:
                 if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
@@ -404,10 +469,14 @@ class CameraApp:
 
     def close_app(self):
         self.stop_stream()
+        if self.timers.enabled:
+            self.timers.dump()
+        print("Decode cache: {}".format(self.decode_cache.stats()))
+        print("Binarization cascade: {}".format(self.cascade.stats()))
         if self.hCamera:
             try:
                 mvsdk.CameraUnInit(self.hCamera)
-                mvsdk.CameraAlignFree(self.pFrameBuffer)
+                self.pipeline.close()
             except Exception as e:
                 print(f"Error during camera cleanup: {e}")
         self.root.quit()
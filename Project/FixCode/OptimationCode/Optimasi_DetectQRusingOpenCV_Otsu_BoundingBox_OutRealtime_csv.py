@@ -1,22 +1,25 @@
 import cv2
 import numpy as np
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
 import mvsdk
+import decoders
+from qr_tracker import QrTracker
 import time
+from gray_pipeline import GrayPipeline
+from auto_roi import AutoRoi
+from frame_meta import CSV_COLUMNS, prepare_csv
+from stage_timer import StageTimers, enabled_from_env
 import platform
 import csv
-import os
 
 # Nama file CSV
 csv_filename = 'qr_code_det.csv'
 
-# Cek apakah file CSV sudah ada atau belum
-file_exists = os.path.isfile(csv_filename)
-
-# Inisialisasi file CSV, jika belum ada buat header
-with open(csv_filename, mode='a', newline='') as file:
-    writer = csv.writer(file)
-    if not file_exists:
-        writer.writerow(['Timestamp', 'No. Produksi', 'No. Seri', 'Jenis Produk'])
+# Inisialisasi file CSV dengan header; file lama berformat lain dipindah ke *_old<N>.csv
+prepare_csv(csv_filename, ['Timestamp', 'No. Produksi', 'No. Seri', 'Jenis Produk'] + CSV_COLUMNS)
 
 # Inisialisasi kamera
 DevList = mvsdk.CameraEnumerateDevice()
@@ -29,12 +32,12 @@ hCamera = mvsdk.CameraInit(DevInfo, -1, -1)
 
 # Konfigurasi kamera
 cap = mvsdk.CameraGetCapability(hCamera)
-modeMono = (cap.sIspCapacity.bMonoSensor != 0)
 
-if modeMono:
-    mvsdk.CameraSetIspOutFormat(hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8)
-else:
-    mvsdk.CameraSetIspOutFormat(hCamera, mvsdk.CAMERA_MEDIA_TYPE_BGR8)
+# Timer per tahap (QR_STAGE_TIMERS=1), tekan 't' untuk mencetak p50/p95/p99 tiap tahap
+timers = StageTimers(enabled_from_env())
+
+# Yang ditampilkan hanya citra threshold, jadi tidak ada konsumen warna: ISP langsung mengeluarkan MONO8
+pipeline = GrayPipeline(hCamera, cap, color_consumer=False, timers=timers)
 
 # Set trigger mode dan AE
 mvsdk.CameraSetTriggerMode(hCamera, 0)
@@ -64,55 +67,60 @@ OH, OV = 0, 0  # Default ROI offsets
 resize = mvsdk.tSdkImageResolution(iIndex=0xFF, iHOffsetFOV=OH, iVOffsetFOV=OV, iWidthFOV=W, iHeightFOV=H, iWidth=W, iHeight=H)
 mvsdk.CameraSetImageResolution(hCamera, resize)
 
+# Auto ROI: setelah QR ditemukan, readout sensor mengikuti QR (FPS naik), full frame lagi setelah 5 frame gagal
+AUTO_ROI = True
+auto_roi = AutoRoi(hCamera, cap, max_misses=5)
+auto_roi.enabled = AUTO_ROI
+
+# Rantai decoder, semua dari decoders.create:
+#   tracker        QR yang sama terlihat di banyak frame, jadi decode hanya di jendela prediksi (kecepatan tetap
+#                  sepanjang konveyor); frame penuh dicari hanya saat track hilang, dengan
+#   coarse_to_fine cari QR pada frame 1/4 atau 1/2, decode crop resolusi penuh; frame penuh jika level kasar
+#                  tidak menemukan QR (kode kecil)
+#   cached         detect Otsu, decode dilewati jika sidik jari modul QR sudah ada di cache; cache miss:
+#   multiscale     decode level 1, 1.5, 2 dan 0.5 (paling banyak 2 thread) sampai berhasil atau budget habis,
+#                  agar kode kecil dari jauh (20 cm / 1 cm) lebih sering terbaca; lalu
+#   cascade        QR ditemukan tetapi Otsu gagal di-decode: coba binarisasi lain pada crop QR
+# Budget multiscale = periode frame sensor (berubah bersama ROI/exposure), minimal MIN_BUDGET_MS agar level 1
+# pada crop sempat selesai; decode satu frame tidak memakan waktu beberapa frame berikutnya
+MIN_BUDGET_MS = 10
+multiscale = decoders.create("multiscale")
+cascade = decoders.create("cascade", steps=("raw", "adaptive", "clahe_otsu", "inverted"))
+cached = decoders.create("cached", inner=multiscale, fallback=cascade)
+coarse_fine = decoders.create("coarse_to_fine", inner=cached)
+tracker = QrTracker(inner=cached, search=coarse_fine)
+
 # Main loop
 mvsdk.CameraPlay(hCamera)
-FrameBufferSize = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if modeMono else 3)
-pFrameBuffer = mvsdk.CameraAlignMalloc(FrameBufferSize, 16)
 
 last_decoded_text = ""
 last_qr_print_time = 0
 qr_print_interval = 0.5
 
-while (cv2.waitKey(1) & 0xFF) != 27:  # Tekan ESC untuk keluar
+while True:
+    key = cv2.waitKey(1) & 0xFF
+    if key == 27:  # Tekan ESC untuk keluar
+        break
+    if key == ord('t'):
+        timers.dump()
     try:
-        pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, 200)
-        mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
-        mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
-
-        if platform.system() == "Windows":
-            mvsdk.CameraFlipFrameBuffer(pFrameBuffer, FrameHead, 1)
-
-        frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
-        frame = np.frombuffer(frame_data, dtype=np.uint8)
-        frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+        gray, _, preview = pipeline.grab(200)
+        meta = pipeline.meta
+        if pipeline.tracker.period_ms:
+            multiscale.budget_ms = max(pipeline.tracker.period_ms, MIN_BUDGET_MS)
 
         # QR Code detection
-        qr_code_detector = cv2.QRCodeDetector()
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        decoded_text, points, _ = qr_code_detector.detectAndDecode(th)
-
-        if points is not None:
-            points = points[0].astype(int)
-            for j in range(len(points)):
-                pt1 = tuple(points[j])
-                pt2 = tuple(points[(j + 1) % len(points)])
-                cv2.line(frame, pt1, pt2, (0, 255, 0), 2)
-
-            if decoded_text:
-                top_left = points[0]
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                font_scale = 0.7
-                font_thickness = 2
-                text_color = (0, 0, 0)
-                line_height = 30
-                lines = decoded_text.split('\n')
-                for i, line in enumerate(lines):
-                    text_position = (top_left[0], top_left[1] - 80 + i * line_height)
-                    cv2.putText(frame, line, text_position, font, font_scale, text_color, font_thickness)
+        t = timers.start()
+        decoded_text, points = tracker.track(gray, meta.sensor_time)
+        t = timers.lap("track", t)
+        if auto_roi.update(points, pipeline.head):
+            # Koordinat frame ikut berubah bersama ROI sensor
+            tracker.reset()
+        t = timers.lap("auto_roi", t)
 
         if decoded_text and decoded_text != last_decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
-            print(f"QR Code detected: {decoded_text}")
+            latency_ms = pipeline.tracker.latency_ms(meta)
+            print(f"QR Code detected: {decoded_text} (frame {meta.frame_id}, {latency_ms:.1f} ms)")
 
             # Save QR code data to CSV
             timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
@@ -123,20 +131,35 @@ while (cv2.waitKey(1) & 0xFF) != 27:  # Tekan ESC untuk keluar
 
             with open(csv_filename, mode='a', newline='') as file:
                 writer = csv.writer(file)
-                writer.writerow([timestamp, no_produksi, no_seri, jenis_produk])
+                writer.writerow([timestamp, no_produksi, no_seri, jenis_produk] + meta.csv_fields(latency_ms))
 
             last_decoded_text = decoded_text
             last_qr_print_time = time.time()
+            t = timers.lap("csv", t)
 
-        # Display processed frame
-        th = cv2.resize(th, (640, 480))
-        cv2.imshow("Press ESC to end", th)
+        # Display processed frame (hanya pada laju preview)
+        if preview:
+            _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            th = cv2.resize(th, (640, 480))
+            cv2.imshow("Press ESC to end", th)
+            timers.lap("display", t)
 
     except mvsdk.CameraException as e:
         if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
             print(f"CameraGetImageBuffer failed({e.error_code}): {e.message}")
 
+# Lompatan frame ID = frame yang hilang sebelum sampai ke aplikasi
+print("Frames: {frames}, frame ID gaps: {gaps}, dropped: {dropped}".format(**pipeline.tracker.stats()))
+print("Tracker: {}".format(tracker.stats()))
+print("Coarse-to-fine: {}".format(coarse_fine.stats()))
+print("Decode cache: {}".format(cached.stats()))
+print("Multi-scale: {} (budget {:.1f} ms)".format(multiscale.stats(), multiscale.budget_ms))
+print("Binarization cascade: {}".format(cascade.stats()))
+if timers.enabled:
+    timers.dump()
+
 # Cleanup
 mvsdk.CameraUnInit(hCamera)
-mvsdk.CameraAlignFree(pFrameBuffer)
+pipeline.close()
+multiscale.close()
 cv2.destroyAllWindows()
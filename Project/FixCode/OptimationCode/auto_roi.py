@@ -0,0 +1,169 @@
+"""ROI hardware otomatis yang mengikuti QR code di conveyor.
+
+Setelah QR code ditemukan, jendela readout sensor dipindah ke kotak ber-padding di sekitar posisi
+prediksi berikutnya (CameraSetImageResolution, atau CameraSetTransferRoi untuk mode "transfer").
+Readout yang lebih kecil menaikkan FPS sensor dan mengurangi bandwidth USB serta waktu ISP.
+Setelah max_misses frame berturut-turut tanpa deteksi, kamera kembali ke jendela dasar: resolusi aktif
+saat AutoRoi dibuat (CameraGetImageResolution, misalnya 1280x1024 yang diset skrip), bukan ukuran maksimum
+sensor. Koordinat ROI relatif terhadap jendela dasar; panggil rebase() setelah skrip mengganti resolusi.
+
+    auto_roi = AutoRoi(hCamera, cap)
+    ...
+    decoded_text, points, _ = detector.detectAndDecode(th)
+    auto_roi.update(points, FrameHead)     # points dalam koordinat frame saat ini, None jika tidak ada
+"""
+import time
+
+import numpy as np
+
+import mvsdk
+
+# Offset dan ukuran ROI dibulatkan ke kelipatan ini (syarat umum sensor MindVision)
+ROI_ALIGN = 16
+
+MODE_RESOLUTION = "resolution"   # CameraSetImageResolution: frame mengecil, koordinat relatif ROI
+MODE_TRANSFER = "transfer"       # CameraSetTransferRoi: ukuran frame tetap, hanya region yang dikirim
+
+
+class AutoRoi(object):
+    def __init__(self, hCamera, cap, pad=0.75, max_misses=5, min_size=256, mode=MODE_RESOLUTION,
+                 settle_frames=1, shrink_ratio=0.5):
+        if mode not in (MODE_RESOLUTION, MODE_TRANSFER):
+            raise ValueError("mode must be {!r} or {!r}".format(MODE_RESOLUTION, MODE_TRANSFER))
+        self.hCamera = hCamera
+        self.cap = cap
+        self.rebase()
+        # Padding relatif terhadap ukuran kode di tiap sisi (termasuk quiet zone)
+        self.pad = pad
+        self.max_misses = max_misses
+        self.min_size = min_size
+        self.mode = mode
+        # Frame yang sudah di buffer SDK saat ROI diganti masih memakai ROI lama, hasilnya diabaikan
+        self.settle_frames = settle_frames
+        # ROI diperkecil lagi hanya jika kotak baru < shrink_ratio luas ROI saat ini (menghindari ganti ROI tiap frame)
+        self.shrink_ratio = shrink_ratio
+        self.enabled = True
+        self.changes = 0
+        self._interval = None    # rata-rata jarak waktu antar frame yang diproses (detik)
+        self._settle = 0
+
+    def rebase(self):
+        """Baca resolusi aktif kamera sebagai jendela dasar (full frame untuk AutoRoi) dan lupakan ROI/track."""
+        res = mvsdk.CameraGetImageResolution(self.hCamera)
+        if res.iWidth > 0 and res.iHeight > 0:
+            self.base_x, self.base_y = res.iHOffsetFOV, res.iVOffsetFOV
+            self.base_width, self.base_height = res.iWidth, res.iHeight
+        else:
+            self.base_x, self.base_y = 0, 0
+            self.base_width = self.cap.sResolutionRange.iWidthMax
+            self.base_height = self.cap.sResolutionRange.iHeightMax
+        self.roi = None          # (x, y, w, h) relatif terhadap jendela dasar, None = jendela dasar
+        self.misses = 0
+        self._center = None
+        self._time = None
+        self._velocity = None    # piksel per detik
+
+    def frame_offset(self):
+        """Posisi piksel (0, 0) frame saat ini dalam koordinat jendela dasar."""
+        if self.roi is None or self.mode == MODE_TRANSFER:
+            return 0, 0
+        return self.roi[0], self.roi[1]
+
+    def frame_size(self):
+        if self.roi is None or self.mode == MODE_TRANSFER:
+            return self.base_width, self.base_height
+        return self.roi[2], self.roi[3]
+
+    def update(self, points, FrameHead=None):
+        """Perbarui ROI dari hasil deteksi satu frame. Mengembalikan True jika ROI kamera diubah.
+
+        points adalah sudut QR dalam koordinat frame (seperti dari detectAndDecode), None jika tidak terdeteksi.
+        Dengan FrameHead, kecepatan dihitung dari uiTimeStamp dan frame dengan ROI lama diabaikan.
+        """
+        if not self.enabled:
+            return False
+        if self._settle > 0:
+            self._settle -= 1
+            return False
+        if FrameHead is not None and (FrameHead.iWidth, FrameHead.iHeight) != self.frame_size():
+            return False
+        now = FrameHead.uiTimeStamp / 10000.0 if FrameHead is not None else time.perf_counter()
+        if self._time is not None and now > self._time:
+            dt = now - self._time
+            self._interval = dt if self._interval is None else 0.8 * self._interval + 0.2 * dt
+
+        if points is None:
+            self._time = now
+            self.misses += 1
+            if self.roi is not None and self.misses >= self.max_misses:
+                self.reset()
+                return True
+            return False
+        self.misses = 0
+
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2) + self.frame_offset()
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        center = (lo + hi) / 2
+        if self._center is not None and now > self._time:
+            self._velocity = (center - self._center) / (now - self._time)
+        self._center = center
+        self._time = now
+        if self._velocity is None or self._interval is None:
+            # Kecepatan belum diketahui, tetap full frame sampai ada dua deteksi
+            return False
+
+        # Kotak harus memuat lintasan kode dari posisi sekarang sampai frame pertama dengan ROI baru tiba
+        shift = self._velocity * self._interval * (1 + self.settle_frames)
+        path_lo = np.minimum(lo, lo + shift)
+        path_hi = np.maximum(hi, hi + shift)
+        margin = (hi - lo) * self.pad
+        need = np.maximum(path_hi - path_lo + 2 * margin, self.min_size)
+        mid = (path_lo + path_hi) / 2
+        box = self._align(mid - need / 2, mid + need / 2)
+
+        if self.roi is not None and self._inside(path_lo, path_hi, self.roi) \
+                and box[2] * box[3] >= self.shrink_ratio * self.roi[2] * self.roi[3]:
+            return False
+        self._apply(box)
+        return True
+
+    def reset(self):
+        """Kembali ke jendela dasar."""
+        if self.mode == MODE_TRANSFER:
+            mvsdk.CameraEnableTransferRoi(self.hCamera, 0)
+        else:
+            resize = mvsdk.tSdkImageResolution(iIndex=0xFF, iHOffsetFOV=self.base_x, iVOffsetFOV=self.base_y,
+                                               iWidthFOV=self.base_width, iHeightFOV=self.base_height,
+                                               iWidth=self.base_width, iHeight=self.base_height)
+            mvsdk.CameraSetImageResolution(self.hCamera, resize)
+        self.roi = None
+        self.misses = 0
+        self.changes += 1
+        self._center = None
+        self._velocity = None
+        self._settle = self.settle_frames
+
+    def _align(self, lo, hi):
+        x0 = int(max(0, lo[0])) // ROI_ALIGN * ROI_ALIGN
+        y0 = int(max(0, lo[1])) // ROI_ALIGN * ROI_ALIGN
+        x1 = min(self.base_width, -(-int(np.ceil(hi[0])) // ROI_ALIGN) * ROI_ALIGN)
+        y1 = min(self.base_height, -(-int(np.ceil(hi[1])) // ROI_ALIGN) * ROI_ALIGN)
+        return x0, y0, x1 - x0, y1 - y0
+
+    @staticmethod
+    def _inside(lo, hi, roi):
+        x, y, w, h = roi
+        return lo[0] >= x and lo[1] >= y and hi[0] <= x + w and hi[1] <= y + h
+
+    def _apply(self, box):
+        x, y, w, h = box
+        if self.mode == MODE_TRANSFER:
+            mvsdk.CameraSetTransferRoi(self.hCamera, 0, x, y, x + w, y + h)
+            mvsdk.CameraEnableTransferRoi(self.hCamera, 1)
+        else:
+            resize = mvsdk.tSdkImageResolution(iIndex=0xFF, iHOffsetFOV=self.base_x + x, iVOffsetFOV=self.base_y + y,
+                                               iWidthFOV=w, iHeightFOV=h, iWidth=w, iHeight=h)
+            mvsdk.CameraSetImageResolution(self.hCamera, resize)
+        self.roi = box
+        self.changes += 1
+        self._settle = self.settle_frames
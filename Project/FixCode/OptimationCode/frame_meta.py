@@ -0,0 +1,121 @@
+"""Metadata per frame dari tSdkFrameHead yang dibawa bersama piksel sampai baris CSV.
+
+FrameMeta menyimpan frame ID (CameraGetFrameID), timestamp sensor (uiTimeStamp, satuan 0.1 ms),
+exposure, gain analog dan ukuran frame. FrameMetaTracker membuatnya tepat setelah CameraGetImageBuffer,
+memetakan jam kamera ke jam host (time.perf_counter) dengan offset minimum, dan mencatat lompatan
+frame ID (frame yang hilang sebelum sampai ke aplikasi). period_ms adalah periode frame sensor (rata-rata
+bergerak selisih timestamp per frame ID), berguna sebagai budget waktu decode per frame.
+
+Karena offset minimum sudah memuat delay transfer tercepat, latency_ms() (kolom "Excess Latency (ms)")
+adalah latency di atas delay transfer minimum, bukan latency sensor -> hasil yang sebenarnya. Nilainya
+cocok untuk melihat antrian/lag yang bertambah, bukan untuk waktu absolut.
+
+    tracker = FrameMetaTracker(hCamera)
+    pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, 200)
+    meta = tracker.capture(FrameHead)
+    ...
+    prepare_csv(csv_filename, ['Timestamp', ...] + CSV_COLUMNS)
+    writer.writerow([...] + meta.csv_fields(tracker.latency_ms(meta)))
+"""
+import csv
+import os
+import time
+
+import mvsdk
+
+# uiTimeStamp adalah c_uint dalam satuan 0.1 ms, berputar kembali ke 0 setelah 2^32
+TIMESTAMP_WRAP = 1 << 32
+TIMESTAMP_UNIT = 1e-4
+
+CSV_COLUMNS = ['Frame ID', 'Sensor Time (s)', 'Exposure (us)', 'Gain', 'Excess Latency (ms)']
+
+
+def prepare_csv(path, header):
+    """Pastikan file CSV path diawali header. File lama dengan header lain (misalnya format 4 kolom
+    sebelum metadata frame) diganti nama menjadi <nama>_old<N>.csv agar baris tidak bercampur."""
+    if os.path.isfile(path):
+        with open(path, newline='') as file:
+            first = next(csv.reader(file), None)
+        if first == header:
+            return path
+        if first is not None:
+            stem, ext = os.path.splitext(path)
+            n = 1
+            while os.path.exists("{}_old{}{}".format(stem, n, ext)):
+                n += 1
+            os.rename(path, "{}_old{}{}".format(stem, n, ext))
+    with open(path, mode='w', newline='') as file:
+        csv.writer(file).writerow(header)
+    return path
+
+
+class FrameMeta(object):
+    __slots__ = ("frame_id", "sensor_time", "host_time", "exposure_us", "gain", "width", "height")
+
+    def __init__(self, frame_id, sensor_time, host_time, exposure_us, gain, width, height):
+        self.frame_id = frame_id          # nomor frame dari kamera
+        self.sensor_time = sensor_time    # waktu capture menurut jam kamera (detik, tanpa wrap-around)
+        self.host_time = host_time        # waktu capture dalam jam host (time.perf_counter)
+        self.exposure_us = exposure_us
+        self.gain = gain                  # faktor gain analog
+        self.width = width
+        self.height = height
+
+    def csv_fields(self, latency_ms):
+        return [self.frame_id, "{:.4f}".format(self.sensor_time), self.exposure_us,
+                "{:.3f}".format(self.gain), "{:.1f}".format(latency_ms)]
+
+    def __repr__(self):
+        return "FrameMeta(id={}, t={:.4f}, exp={}us, gain={:.3f}, {}x{})".format(
+            self.frame_id, self.sensor_time, self.exposure_us, self.gain, self.width, self.height)
+
+
+class FrameMetaTracker(object):
+    def __init__(self, hCamera):
+        self.hCamera = hCamera
+        self.frames = 0
+        self.gaps = 0          # jumlah lompatan frame ID
+        self.dropped = 0       # total frame yang dilewati
+        self.last = None
+        self._wraps = 0
+        self._last_raw = None
+        self._offset = None
+        self.period_ms = None  # periode frame sensor, None sebelum dua frame
+
+    def capture(self, FrameHead, received=None):
+        """FrameMeta untuk frame yang baru diambil. Panggil sebelum frame berikutnya di-grab."""
+        if received is None:
+            received = time.perf_counter()
+        raw = FrameHead.uiTimeStamp
+        if self._last_raw is not None and raw < self._last_raw and self._last_raw - raw > TIMESTAMP_WRAP // 2:
+            self._wraps += 1
+        self._last_raw = raw
+        sensor_time = (raw + self._wraps * TIMESTAMP_WRAP) * TIMESTAMP_UNIT
+        # Offset terkecil (host - kamera) = offset dengan delay transfer paling kecil
+        offset = received - sensor_time
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+
+        frame_id = mvsdk.CameraGetFrameID(self.hCamera)
+        if self.last is not None and frame_id > self.last.frame_id + 1:
+            self.gaps += 1
+            self.dropped += frame_id - self.last.frame_id - 1
+        if self.last is not None and frame_id > self.last.frame_id and sensor_time > self.last.sensor_time:
+            period = (sensor_time - self.last.sensor_time) * 1000 / (frame_id - self.last.frame_id)
+            # Rata-rata bergerak: ikut berubah saat ROI/exposure mengubah FPS, tidak loncat karena jitter
+            self.period_ms = period if self.period_ms is None else 0.9 * self.period_ms + 0.1 * period
+        meta = FrameMeta(frame_id, sensor_time, sensor_time + self._offset, FrameHead.uiExpTime,
+                         FrameHead.fAnalogGain, FrameHead.iWidth, FrameHead.iHeight)
+        self.last = meta
+        self.frames += 1
+        return meta
+
+    def latency_ms(self, meta, now=None):
+        """Latency capture -> sekarang di atas delay transfer minimum (jam kamera dipetakan dengan offset minimum)."""
+        if now is None:
+            now = time.perf_counter()
+        return (now - meta.host_time) * 1000
+
+    def stats(self):
+        return {"frames": self.frames, "gaps": self.gaps, "dropped": self.dropped,
+                "period_ms": self.period_ms}
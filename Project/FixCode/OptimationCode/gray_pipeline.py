@@ -0,0 +1,105 @@
+"""Pipeline abu-abu: ISP mengeluarkan MONO8 untuk deteksi, frame BGR hanya dibuat untuk preview.
+
+Deteksi QR hanya butuh citra abu-abu, jadi ISP diset ke CAMERA_MEDIA_TYPE_MONO8 (1/3 byte per frame
+dan tanpa cvtColor BGR2GRAY). Selama ada konsumen warna (preview mode "Original"), data RAW yang sama
+juga diproses ke BGR8 lewat CameraImageProcessEx, tetapi hanya pada laju preview_fps.
+
+    pipeline = GrayPipeline(hCamera, cap, color_consumer=True, preview_fps=15)
+    gray, color, preview = pipeline.grab(200)
+    # gray  : view (H, W) uint8 setiap frame
+    # color : view (H, W, 3) BGR atau None (tidak ada konsumen warna / belum waktunya preview)
+    # preview : True jika frame ini jatuh pada jadwal preview
+    # pipeline.head : tSdkFrameHead frame terakhir (ukuran, uiTimeStamp, ...)
+    # pipeline.meta : FrameMeta frame terakhir (frame ID, waktu sensor, exposure, gain)
+
+Dengan timers=StageTimers(...), waktu tahap "grab" (CameraGetImageBuffer) dan "isp" dicatat per frame.
+"""
+import ctypes
+import platform
+import time
+
+import numpy as np
+
+import mvsdk
+from frame_meta import FrameMetaTracker
+from stage_timer import StageTimers
+
+PREVIEW_FPS = 15
+
+IS_WINDOWS = platform.system() == "Windows"
+
+
+class GrayPipeline(object):
+    def __init__(self, hCamera, cap, color_consumer=False, preview_fps=PREVIEW_FPS, flip=IS_WINDOWS, timers=None):
+        self.hCamera = hCamera
+        self.mono_sensor = (cap.sIspCapacity.bMonoSensor != 0)
+        # Konsumen warna bisa dipasang/dilepas kapan saja (misalnya saat mode tampilan berubah)
+        self.color_consumer = color_consumer
+        self.preview_interval = 1.0 / preview_fps if preview_fps > 0 else 0.0
+        self.flip = flip
+        self.timers = timers if timers is not None else StageTimers(enabled=False)
+        self.frames = 0
+        self.color_frames = 0
+        self.head = None
+        self.meta = None
+        self.tracker = FrameMetaTracker(hCamera)
+        self._last_preview = 0.0
+
+        mvsdk.CameraSetIspOutFormat(hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8)
+        max_pixels = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax
+        self.pGrayBuffer = mvsdk.CameraAlignMalloc(max_pixels, 16)
+        self.pColorBuffer = 0 if self.mono_sensor else mvsdk.CameraAlignMalloc(max_pixels * 3, 16)
+        self.color_head = mvsdk.tSdkFrameHead()
+
+    def preview_due(self, now):
+        return now - self._last_preview >= self.preview_interval
+
+    def grab(self, wTimes):
+        """GetImageBuffer -> ISP MONO8 (+ BGR8 bila perlu) -> Release.
+
+        Mengembalikan (gray, color, preview). CameraException diteruskan ke pemanggil.
+        """
+        t = self.timers.start()
+        pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, wTimes)
+        t = self.timers.lap("grab", t)
+        now = time.perf_counter()
+        self.meta = self.tracker.capture(FrameHead, now)
+        preview = self.preview_due(now)
+        make_color = preview and self.color_consumer and self.pColorBuffer
+        try:
+            if make_color:
+                # ImageProcessEx menulis format keluaran ke head, jadi pakai salinan head
+                ctypes.memmove(ctypes.addressof(self.color_head), ctypes.addressof(FrameHead), ctypes.sizeof(FrameHead))
+                mvsdk.CameraImageProcessEx(self.hCamera, pRawData, self.pColorBuffer, self.color_head,
+                                           mvsdk.CAMERA_MEDIA_TYPE_BGR8, 0)
+            mvsdk.CameraImageProcess(self.hCamera, pRawData, self.pGrayBuffer, FrameHead)
+        finally:
+            mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
+
+        # Di Windows, data gambar terbalik vertikal (format BMP), balik agar sesuai OpenCV
+        if self.flip:
+            mvsdk.CameraFlipFrameBuffer(self.pGrayBuffer, FrameHead, 1)
+            if make_color:
+                mvsdk.CameraFlipFrameBuffer(self.pColorBuffer, self.color_head, 1)
+
+        frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(self.pGrayBuffer)
+        gray = np.frombuffer(frame_data, dtype=np.uint8).reshape((FrameHead.iHeight, FrameHead.iWidth))
+        color = None
+        if make_color:
+            color_data = (mvsdk.c_ubyte * self.color_head.uBytes).from_address(self.pColorBuffer)
+            color = np.frombuffer(color_data, dtype=np.uint8).reshape((self.color_head.iHeight, self.color_head.iWidth, 3))
+            self.color_frames += 1
+        if preview:
+            self._last_preview = now
+        self.head = FrameHead
+        self.frames += 1
+        self.timers.lap("isp", t)
+        return gray, color, preview
+
+    def close(self):
+        if self.pGrayBuffer:
+            mvsdk.CameraAlignFree(self.pGrayBuffer)
+            self.pGrayBuffer = 0
+        if self.pColorBuffer:
+            mvsdk.CameraAlignFree(self.pColorBuffer)
+            self.pColorBuffer = 0
@@ -1,10 +1,14 @@
 import cv2
-import cupy as cp  # Menggunakan CuPy sebagai pengganti NumPy
+import numpy as np  # CPU saja: PC lini tidak punya GPU CUDA untuk CuPy
+import os
+import sys
+# Modul bersama (decoders, detector_pool, qr_tracker, mvsdk_sim, ...) hanya ada di folder Project
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 import mvsdk
+import detector_pool
 import time
 import platform
 import csv
-import os
 
 # Nama file CSV
 csv_filename = 'Ambil_Data.csv'
@@ -87,14 +91,14 @@ while (cv2.waitKey(1) & 0xFF) != 27:
         if platform.system() == "Windows":
             mvsdk.CameraFlipFrameBuffer(pFrameBuffer, FrameHead, 1)
 
-        # Konversi buffer gambar ke array CuPy
+        # Buffer frame SDK langsung sebagai array NumPy (tanpa salinan)
         frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
-        frame = cp.frombuffer(frame_data, dtype=cp.uint8)
+        frame = np.frombuffer(frame_data, dtype=np.uint8)
         frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
 
         # Deteksi QR Code
-        qr_code_detector = cv2.QRCodeDetector()
-        gray = cv2.cvtColor(cp.asnumpy(frame), cv2.COLOR_BGR2GRAY)  # Konversi CuPy ke NumPy sementara untuk operasi OpenCV
+        qr_code_detector = detector_pool.get("opencv")
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY)  # Sesuaikan threshold untuk objek cepat
         decoded_text, points, _ = qr_code_detector.detectAndDecode(th)
 
@@ -105,11 +109,11 @@ while (cv2.waitKey(1) & 0xFF) != 27:
         formatted_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current_time))
 
         if points is not None:
-            points = cp.array(points[0].astype(int))
+            points = points[0].astype(int)
             for j in range(len(points)):
                 pt1 = tuple(points[j])
                 pt2 = tuple(points[(j + 1) % len(points)])
-                cv2.line(cp.asnumpy(frame), pt1, pt2, (0, 255, 0), 2)  # Konversi CuPy ke NumPy untuk operasi cv2
+                cv2.line(frame, pt1, pt2, (0, 255, 0), 2)
 
             if decoded_text:
                 top_left = points[0]
@@ -120,8 +124,8 @@ while (cv2.waitKey(1) & 0xFF) != 27:
                 line_height = 30
                 lines = decoded_text.split('\n')
                 for i, line in enumerate(lines):
-                    text_position = (top_left[0], top_left[1] - 80 + i * line_height)
-                    cv2.putText(cp.asnumpy(frame), line, text_position, font, font_scale, text_color, font_thickness)
+                    text_position = (int(top_left[0]), int(top_left[1]) - 80 + i * line_height)
+                    cv2.putText(frame, line, text_position, font, font_scale, text_color, font_thickness)
 
         # Catat hasil deteksi
         if decoded_text and decoded_text != last_decoded_text and (time.time() - last_qr_print_time) >= qr_print_interval:
@@ -150,7 +154,7 @@ while (cv2.waitKey(1) & 0xFF) != 27:
                 writer.writerow([formatted_time, "", "", "", detection_speed_ms, "Gagal"])
 
         # Tampilkan hasil deteksi
-        th = cp.asnumpy(cp.resize(th, (640, 480)))  # Konversi CuPy ke NumPy untuk ditampilkan
+        th = cv2.resize(th, (640, 480))
         cv2.imshow("Press ESC to end", th)
 
     except mvsdk.CameraException as e:
@@ -1,29 +1,61 @@
 #coding=utf-8
+import os
 import platform
 from ctypes import *
-from threading import local
+from threading import local, Lock
 
-# Jenis Fungsi Callback
-CALLBACK_FUNC_TYPE = None
+# Jenis Fungsi Callback (hanya bergantung pada platform, tidak perlu memuat library SDK)
+CALLBACK_FUNC_TYPE = WINFUNCTYPE if platform.system() == "Windows" else CFUNCTYPE
 
-# Library Dinamis SDK
-_sdk = None
-
-def _Init():
-	global _sdk
-	global CALLBACK_FUNC_TYPE
+# Backend SDK: "native" memuat MVCAMSDK/libMVSDK.so, "sim" memakai kamera simulasi dari mvsdk_sim.py.
+# Bisa dipilih lewat variabel lingkungan MVSDK_BACKEND atau fungsi SetBackend().
+_backend = os.environ.get("MVSDK_BACKEND", "native")
+_init_lock = Lock()
 
+def _LoadNativeLibrary():
 	is_win = (platform.system() == "Windows")
 	is_x86 = (platform.architecture()[0] == '32bit')
 
 	if is_win:
-		_sdk = windll.MVCAMSDK if is_x86 else windll.MVCAMSDK_X64
-		CALLBACK_FUNC_TYPE = WINFUNCTYPE
+		return windll.MVCAMSDK if is_x86 else windll.MVCAMSDK_X64
 	else:
-		_sdk = cdll.LoadLibrary("libMVSDK.so")
-		CALLBACK_FUNC_TYPE = CFUNCTYPE
+		return cdll.LoadLibrary("libMVSDK.so")
 
-_Init()
+def _Init():
+	global _sdk
+
+	with _init_lock:
+		if not isinstance(_sdk, _LazySdk):
+			return _sdk
+
+		if _backend == "native":
+			_sdk = _LoadNativeLibrary()
+		elif _backend == "sim":
+			import mvsdk_sim
+			_sdk = mvsdk_sim.SimulatedSdk.from_env()
+		elif isinstance(_backend, str):
+			raise ValueError("Unknown MVSDK backend: {}".format(_backend))
+		else:
+			_sdk = _backend
+		return _sdk
+
+# Library Dinamis SDK. Library baru dimuat saat fungsi SDK pertama kali dipanggil,
+# sehingga import mvsdk tidak membutuhkan SDK vendor dan tidak membayar biaya LoadLibrary.
+class _LazySdk(object):
+	def __getattr__(self, name):
+		return getattr(_Init(), name)
+
+_sdk = _LazySdk()
+
+def SetBackend(backend):
+	"""backend: "native", "sim", atau objek yang mengekspor fungsi Camera* dengan ABI yang sama seperti library SDK."""
+	global _sdk, _backend
+	with _init_lock:
+		_backend = backend
+		_sdk = _LazySdk()
+
+def GetBackend():
+	return _Init()
 
 #------------------------------------------- Definisi Tipe --------------------------------------------------
 
@@ -230,6 +262,9 @@ IOMODE_GP_INPUT = 2
 IOMODE_GP_OUTPUT = 3
 IOMODE_PWM_OUTPUT = 4
 
+# flag CameraSoftTriggerEx.
+CAMERA_ST_CLEAR_BUFFER_BEFORE = 0x1	# kosongkan frame yang sudah di-buffer kamera sebelum soft trigger
+
 
 # informasi kesalahan operasi kamera.
 class CameraException(Exception):
@@ -1737,7 +1772,7 @@ def CameraGetImageBufferEx2(hCamera, pImageData, uOutFormat, wTimes):
 def CameraGetImageBufferEx3(hCamera, pImageData, uOutFormat, wTimes):
 	piWidth = c_int()
 	piHeight = c_int()
-	puTimeStamp = c_int()
+	puTimeStamp = c_uint()
 	err_code = _sdk.CameraGetImageBufferEx3(hCamera, c_void_p(pImageData), uOutFormat, byref(piWidth), byref(piHeight), byref(puTimeStamp), wTimes)
 	SetLastError(err_code)
 	if err_code != 0:
@@ -2454,3 +2489,88 @@ def CameraImage_IPicture(Image):
 	err_code = _sdk.CameraImage_IPicture(c_void_p(Image), byref(NewPic))
 	SetLastError(err_code)
 	return NewPic.value
+
+#----------------------------------- Jalur capture cepat ------------------------------------------
+
+def _GetFunction(name, restype, argtypes):
+	# Objek fungsi terpisah (sdk[name]) agar argtypes tidak mengubah perilaku wrapper lain
+	sdk = _Init()
+	try:
+		func = sdk[name]
+	except TypeError:
+		# Backend bukan library ctypes (misalnya kamera simulasi)
+		return getattr(sdk, name)
+	func.restype = restype
+	func.argtypes = argtypes
+	return func
+
+# GetImageBuffer -> ImageProcess -> ReleaseImageBuffer dalam satu panggilan tanpa alokasi per frame.
+# Struktur tSdkFrameHead, pointer RAW, tipe array, dan view numpy dibuat sekali lalu dipakai ulang.
+# Catatan: Grab() tidak menulis GetLastError(), view dan self.head ditimpa oleh Grab() berikutnya
+# (gunakan head.clone() / frame.copy() jika perlu disimpan).
+class FastGrabber(object):
+	def __init__(self, hCamera, pFrameBuffer = 0, flip = None):
+		import numpy
+		self._frombuffer = numpy.frombuffer
+		self._uint8 = numpy.uint8
+
+		self.hCamera = hCamera
+		self.head = tSdkFrameHead()
+		self._raw = c_void_p()
+		self._head_ref = byref(self.head)
+		self._raw_ref = byref(self._raw)
+		self._get = _GetFunction("CameraGetImageBuffer", c_int, [c_int, POINTER(tSdkFrameHead), POINTER(c_void_p), c_uint])
+		self._process = _GetFunction("CameraImageProcess", c_int, [c_int, c_void_p, c_void_p, POINTER(tSdkFrameHead)])
+		self._release = _GetFunction("CameraReleaseImageBuffer", c_int, [c_int, c_void_p])
+
+		# Di Windows data gambar terbalik vertikal (format BMP)
+		if flip is None:
+			flip = (platform.system() == "Windows")
+		self._flip = _GetFunction("CameraFlipFrameBuffer", c_int, [c_void_p, POINTER(tSdkFrameHead), c_int]) if flip else None
+
+		self._own_buffer = not pFrameBuffer
+		if self._own_buffer:
+			cap = CameraGetCapability(hCamera)
+			mono = cap.sIspCapacity.bMonoSensor != 0
+			pFrameBuffer = CameraAlignMalloc(cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if mono else 3), 16)
+		self.pFrameBuffer = pFrameBuffer
+		self._views = {}
+
+	def Grab(self, wTimes, pFrameBuffer = 0):
+		"""Ambil satu frame ke pFrameBuffer dan kembalikan view numpy (H, W, C). Gagal/timeout -> CameraException."""
+		out = pFrameBuffer or self.pFrameBuffer
+		err_code = self._get(self.hCamera, self._head_ref, self._raw_ref, wTimes)
+		if err_code != 0:
+			raise CameraException(err_code)
+		err_code = self._process(self.hCamera, self._raw, out, self._head_ref)
+		self._release(self.hCamera, self._raw)
+		if err_code != 0:
+			raise CameraException(err_code)
+		if self._flip is not None:
+			self._flip(out, self._head_ref, 1)
+		return self.View(out)
+
+	def View(self, pFrameBuffer):
+		"""View numpy untuk frame di pFrameBuffer sesuai self.head, di-cache per alamat/ukuran/format."""
+		head = self.head
+		key = (pFrameBuffer, head.uBytes, head.iWidth, head.iHeight, head.uiMediaType)
+		view = self._views.get(key)
+		if view is None:
+			if len(self._views) >= 64:
+				self._views.clear()
+			data = (c_ubyte * head.uBytes).from_address(pFrameBuffer)
+			channels = 1 if head.uiMediaType == CAMERA_MEDIA_TYPE_MONO8 else 3
+			view = self._views[key] = self._frombuffer(data, dtype=self._uint8).reshape((head.iHeight, head.iWidth, channels))
+		return view
+
+	def Close(self):
+		self._views.clear()
+		if self._own_buffer and self.pFrameBuffer:
+			CameraAlignFree(self.pFrameBuffer)
+		self.pFrameBuffer = 0
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.Close()
@@ -0,0 +1,252 @@
+"""Benchmark startup dan throughput loop capture mvsdk memakai kamera simulasi (tanpa kamera/SDK vendor).
+
+    python bench_capture.py --fps 0 --frames 300
+    python bench_capture.py --fps 60 --jitter-ms 2 --timeout-rate 0.01 --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+import callback_capture
+import frame_ring
+import mvsdk
+import mvsdk_sim
+
+FRAME_TIMEOUT_MS = 200
+
+
+def frame_buffer_size(cap):
+    monoCamera = (cap.sIspCapacity.bMonoSensor != 0)
+    return cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if monoCamera else 3)
+
+
+def loop_three_call(hCamera, cap, n_frames):
+    """Loop capture seperti di cv_grab.py: GetImageBuffer -> ImageProcess -> Release -> frombuffer."""
+    pFrameBuffer = mvsdk.CameraAlignMalloc(frame_buffer_size(cap), 16)
+    try:
+        return _three_call(hCamera, pFrameBuffer, n_frames)
+    finally:
+        mvsdk.CameraAlignFree(pFrameBuffer)
+
+
+def _three_call(hCamera, pFrameBuffer, n_frames):
+    frame_ms = []
+    timeouts = 0
+    while len(frame_ms) < n_frames:
+        start = time.perf_counter()
+        try:
+            pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, FRAME_TIMEOUT_MS)
+            mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
+            mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
+            frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
+            frame = np.frombuffer(frame_data, dtype=np.uint8)
+            frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+        except mvsdk.CameraException as e:
+            if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                raise
+            timeouts += 1
+            continue
+        frame_ms.append((time.perf_counter() - start) * 1000)
+    return frame_ms, timeouts
+
+
+def loop_ring(hCamera, cap, n_frames):
+    """Thread capture mengisi FrameRing, thread utama mengambil frame sebagai konsumen (tanpa copy)."""
+    ring = frame_ring.FrameRing.for_camera(cap, cap.sIspCapacity.bMonoSensor != 0, n_slots=4)
+    stop = threading.Event()
+    timeouts = [0]
+
+    def producer():
+        while not stop.is_set():
+            try:
+                frame_ring.grab(hCamera, ring, FRAME_TIMEOUT_MS)
+            except mvsdk.CameraException as e:
+                if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                    raise
+                timeouts[0] += 1
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    frame_ms = []
+    try:
+        last = time.perf_counter()
+        while len(frame_ms) < n_frames:
+            slot = ring.get(timeout=FRAME_TIMEOUT_MS / 1000.0)
+            if slot is None:
+                continue
+            with slot:
+                slot.frame.sum(dtype=np.uint32)
+            now = time.perf_counter()
+            frame_ms.append((now - last) * 1000)
+            last = now
+    finally:
+        stop.set()
+        thread.join()
+        ring.close()
+    return frame_ms, timeouts[0]
+
+
+def loop_fast_grab(hCamera, cap, n_frames):
+    """mvsdk.FastGrabber: grab -> ISP -> release dalam satu panggilan, struktur dan view dipakai ulang."""
+    frame_ms = []
+    timeouts = 0
+    with mvsdk.FastGrabber(hCamera) as grabber:
+        while len(frame_ms) < n_frames:
+            start = time.perf_counter()
+            try:
+                grabber.Grab(FRAME_TIMEOUT_MS)
+            except mvsdk.CameraException as e:
+                if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                    raise
+                timeouts += 1
+                continue
+            frame_ms.append((time.perf_counter() - start) * 1000)
+    return frame_ms, timeouts
+
+
+def loop_ex3(hCamera, cap, n_frames):
+    """frame_ring.grab_ex3: satu panggilan Ex3 ke slot numpy ter-align, timestamp SDK ikut di slot.head."""
+    monoCamera = (cap.sIspCapacity.bMonoSensor != 0)
+    out_format = mvsdk.CAMERA_MEDIA_TYPE_MONO8 if monoCamera else mvsdk.CAMERA_MEDIA_TYPE_BGR8
+    ring = frame_ring.FrameRing.for_camera(cap, monoCamera, n_slots=2, numpy_owned=True)
+    frame_ms = []
+    timeouts = 0
+    try:
+        while len(frame_ms) < n_frames:
+            start = time.perf_counter()
+            try:
+                frame_ring.grab_ex3(hCamera, ring, out_format, FRAME_TIMEOUT_MS, flip=False)
+            except mvsdk.CameraException as e:
+                if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                    raise
+                timeouts += 1
+                continue
+            with ring.get(latest=False):
+                pass
+            frame_ms.append((time.perf_counter() - start) * 1000)
+    finally:
+        ring.close()
+    return frame_ms, timeouts
+
+
+def loop_callback(hCamera, cap, n_frames):
+    """callback_capture.CallbackCapture: SDK mendorong frame lewat callback, thread utama sebagai konsumen."""
+    ring = frame_ring.FrameRing.for_camera(cap, cap.sIspCapacity.bMonoSensor != 0, n_slots=4)
+    frame_ms = []
+    engine = callback_capture.CallbackCapture(hCamera, ring)
+    engine.start()
+    try:
+        last = time.perf_counter()
+        while len(frame_ms) < n_frames:
+            slot = engine.get(timeout=FRAME_TIMEOUT_MS / 1000.0)
+            if slot is None:
+                continue
+            with slot:
+                slot.frame.sum(dtype=np.uint32)
+            now = time.perf_counter()
+            frame_ms.append((now - last) * 1000)
+            last = now
+    finally:
+        engine.stop()
+        ring.close()
+    # Mode callback tidak pernah menunggu timeout
+    return frame_ms, 0
+
+
+# Nama loop -> fungsi(hCamera, cap, n_frames) yang mengembalikan (list ms per frame, jumlah timeout)
+CAPTURE_LOOPS = {
+    "three_call": loop_three_call,
+    "ring": loop_ring,
+    "fast_grab": loop_fast_grab,
+    "ex3": loop_ex3,
+    "callback": loop_callback,
+}
+
+
+def measure_import_ms(backend):
+    """Waktu import mvsdk + panggilan SDK pertama di proses baru."""
+    code = ("import time; t0 = time.perf_counter(); import mvsdk; t1 = time.perf_counter(); "
+            "mvsdk.CameraEnumerateDevice(); t2 = time.perf_counter(); "
+            "print((t1 - t0) * 1000, (t2 - t1) * 1000)")
+    env = dict(os.environ, MVSDK_BACKEND=backend)
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True).stdout.split()
+    return {"import_ms": float(out[0]), "first_call_ms": float(out[1])}
+
+
+def open_camera():
+    DevList = mvsdk.CameraEnumerateDevice()
+    if len(DevList) < 1:
+        raise RuntimeError("No camera was found!")
+    hCamera = mvsdk.CameraInit(DevList[0], -1, -1)
+    cap = mvsdk.CameraGetCapability(hCamera)
+    monoCamera = (cap.sIspCapacity.bMonoSensor != 0)
+    mvsdk.CameraSetIspOutFormat(hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8 if monoCamera else mvsdk.CAMERA_MEDIA_TYPE_BGR8)
+    mvsdk.CameraSetTriggerMode(hCamera, 0)
+    mvsdk.CameraPlay(hCamera)
+    return hCamera, cap, monoCamera
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run_loop(name, n_frames):
+    start = time.perf_counter()
+    hCamera, cap, monoCamera = open_camera()
+    open_ms = (time.perf_counter() - start) * 1000
+    try:
+        start = time.perf_counter()
+        frame_ms, timeouts = CAPTURE_LOOPS[name](hCamera, cap, n_frames)
+        elapsed = time.perf_counter() - start
+    finally:
+        mvsdk.CameraUnInit(hCamera)
+    return {
+        "loop": name,
+        "open_ms": open_ms,
+        "frames": len(frame_ms),
+        "timeouts": timeouts,
+        "fps": len(frame_ms) / elapsed if elapsed > 0 else 0.0,
+        "frame_ms_mean": float(np.mean(frame_ms)) if frame_ms else 0.0,
+        "frame_ms_p50": percentile(frame_ms, 50),
+        "frame_ms_p95": percentile(frame_ms, 95),
+        "frame_ms_p99": percentile(frame_ms, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loops", nargs="*", default=sorted(CAPTURE_LOOPS), choices=sorted(CAPTURE_LOOPS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=float, default=0, help="FPS sensor simulasi, 0 = secepat mungkin")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--timeout-rate", type=float, default=0)
+    parser.add_argument("--mono", action="store_true")
+    parser.add_argument("--source", default=None, help="folder/file gambar yang diputar ulang")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    report = {"startup": measure_import_ms("sim"), "loops": []}
+    for name in args.loops:
+        mvsdk_sim.install(source=args.source, fps=args.fps, jitter_ms=args.jitter_ms,
+                          timeout_rate=args.timeout_rate, mono=args.mono, seed=args.seed)
+        report["loops"].append(run_loop(name, args.frames))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print("import mvsdk: {import_ms:.1f} ms, first SDK call: {first_call_ms:.1f} ms".format(**report["startup"]))
+    for r in report["loops"]:
+        print("{loop:<16} {fps:8.1f} fps  mean {frame_ms_mean:6.2f} ms  p95 {frame_ms_p95:6.2f} ms  "
+              "p99 {frame_ms_p99:6.2f} ms  timeouts {timeouts}  open {open_ms:.1f} ms".format(**r))
+
+
+if __name__ == "__main__":
+    main()
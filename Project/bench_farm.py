@@ -0,0 +1,101 @@
+"""Benchmark DecodeFarm: throughput decode dengan N proses worker dibanding decode di thread utama.
+
+Frame QR sintetis di-submit secepat slot tersedia; dilaporkan frame/s, latency submit -> hasil,
+kedalaman antrian rata-rata, utilisasi CPU (time.process_time() di worker) dan waktu sibuk (waktu dinding
+decode) per worker.
+
+    python bench_farm.py --workers 0 1 2 4 --frames 64
+    python bench_farm.py --workers 4 --decoder zxing --json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import decoders
+import mvsdk_sim
+from decode_farm import DecodeFarm
+
+
+def run_inline(frames, decoder):
+    dec = decoders.create(decoder)
+    decoded = 0
+    start = time.perf_counter()
+    for gray in frames:
+        if dec.decode(gray):
+            decoded += 1
+    elapsed = time.perf_counter() - start
+    return {"workers": 0, "fps": len(frames) / elapsed, "decoded": decoded, "latency_ms_p50": elapsed * 1000 / len(frames)}
+
+
+def run_farm(frames, workers, decoder):
+    height, width = frames[0].shape
+    with DecodeFarm(workers=workers, max_shape=(height, width), decoder=decoder) as farm:
+        # Warm-up: setiap worker sudah membuat decodernya sebelum pengukuran
+        for i in range(workers):
+            farm.submit(-1 - i, frames[0], timeout=10)
+        while farm.queue_depth():
+            farm.results(timeout=0.1)
+        farm.results()
+        farm.reset_stats()
+
+        results, depths = [], []
+        start = time.perf_counter()
+        for frame_id, gray in enumerate(frames):
+            farm.submit(frame_id, gray, timeout=10)
+            depths.append(farm.queue_depth())
+            results.extend(farm.results())
+        while len(results) < len(frames):
+            results.extend(farm.results(timeout=1.0))
+        elapsed = time.perf_counter() - start
+        stats = farm.stats()
+    latencies = [r.latency_ms for r in results]
+    return {
+        "workers": workers,
+        "fps": len(frames) / elapsed,
+        "decoded": sum(1 for r in results if r.text),
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "mean_queue_depth": float(np.mean(depths)),
+        "utilisation": stats["utilisation"],
+        "busy": stats["busy"],
+        "dropped": stats["dropped"],
+    }
+
+
+def run(frames, workers, decoder):
+    # Backend tidak terpasang (ImportError di thread utama, RuntimeError dari worker farm) dilaporkan per baris
+    try:
+        return run_inline(frames, decoder) if workers == 0 else run_farm(frames, workers, decoder)
+    except (ImportError, IOError, RuntimeError) as e:
+        return {"workers": workers, "error": str(e)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="*", default=[0, 1, 2, 4], help="0 = decode di thread utama")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--decoder", default="opencv", choices=decoders.names())
+    parser.add_argument("--json", action="store_true", help="cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    frames = [f[:, :, 0].copy() for f in mvsdk_sim.synthetic_frames(count=args.frames, module_px=4)]
+    results = [run(frames, n, args.decoder) for n in args.workers]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        if "error" in r:
+            print("workers {:2d}: error {}".format(r["workers"], r["error"]))
+            continue
+        line = "workers {:2d}: {:7.1f} fps  p50 {:8.2f} ms  decoded {}/{}".format(
+            r["workers"], r["fps"], r["latency_ms_p50"], r["decoded"], args.frames)
+        if r["workers"]:
+            line += "  queue {:4.1f}  cpu {}  busy {}".format(
+                r["mean_queue_depth"], " ".join("{:.0%}".format(u) for u in r["utilisation"]),
+                " ".join("{:.0%}".format(b) for b in r["busy"]))
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Microbenchmark mvsdk.FastGrabber vs urutan tiga panggilan (GetImageBuffer/ImageProcess/Release) pada 1280x1024.
+
+Default memakai kamera simulasi tanpa ISP sehingga yang terukur hanya overhead Python/ctypes per frame.
+Dengan kamera asli: python bench_fastgrab.py --backend native
+
+    python bench_fastgrab.py --frames 2000
+    python bench_fastgrab.py --with-isp --json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import mvsdk
+import mvsdk_sim
+
+FRAME_TIMEOUT_MS = 200
+
+
+def three_call(hCamera, pFrameBuffer):
+    pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, FRAME_TIMEOUT_MS)
+    mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
+    mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
+    frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
+    frame = np.frombuffer(frame_data, dtype=np.uint8)
+    return frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+
+
+def measure(grab, n_frames):
+    for _ in range(20):
+        grab()
+    samples = np.empty(n_frames)
+    for i in range(n_frames):
+        start = time.perf_counter()
+        grab()
+        samples[i] = time.perf_counter() - start
+    samples *= 1e6
+    return {"us_mean": float(samples.mean()), "us_p50": float(np.percentile(samples, 50)),
+            "us_p99": float(np.percentile(samples, 99))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["sim", "native"], default="sim")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--with-isp", action="store_true", help="kamera simulasi ikut menjalankan demosaic")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.backend == "sim":
+        mvsdk_sim.install(fps=0, width=1280, height=1024, null_isp=not args.with_isp)
+    else:
+        mvsdk.SetBackend("native")
+
+    DevList = mvsdk.CameraEnumerateDevice()
+    if len(DevList) < 1:
+        raise SystemExit("No camera was found!")
+    hCamera = mvsdk.CameraInit(DevList[0], -1, -1)
+    cap = mvsdk.CameraGetCapability(hCamera)
+    monoCamera = (cap.sIspCapacity.bMonoSensor != 0)
+    mvsdk.CameraSetIspOutFormat(hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8 if monoCamera else mvsdk.CAMERA_MEDIA_TYPE_BGR8)
+    resize = mvsdk.tSdkImageResolution(iIndex=0xFF, iHOffsetFOV=0, iVOffsetFOV=0, iWidthFOV=1280, iHeightFOV=1024, iWidth=1280, iHeight=1024)
+    mvsdk.CameraSetImageResolution(hCamera, resize)
+    mvsdk.CameraSetTriggerMode(hCamera, 0)
+    mvsdk.CameraPlay(hCamera)
+
+    pFrameBuffer = mvsdk.CameraAlignMalloc(cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if monoCamera else 3), 16)
+    grabber = mvsdk.FastGrabber(hCamera, pFrameBuffer)
+    try:
+        report = {
+            "resolution": "1280x1024",
+            "backend": args.backend,
+            "three_call": measure(lambda: three_call(hCamera, pFrameBuffer), args.frames),
+            "fast_grabber": measure(lambda: grabber.Grab(FRAME_TIMEOUT_MS), args.frames),
+        }
+    finally:
+        grabber.Close()
+        mvsdk.CameraUnInit(hCamera)
+        mvsdk.CameraAlignFree(pFrameBuffer)
+
+    report["speedup"] = report["three_call"]["us_mean"] / report["fast_grabber"]["us_mean"]
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for name in ("three_call", "fast_grabber"):
+        print("{:<14} mean {us_mean:7.1f} us  p50 {us_p50:7.1f} us  p99 {us_p99:7.1f} us".format(name, **report[name]))
+    print("speedup: {:.2f}x".format(report["speedup"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Benchmark replay: jalankan strategi deteksi QR dari skrip Experiment*/FixCode pada frame rekaman, tanpa kamera.
+
+Sumber frame (--source):
+  - folder berisi subfolder per bucket jarak/ukuran, misalnya data/5cmQR1cm/*.png, data/20cmQR2cm/*.bmp
+  - folder gambar atau file video (.avi, .mp4, ...) sebagai satu bucket
+  - tanpa --source: frame QR sintetis dengan beberapa ukuran modul (sim_2px ... sim_6px)
+
+Per strategi dan bucket dilaporkan frame/s, latency p50/p95/p99 dan decode rate. Hasil --json bisa
+disimpan per commit dan dibandingkan dengan --compare. --select memilih backend decoders.py tercepat
+yang mencapai --target-rate pada set replay ini.
+
+    python bench_replay.py
+    python bench_replay.py --source data --strategies otsu raw --json > replay_HEAD.json
+    python bench_replay.py --source data --compare replay_base.json
+    python bench_replay.py --source data --select --target-rate 0.95
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import decoders
+import mvsdk_sim
+import qr_tracker
+
+IMAGE_EXTENSIONS = ('.bmp', '.png', '.jpg', '.jpeg', '.tif', '.tiff')
+VIDEO_EXTENSIONS = ('.avi', '.mp4', '.mkv', '.mov')
+
+# Nama bucket seperti pada CSV hasil uji: "<jarak>cmQR<ukuran>cm" (10cmQR1c.csv juga dikenali)
+BUCKET_PATTERN = re.compile(r"(\d+(?:\.\d+)?)cmQR(\d+(?:\.\d+)?)c", re.IGNORECASE)
+
+SYNTHETIC_MODULE_PX = (2, 3, 4, 6)
+REPLAY_FPS = 30.0
+
+
+#----------------------------------- Strategi deteksi ------------------------------------------
+# Setiap factory membuat detektor sekali; hasilnya strategy(gray) -> (text, points)
+
+def _opencv(preprocess):
+    def factory():
+        detector = cv2.QRCodeDetector()
+
+        def strategy(gray):
+            text, points, _ = detector.detectAndDecode(preprocess(gray))
+            return text, points
+        return strategy
+    return factory
+
+
+def _decoder(name):
+    # Adapter decoders.py: backend yang tidak terpasang menghasilkan ImportError saat factory dipanggil
+    def factory():
+        decoder = decoders.create(name)
+
+        def strategy(gray):
+            result = decoder.decode(gray)
+            return result.text, result.quad
+        return strategy
+    return factory
+
+
+def _tracker(search):
+    # Frame replay berurutan seperti rekaman konveyor; waktu frame = indeks / REPLAY_FPS
+    def factory():
+        tracker = qr_tracker.QrTracker(search=search)
+        frame_index = [0]
+
+        def strategy(gray):
+            frame_index[0] += 1
+            return tracker.track(gray, frame_index[0] / REPLAY_FPS)
+        return strategy
+    return factory
+
+
+STRATEGIES = {
+    # Experiment1DetectQRusingOpenCV.py, OptimalVer2/3: tanpa preprocessing
+    "raw": _opencv(lambda gray: gray),
+    # FixCode GUI dan OptimationCode: Otsu biner
+    "otsu": _opencv(lambda gray: cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]),
+    # Experiment1DetectQRusingOpenCV_OptimalVer1.py
+    "otsu_tozero_inv": _opencv(lambda gray: cv2.threshold(gray, 81, 255, cv2.THRESH_TOZERO_INV + cv2.THRESH_OTSU)[1]),
+    # FixCode/YOLO.py: threshold tetap 81
+    "fixed81": _opencv(lambda gray: cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY)[1]),
+    # FixCode/DetectQRusingOpenCVDouble_Otsu_BoundingBox.py
+    "otsu_multi": _decoder("opencv_multi"),
+    # Experiment1DetectQRusingPyzbar.py, Experiment1DetectQRusingPYZXING.py, FixCode/DetectQRusingYOLO.py
+    "pyzbar": _decoder("pyzbar"),
+    "pyzxing": _decoder("pyzxing"),
+    # ZXing in-process (zxing-cpp), tanpa PNG sementara dan JVM per frame
+    "zxing": _decoder("zxing"),
+    # Lokalisasi pada level piramida 1/4 atau 1/2, decode crop resolusi penuh
+    "coarse_to_fine": _decoder("coarse_to_fine"),
+    # Tracker kecepatan tetap: decode di jendela prediksi, frame penuh hanya saat track hilang
+    "tracker": _tracker("opencv"),
+    "tracker_c2f": _tracker("coarse_to_fine"),
+    # Otsu + detect, decode dilewati jika sidik jari patch QR ada di cache LRU
+    "cached": _decoder("cached"),
+    # Level piramida 1, 1.5, 2, 0.5 paralel, decode pertama yang berhasil, budget 120 ms
+    "multiscale": _decoder("multiscale"),
+    # raw -> Otsu -> adaptive -> CLAHE+Otsu -> inverted, berhenti pada decode pertama, urutan menyesuaikan diri
+    "cascade": _decoder("cascade"),
+    "qreader": _decoder("qreader"),
+}
+DEFAULT_STRATEGIES = ("raw", "otsu", "otsu_tozero_inv", "fixed81", "otsu_multi")
+
+
+#----------------------------------- Dataset ------------------------------------------
+
+def _read_video(path):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    capture.release()
+    return frames
+
+
+def _read_files(paths):
+    frames = []
+    for path in sorted(paths):
+        lower = path.lower()
+        if lower.endswith(IMAGE_EXTENSIONS):
+            img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if img is not None:
+                frames.append(img)
+        elif lower.endswith(VIDEO_EXTENSIONS):
+            frames.extend(_read_video(path))
+    return frames
+
+
+def bucket_info(name):
+    """(jarak_cm, ukuran_qr_cm) dari nama bucket, None jika tidak mengikuti pola."""
+    m = BUCKET_PATTERN.search(name)
+    if m is None:
+        return None, None
+    return float(m.group(1)), float(m.group(2))
+
+
+def load_buckets(source=None, synthetic_count=16):
+    """Dict nama bucket -> list frame abu-abu (uint8)."""
+    if source is None:
+        buckets = {}
+        for module_px in SYNTHETIC_MODULE_PX:
+            frames = mvsdk_sim.synthetic_frames(count=synthetic_count, module_px=module_px)
+            buckets["sim_{}px".format(module_px)] = [f[:, :, 0].copy() for f in frames]
+        return buckets
+    if os.path.isfile(source):
+        return {os.path.splitext(os.path.basename(source))[0]: _read_files([source])}
+    subdirs = sorted(d for d in glob.glob(os.path.join(source, '*')) if os.path.isdir(d))
+    if not subdirs:
+        return {os.path.basename(os.path.normpath(source)): _read_files(glob.glob(os.path.join(source, '*')))}
+    buckets = {}
+    for d in subdirs:
+        frames = _read_files(glob.glob(os.path.join(d, '*')))
+        if frames:
+            buckets[os.path.basename(d)] = frames
+    return buckets
+
+
+#----------------------------------- Pengukuran ------------------------------------------
+
+def summarize(latencies_ms, decoded, elapsed):
+    latencies = np.array(latencies_ms)
+    n = len(latencies)
+    return {
+        "frames": n,
+        "decoded": decoded,
+        "decode_rate": decoded / n if n else 0.0,
+        "fps": n / elapsed if elapsed > 0 else 0.0,
+        "latency_ms_p50": float(np.percentile(latencies, 50)) if n else 0.0,
+        "latency_ms_p95": float(np.percentile(latencies, 95)) if n else 0.0,
+        "latency_ms_p99": float(np.percentile(latencies, 99)) if n else 0.0,
+    }
+
+
+def run_strategy(name, buckets, repeat=1):
+    start = time.perf_counter()
+    strategy = STRATEGIES[name]()
+    setup_ms = (time.perf_counter() - start) * 1000
+    result = {"strategy": name, "setup_ms": setup_ms, "buckets": {}}
+    all_latencies, all_decoded, all_elapsed = [], 0, 0.0
+    for bucket, frames in buckets.items():
+        latencies, decoded = [], 0
+        texts = set()
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for gray in frames:
+                s = time.perf_counter()
+                text, _ = strategy(gray)
+                latencies.append((time.perf_counter() - s) * 1000)
+                if text:
+                    decoded += 1
+                    texts.add(text)
+        elapsed = time.perf_counter() - t0
+        stats = summarize(latencies, decoded, elapsed)
+        stats["distance_cm"], stats["qr_size_cm"] = bucket_info(bucket)
+        stats["distinct_texts"] = len(texts)
+        result["buckets"][bucket] = stats
+        all_latencies += latencies
+        all_decoded += decoded
+        all_elapsed += elapsed
+    result["overall"] = summarize(all_latencies, all_decoded, all_elapsed)
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Baris perbandingan fps/decode rate per strategi dan bucket terhadap laporan baseline."""
+    old = dict((r["strategy"], r) for r in baseline["results"])
+    lines = []
+    for r in report["results"]:
+        base = old.get(r["strategy"])
+        if base is None:
+            continue
+        for bucket, stats in list(r["buckets"].items()) + [("overall", r["overall"])]:
+            b = base["overall"] if bucket == "overall" else base["buckets"].get(bucket)
+            if b is None:
+                continue
+            lines.append("{:<16} {:<14} fps {:8.1f} -> {:8.1f} ({:+6.1f}%)  decode {:5.1%} -> {:5.1%}".format(
+                r["strategy"], bucket, b["fps"], stats["fps"],
+                (stats["fps"] / b["fps"] - 1) * 100 if b["fps"] else 0.0, b["decode_rate"], stats["decode_rate"]))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=None, help="folder bucket, folder gambar, atau file video")
+    parser.add_argument("--strategies", nargs="*", default=list(DEFAULT_STRATEGIES), choices=sorted(STRATEGIES))
+    parser.add_argument("--repeat", type=int, default=1, help="jumlah putaran per bucket")
+    parser.add_argument("--synthetic-frames", type=int, default=16, help="frame per bucket sintetis")
+    parser.add_argument("--json", action="store_true", help="cetak laporan sebagai JSON")
+    parser.add_argument("--compare", default=None, help="laporan JSON baseline untuk dibandingkan")
+    parser.add_argument("--select", action="store_true", help="pilih backend decoder tercepat yang mencapai --target-rate")
+    parser.add_argument("--target-rate", type=float, default=0.95)
+    args = parser.parse_args()
+
+    buckets = load_buckets(args.source, args.synthetic_frames)
+    if not buckets:
+        sys.exit("No frames found in {}".format(args.source))
+    report = {
+        "revision": git_revision(),
+        "source": args.source or "synthetic",
+        "opencv": cv2.__version__,
+        "buckets": dict((name, len(frames)) for name, frames in buckets.items()),
+        "results": [],
+    }
+    if args.select:
+        frames = [gray for bucket in buckets.values() for gray in bucket]
+        selected, evaluation = decoders.select(frames, args.target_rate)
+        report["selection"] = {"target_rate": args.target_rate, "selected": selected, "backends": evaluation}
+    for name in args.strategies:
+        try:
+            report["results"].append(run_strategy(name, buckets, args.repeat))
+        except ImportError as e:
+            print("skip {}: {}".format(name, e), file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        if args.select:
+            for name, r in sorted(report["selection"]["backends"].items()):
+                if "error" in r:
+                    print("{:<16} unavailable ({})".format(name, r["error"]))
+                else:
+                    print("{:<16} mean {:7.2f} ms  p95 {:7.2f} ms  decode {:6.1%}".format(
+                        name, r["mean_ms"], r["p95_ms"], r["decode_rate"]))
+            print("selected decoder: {} (target decode rate {:.0%})".format(report["selection"]["selected"], args.target_rate))
+        for r in report["results"]:
+            for bucket, s in list(r["buckets"].items()) + [("overall", r["overall"])]:
+                print("{:<16} {:<14} {:7.1f} fps  p50 {:7.2f}  p95 {:7.2f}  p99 {:7.2f} ms  decode {:6.1%}".format(
+                    r["strategy"], bucket, s["fps"], s["latency_ms_p50"], s["latency_ms_p95"],
+                    s["latency_ms_p99"], s["decode_rate"]))
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr if args.json else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Capture berbasis callback SDK (CameraSetCallbackFunction) dengan slot FrameRing sebagai antrian.
+
+SDK memanggil callback dari thread miliknya sendiri setiap ada frame baru, jadi tidak ada polling
+CameraGetImageBuffer(hCamera, 200) dan tidak ada putaran timeout. Di dalam callback hanya dilakukan
+ISP ke slot bebas lalu slot dipublikasikan; pemrosesan (decode, tampilan) dilakukan di thread konsumen.
+
+Antrian dibatasi jumlah slot ring. Jika penuh:
+    DROP_OLDEST  frame READY tertua ditimpa (konsumen selalu mendapat frame terbaru)
+    DROP_NEWEST  frame baru dibuang tanpa ISP (frame yang sudah antri tidak pernah hilang)
+
+    engine = CallbackCapture(hCamera, FrameRing.for_camera(cap, modeMono))
+    engine.start()
+    slot = engine.get(timeout=0.1)
+    if slot is not None:
+        with slot:
+            decode(slot.frame)
+    engine.stop()
+"""
+import ctypes
+import threading
+
+import mvsdk
+from frame_ring import IS_WINDOWS
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class CallbackCapture(object):
+    def __init__(self, hCamera, ring, drop_policy=DROP_OLDEST, flip=IS_WINDOWS):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError("drop_policy must be one of {}".format(DROP_POLICIES))
+        self.hCamera = hCamera
+        self.ring = ring
+        self.drop_policy = drop_policy
+        self.flip = flip
+        self.received = 0
+        self.dropped_newest = 0
+        self.errors = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        self._running = True
+        mvsdk.CameraSetCallbackFunction(self.hCamera, self.OnFrame, 0)
+
+    def stop(self):
+        """Lepas callback. Setelah kembali, SDK tidak memanggil OnFrame lagi."""
+        self._running = False
+        mvsdk.CameraSetCallbackFunction(self.hCamera, mvsdk.CAMERA_SNAP_PROC(), 0)
+
+    def get(self, timeout=None):
+        """Ambil frame antrian tertua (FIFO). Kembalikan dengan release() atau blok `with slot:`."""
+        return self.ring.get(timeout, latest=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "received": self.received,
+                "published": self.ring.published,
+                "dropped_newest": self.dropped_newest,
+                "dropped_oldest": self.ring.dropped,
+                "errors": self.errors,
+            }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @mvsdk.method(mvsdk.CAMERA_SNAP_PROC)
+    def OnFrame(self, hCamera, pRawData, pFrameHead, pContext):
+        # Dipanggil dari thread SDK: exception tidak boleh keluar dari callback
+        with self._lock:
+            self.received += 1
+        slot = self.ring.acquire_write(0, recycle=self.drop_policy == DROP_OLDEST) if self._running else None
+        if slot is None:
+            if self._running:
+                with self._lock:
+                    self.dropped_newest += 1
+            mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
+            return
+        try:
+            # pFrameHead hanya valid selama callback, salin ke head milik slot
+            FrameHead = slot.head if slot.head is not None else mvsdk.tSdkFrameHead()
+            ctypes.memmove(ctypes.addressof(FrameHead), pFrameHead, ctypes.sizeof(FrameHead))
+            err_code = mvsdk.CameraImageProcess(hCamera, pRawData, slot.address, FrameHead)
+            if err_code != mvsdk.CAMERA_STATUS_SUCCESS:
+                raise mvsdk.CameraException(err_code)
+            if self.flip:
+                mvsdk.CameraFlipFrameBuffer(slot.address, FrameHead, 1)
+        except Exception as e:
+            self.ring.cancel(slot)
+            with self._lock:
+                self.errors += 1
+                self.last_error = e
+            return
+        finally:
+            mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
+        self.ring.publish(slot, FrameHead)
@@ -0,0 +1,272 @@
+"""Capture + decode beberapa kamera sekaligus, satu worker thread per kamera.
+
+Perangkat dienumerasi sekali, kamera dipilih dengan serial number atau friendly name (bukan
+input("Select camera: ")). Setiap worker membuka kameranya sendiri, mengambil frame lewat
+mvsdk.FastGrabber dan langsung men-decode. Panggilan SDK (ctypes) dan OpenCV melepas GIL,
+sehingga thread cukup untuk menjalankan kamera secara paralel.
+
+Hasil semua kamera digabung menjadi satu aliran berurutan menurut waktu capture. Timestamp
+kamera (uiTimeStamp, jam masing-masing kamera) dipetakan ke jam host dengan offset minimum
+(host_terima - timestamp_kamera), lalu hasil ditahan selama reorder_window sebelum dikeluarkan
+(default: mengikuti latency capture -> decode terbesar antar kamera).
+
+    manager = CameraManager()
+    manager.open(["SIM00000", "SimCam1"])
+    manager.start()
+    result = manager.get(timeout=1.0)   # CameraResult berikutnya menurut waktu capture
+    print(manager.stats())
+    manager.close()
+"""
+import collections
+import heapq
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import mvsdk
+
+FRAME_TIMEOUT_MS = 200
+
+
+class QrDecoder(object):
+    """Decoder default: threshold Otsu + cv2.QRCodeDetector, satu instance per worker."""
+
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+
+    def __call__(self, frame):
+        if frame.ndim == 3:
+            frame = frame[:, :, 0] if frame.shape[2] == 1 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = frame
+        _, th = cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        text, points, _ = self.detector.detectAndDecode(th)
+        return text, points
+
+
+class CameraResult(object):
+    __slots__ = ("camera", "frame_id", "timestamp", "text", "points", "latency_ms")
+
+    def __init__(self, camera, frame_id, timestamp, text, points, latency_ms):
+        self.camera = camera          # serial number kamera
+        self.frame_id = frame_id      # nomor frame per kamera (urutan grab worker)
+        self.timestamp = timestamp    # waktu capture dalam jam host (time.perf_counter)
+        self.text = text
+        self.points = points
+        self.latency_ms = latency_ms  # capture -> selesai decode
+
+    def __lt__(self, other):
+        return self.timestamp < other.timestamp
+
+    def __repr__(self):
+        return "CameraResult({}, frame={}, t={:.4f}, {!r})".format(self.camera, self.frame_id, self.timestamp, self.text)
+
+
+class CameraWorker(threading.Thread):
+    def __init__(self, manager, DevInfo, decoder, configure=None):
+        super(CameraWorker, self).__init__(name="camera-{}".format(DevInfo.GetSn()), daemon=True)
+        self.manager = manager
+        self.DevInfo = DevInfo
+        self.serial = DevInfo.GetSn()
+        self.friendly_name = DevInfo.GetFriendlyName()
+        self.decoder = decoder
+        self.configure = configure
+        self.hCamera = 0
+        self.error = None
+        self.ready = threading.Event()
+        self._stop_event = threading.Event()
+
+        self.frames = 0
+        self.decoded = 0
+        self.timeouts = 0
+        self.sdk_lost = 0
+        self.started_at = None
+        self.latencies_ms = collections.deque(maxlen=1000)
+        self.latency_ema = 0.0
+        self._offset = None
+
+    def open(self):
+        self.hCamera = mvsdk.CameraInit(self.DevInfo, -1, -1)
+        cap = mvsdk.CameraGetCapability(self.hCamera)
+        # Decode hanya butuh citra abu-abu
+        mvsdk.CameraSetIspOutFormat(self.hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8)
+        mvsdk.CameraSetTriggerMode(self.hCamera, 0)
+        if self.configure is not None:
+            self.configure(self.hCamera, cap)
+        mvsdk.CameraPlay(self.hCamera)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def capture_time(self, uiTimeStamp, received):
+        """Waktu capture dalam jam host dari timestamp kamera (satuan 0.1 ms)."""
+        camera_time = uiTimeStamp / 10000.0
+        offset = received - camera_time
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+        return camera_time + self._offset
+
+    def run(self):
+        try:
+            self.open()
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        grabber = mvsdk.FastGrabber(self.hCamera)
+        self.started_at = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    frame = grabber.Grab(FRAME_TIMEOUT_MS)
+                except mvsdk.CameraException as e:
+                    if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                        self.error = e
+                        break
+                    self.timeouts += 1
+                    continue
+                timestamp = self.capture_time(grabber.head.uiTimeStamp, time.perf_counter())
+                frame_id = self.frames
+                self.frames += 1
+                text, points = self.decoder(frame)
+                latency_ms = (time.perf_counter() - timestamp) * 1000
+                self.latencies_ms.append(latency_ms)
+                self.latency_ema = latency_ms / 1000 if self.frames == 1 else 0.9 * self.latency_ema + 0.1 * latency_ms / 1000
+                if text:
+                    self.decoded += 1
+                if text or self.manager.emit_misses:
+                    self.manager._push(CameraResult(self.serial, frame_id, timestamp, text, points, latency_ms))
+            self.sdk_lost = mvsdk.CameraGetFrameStatistic(self.hCamera).iLost
+        finally:
+            grabber.Close()
+            mvsdk.CameraUnInit(self.hCamera)
+            self.hCamera = 0
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        latencies = np.array(self.latencies_ms) if self.latencies_ms else None
+        if self.hCamera:
+            self.sdk_lost = mvsdk.CameraGetFrameStatistic(self.hCamera).iLost
+        return {
+            "serial": self.serial,
+            "name": self.friendly_name,
+            "frames": self.frames,
+            "decoded": self.decoded,
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "latency_ms_p50": float(np.percentile(latencies, 50)) if latencies is not None else 0.0,
+            "latency_ms_p95": float(np.percentile(latencies, 95)) if latencies is not None else 0.0,
+            "timeouts": self.timeouts,
+            "sdk_lost": self.sdk_lost,
+            "error": repr(self.error) if self.error else None,
+        }
+
+
+class CameraManager(object):
+    """decoder_factory() membuat decoder untuk tiap worker: decoder(frame) -> (text, points).
+
+    reorder_window (detik) None = otomatis, 1.5x latency rata-rata terbesar antar worker.
+    """
+
+    def __init__(self, decoder_factory=QrDecoder, reorder_window=None, emit_misses=False, max_pending=1024):
+        self.devices = mvsdk.CameraEnumerateDevice()
+        self.decoder_factory = decoder_factory
+        self.reorder_window = reorder_window
+        self.emit_misses = emit_misses
+        self.max_pending = max_pending
+        self.workers = []
+        self.late = 0
+        self.overflow = 0
+        self._heap = []
+        self._last_emitted = float("-inf")
+        self._cond = threading.Condition()
+
+    def find(self, selector):
+        """DevInfo dengan serial number atau friendly name = selector."""
+        for DevInfo in self.devices:
+            if selector in (DevInfo.GetSn(), DevInfo.GetFriendlyName()):
+                return DevInfo
+        raise ValueError("No camera with serial or name {!r}".format(selector))
+
+    def open(self, selectors=None, configure=None):
+        """Siapkan worker untuk kamera yang dipilih (None = semua kamera). configure(hCamera, cap) opsional."""
+        devices = self.devices if selectors is None else [self.find(s) for s in selectors]
+        for DevInfo in devices:
+            self.workers.append(CameraWorker(self, DevInfo, self.decoder_factory(), configure))
+        return self.workers
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        for worker in self.workers:
+            worker.ready.wait()
+            if worker.error is not None:
+                self.close()
+                raise worker.error
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.join()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _push(self, result):
+        with self._cond:
+            if len(self._heap) >= self.max_pending:
+                # Konsumen tidak mengambil hasil: buang yang tertua
+                heapq.heappop(self._heap)
+                self.overflow += 1
+            heapq.heappush(self._heap, result)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Hasil berikutnya menurut waktu capture, atau None jika tidak ada sampai timeout habis.
+
+        Hasil dikeluarkan setelah berumur reorder_window sehingga hasil kamera lain yang lebih
+        awal tetapi selesai di-decode belakangan masih bisa disisipkan di depannya.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                now = time.perf_counter()
+                wait = None
+                if self._heap:
+                    wait = self._heap[0].timestamp + self.window() - now
+                    if wait <= 0:
+                        result = heapq.heappop(self._heap)
+                        if result.timestamp < self._last_emitted:
+                            self.late += 1
+                        self._last_emitted = max(self._last_emitted, result.timestamp)
+                        return result
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def window(self):
+        if self.reorder_window is not None:
+            return self.reorder_window
+        return 1.5 * max([worker.latency_ema for worker in self.workers] or [0.0]) + 0.005
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._heap)
+        return {
+            "cameras": [worker.stats() for worker in self.workers],
+            "pending": pending,
+            "reorder_window_ms": self.window() * 1000,
+            "late": self.late,
+            "overflow": self.overflow,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,14 +1,12 @@
 #coding=utf-8
 import cv2
-import numpy as np
 import mvsdk
-import time
-import platform
+from callback_capture import CallbackCapture
+from frame_ring import FrameRing
 
 class App(object):
 	def __init__(self):
 		super(App, self).__init__()
-		self.pFrameBuffer = 0
 		self.quit = False
 
 	def main(self):
@@ -56,54 +54,35 @@ class App(object):
 		# Memulai thread pengambilan gambar di dalam SDK
 		mvsdk.CameraPlay(hCamera)
 
-		# Menghitung ukuran buffer RGB yang diperlukan, di sini 
-		# dialokasikan langsung berdasarkan resolusi maksimal kamera
-		FrameBufferSize = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if monoCamera else 3)
-
-		# Mengalokasikan buffer RGB, digunakan untuk menyimpan gambar keluaran dari ISP
+		# Ring berisi beberapa buffer RGB seukuran resolusi maksimal kamera, digunakan untuk menyimpan gambar keluaran dari ISP
 		# Catatan: Data yang dikirim dari kamera ke PC adalah data RAW, yang dikonversi menjadi data RGB melalui ISP di PC 
 		# (Jika kamera hitam putih, tidak perlu mengonversi format, namun ISP masih melakukan pemrosesan lainnya, jadi buffer ini tetap diperlukan)
-		self.pFrameBuffer = mvsdk.CameraAlignMalloc(FrameBufferSize, 16)
+		ring = FrameRing.for_camera(cap, monoCamera, n_slots=4)
 
-		# Mengatur fungsi callback pengambilan gambar
-		self.quit = False
-		mvsdk.CameraSetCallbackFunction(hCamera, self.GrabCallback, 0)
+		# Callback SDK hanya menjalankan ISP ke slot ring dan mengantrikannya (termasuk flip vertikal di Windows);
+		# imshow/waitKey dijalankan di thread ini, bukan di dalam callback
+		engine = CallbackCapture(hCamera, ring)
+		engine.start()
 
-		# Menunggu untuk keluar
+		self.quit = False
 		while not self.quit:
-			time.sleep(0.1)
+			slot = engine.get(timeout=0.1)
+			if slot is None:
+				continue
+			with slot:
+				frame = cv2.resize(slot.frame, (640,480), interpolation = cv2.INTER_LINEAR)
+			cv2.imshow("Press q to end", frame)
+			if (cv2.waitKey(1) & 0xFF) == ord('q'):
+				self.quit = True
+
+		engine.stop()
+		print(engine.stats())
 
 		# Menutup kamera
 		mvsdk.CameraUnInit(hCamera)
 
 		# Membebaskan buffer frame
-		mvsdk.CameraAlignFree(self.pFrameBuffer)
-
-	@mvsdk.method(mvsdk.CAMERA_SNAP_PROC)
-	def GrabCallback(self, hCamera, pRawData, pFrameHead, pContext):
-		FrameHead = pFrameHead[0]
-		pFrameBuffer = self.pFrameBuffer
-
-		mvsdk.CameraImageProcess(hCamera, pRawData, pFrameBuffer, FrameHead)
-		mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
-
-		# Di Windows, data gambar yang diambil biasanya terbalik secara vertikal dan disimpan dalam format BMP. 
-		# Untuk mengonversinya ke OpenCV, gambar tersebut perlu dibalik secara vertikal agar orientasinya benar
-		# Di Linux, gambar yang dihasilkan langsung dalam orientasi yang benar, sehingga tidak memerlukan pembalikan vertikal
-		if platform.system() == "Windows":
-			mvsdk.CameraFlipFrameBuffer(pFrameBuffer, FrameHead, 1)
-		
-		# Pada saat ini, gambar sudah disimpan di dalam pFrameBuffer, untuk kamera berwarna, pFrameBuffer berisi data RGB, 
-		# sedangkan untuk kamera hitam putih, pFrameBuffer berisi data grayscale 8-bit
-		# Mengonversi pFrameBuffer menjadi format gambar OpenCV untuk pemrosesan algoritma selanjutnya
-		frame_data = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(pFrameBuffer)
-		frame = np.frombuffer(frame_data, dtype=np.uint8)
-		frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3) )
-
-		frame = cv2.resize(frame, (640,480), interpolation = cv2.INTER_LINEAR)
-		cv2.imshow("Press q to end", frame)
-		if (cv2.waitKey(1) & 0xFF) == ord('q'):
-			self.quit = True
+		ring.close()
 
 def main():
 	try:
@@ -0,0 +1,181 @@
+"""Cache hasil decode QR dengan kunci sidik jari patch QR yang sudah direktifikasi.
+
+Selama satu produk lewat, payload yang sama di-decode 10-30 kali. Setelah detect() memberi quad, jumlah
+modul per sisi (21, 25, ..., 177) diperkirakan dari lebar ketiga finder pattern, lalu patch diluruskan ke
+grid modul itu dan setiap modul dibaca di bagian tengahnya (bukan grid tetap 32x32 yang lebih kasar dari
+kode versi 4 ke atas). Hasilnya bit modul QR itu sendiri, jadi kode yang sama memberi sidik jari yang identik
+dan hanya kecocokan persis yang dipakai; serial berbeda pada label yang sama berbeda >= 70 modul. Jika grid
+modul tidak bisa ditentukan (kode terlalu kecil/buram) fingerprint() mengembalikan None dan cache dilewati.
+Hanya decode yang berhasil yang disimpan.
+
+    cache = DecodeCache()
+    found, points = detector.detect(th)
+    if found:
+        fp = fingerprint(th, points)          # None: tidak di-cache, lookup() selalu miss
+        text = cache.lookup(fp)
+        if text is None:
+            text, _ = detector.decode(th, points)
+            cache.store(fp, text, elapsed_ms)
+
+CachedDecoder (decoders.create("cached", inner=..., fallback=...)) membungkus langkah ini sebagai Decoder
+sehingga bisa dipasang di dalam rantai tracker / coarse_to_fine.
+"""
+import collections
+import time
+
+import cv2
+import numpy as np
+
+import decoders
+import detector_pool
+
+# Jumlah modul per sisi untuk versi QR 1..40
+MODULE_COUNTS = np.arange(1, 41) * 4 + 17
+# Rasio run finder pattern sepanjang diagonal dari sudut: gelap, terang, gelap 3, terang, gelap
+FINDER_RUNS = np.array([1, 1, 3, 1, 1])
+LOCATE_SIDE = 256
+CELL = 4
+
+
+def _rectify(gray, quad, side):
+    """Patch side x side dari quad (TL, TR, BR, BL). Hanya TL, TR dan BL (pusat finder) yang dipakai:
+    sudut BR dari detect() hanya perkiraan dan bisa meleset satu modul."""
+    src = np.asarray(quad, dtype=np.float32).reshape(-1, 2)[:4]
+    # Sudut detect() ada di pusat piksel tepi kode; geser setengah piksel keluar ke tepi kode
+    src = src + 0.5 * np.sign(src - src.mean(axis=0))
+    dst = np.array([[0, 0], [side, 0], [0, side]], dtype=np.float32) - 0.5
+    return cv2.warpAffine(gray, cv2.getAffineTransform(src[[0, 1, 3]], dst), (side, side))
+
+
+def _finder_unit(dark):
+    """Lebar satu modul (piksel) dari run 1:1:3:1:1 di awal garis, None jika bukan finder pattern."""
+    if not dark[:4].any():
+        return None
+    start = int(np.argmax(dark[:4]))
+    change = np.flatnonzero(dark[start + 1:] != dark[start:-1]) + 1
+    if len(change) < 5:
+        return None
+    runs = np.diff(np.concatenate(([0], change[:5])))
+    unit = (change[4] + start) / 7.0
+    if np.any(np.abs(runs - unit * FINDER_RUNS) > 0.5 * unit * FINDER_RUNS + 1):
+        return None
+    return unit
+
+
+def module_count(patch):
+    """Jumlah modul per sisi dari patch QR yang sudah diluruskan, None jika finder pattern tidak terbaca."""
+    _, binary = cv2.threshold(patch, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    dark = binary == 0
+    side = dark.shape[0]
+    t = np.arange(side)
+    r = side - 1 - t
+    units = [u for u in (_finder_unit(dark[t, t]), _finder_unit(dark[t, r]), _finder_unit(dark[r, t])) if u]
+    if len(units) < 2:
+        return None
+    estimate = side / np.median(units)
+    n = MODULE_COUNTS[np.argmin(np.abs(MODULE_COUNTS - estimate))]
+    return int(n) if abs(n - estimate) < 2 else None
+
+
+def fingerprint(gray, quad):
+    """Bit modul (gelap = 1) dari kode QR di dalam quad, dikemas ke uint8. None jika grid modul tidak ditemukan."""
+    n = module_count(_rectify(gray, quad, LOCATE_SIDE))
+    if n is None:
+        return None
+    grid = _rectify(gray, quad, n * CELL)
+    # Rata-rata bagian tengah tiap modul, tepi modul (blur, sudut kurang tepat) dibuang
+    modules = grid.reshape(n, CELL, n, CELL)[:, 1:CELL - 1, :, 1:CELL - 1].mean(axis=(1, 3))
+    threshold = 0.5 * (np.percentile(modules, 5) + np.percentile(modules, 95))
+    return np.packbits(modules <= threshold)
+
+
+class DecodeCache(object):
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self._entries = collections.OrderedDict()   # bytes sidik jari -> payload
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0                 # perkiraan waktu decode yang dihemat (rata-rata decode x hit)
+        self._decode_ms = 0.0
+        self._decodes = 0
+
+    def lookup(self, fp):
+        """Payload untuk sidik jari fp (kecocokan persis), None jika tidak ada di cache atau fp None."""
+        text = self._entries.get(fp.tobytes()) if fp is not None else None
+        if text is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(fp.tobytes())
+        self.hits += 1
+        if self._decodes:
+            self.saved_ms += self._decode_ms / self._decodes
+        return text
+
+    def store(self, fp, text, elapsed_ms=None):
+        """Simpan payload hasil decode yang berhasil; elapsed_ms dipakai untuk perkiraan saved_ms."""
+        if elapsed_ms is not None:
+            self._decode_ms += elapsed_ms
+            self._decodes += 1
+        if not text or fp is None:
+            return
+        self._entries[fp.tobytes()] = text
+        self._entries.move_to_end(fp.tobytes())
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries), "saved_ms": self.saved_ms,
+                "mean_decode_ms": self._decode_ms / self._decodes if self._decodes else 0.0}
+
+
+class CachedDecoder(decoders.Decoder):
+    """detect() OpenCV pada citra Otsu, decode dilewati jika patch QR ada di cache.
+
+    Cache miss: crop di sekitar QR di-decode dengan inner (None = decode() OpenCV pada citra Otsu), lalu dengan
+    fallback jika inner gagal (misalnya cascade binarisasi). Jika detect() tidak menemukan QR, frame diserahkan
+    ke inner (multiscale bisa menemukan kode kecil yang tidak terlihat pada level 1); fallback tidak dijalankan
+    karena frame tanpa QR akan membayar semua langkahnya.
+    """
+
+    name = "cached"
+
+    def __init__(self, cache=None, inner=None, fallback=None):
+        self.cache = DecodeCache() if cache is None else cache
+        self.inner = decoders.create(inner) if isinstance(inner, str) else inner
+        self.fallback = decoders.create(fallback) if isinstance(fallback, str) else fallback
+
+    def _decode(self, gray):
+        detector = detector_pool.get("opencv")
+        th = decoders.otsu(gray)
+        found, points = detector.detect(th)
+        if not found or points is None:
+            if self.inner is None:
+                return "", None
+            result = self.inner.decode(gray)
+            return result.text, result.quad
+        quad = decoders._quad(points)
+        fp = fingerprint(th, points)
+        text = self.cache.lookup(fp)
+        if text is None:
+            start = time.perf_counter()
+            if self.inner is None:
+                text, _ = detector.decode(th, points)
+            else:
+                text = self._decode_crop(self.inner, gray, quad)
+            if not text and self.fallback is not None:
+                text = self._decode_crop(self.fallback, gray, quad)
+            self.cache.store(fp, text, (time.perf_counter() - start) * 1000)
+        return text, quad
+
+    @staticmethod
+    def _decode_crop(decoder, gray, quad):
+        x0, y0, x1, y1 = decoders.crop_box(gray.shape, quad)
+        return decoder.decode(gray[y0:y1, x0:x1]).text
+
+    def stats(self):
+        return self.cache.stats()
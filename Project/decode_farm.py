@@ -0,0 +1,281 @@
+"""Farm decode QR: N proses worker, frame lewat slot multiprocessing.shared_memory (tanpa pickle piksel).
+
+Semua decode di satu thread Python bersama capture dan display membuat satu decode lambat menahan seluruh
+loop, dan thread tambahan tetap berbagi GIL untuk kode Python di sekitar OpenCV. DecodeFarm menyalin frame
+ke slot kosong di satu blok shared memory, mengirim (frame_id, slot, ukuran) ke antrian tugas, dan worker
+men-decode view slot itu dengan backend decoders.py. Hasil kembali lewat antrian hasil dengan kunci frame ID;
+thread collector mengembalikan slot ke daftar kosong dan mencatat waktu per worker.
+
+utilisation di stats() adalah waktu CPU proses worker selama decode (time.process_time()) dibagi waktu sejak
+start(), jadi worker yang menunggu GIL, I/O atau core yang dipakai proses lain tidak terhitung sibuk; nilai
+di atas 100% berarti OpenCV memakai lebih dari satu thread di worker itu. busy adalah waktu dinding decode
+dibagi waktu yang sama. Selisih keduanya menunjukkan worker berebut core (misalnya workers > jumlah core).
+
+Exception di worker (decode gagal, backend tidak terpasang) tidak mematikan farm diam-diam: decode yang gagal
+kembali sebagai FarmResult dengan error dan slotnya tetap dikembalikan; worker yang mati (gagal membuat decoder
+atau crash) membuat results() dan submit() melempar RuntimeError, jadi pemanggil tidak menunggu selamanya.
+
+Saat ini hanya dipakai bench_farm.py; belum ada skrip kamera yang memakai farm.
+
+    farm = DecodeFarm(workers=4, max_shape=(1024, 1280))
+    farm.start()
+    farm.submit(meta.frame_id, gray)          # False jika semua slot terpakai (frame di-drop)
+    for result in farm.results():             # FarmResult yang sudah selesai, tanpa menunggu
+        print(result.frame_id, result.text)
+    print(farm.stats())                       # queue_depth, utilisation (CPU) dan busy per worker
+    farm.close()
+
+Di Windows worker dijalankan dengan spawn, jadi skrip pemanggil harus memakai if __name__ == "__main__".
+"""
+import collections
+import multiprocessing
+import queue
+import threading
+import time
+
+import numpy as np
+from multiprocessing import shared_memory
+
+import decoders
+
+
+class FarmResult(object):
+    __slots__ = ("frame_id", "text", "quad", "decode_ms", "cpu_ms", "latency_ms", "worker", "error")
+
+    def __init__(self, frame_id, text, quad, decode_ms, cpu_ms, latency_ms, worker, error=None):
+        self.frame_id = frame_id
+        self.text = text
+        self.quad = quad              # float32 (4, 2) atau None
+        self.decode_ms = decode_ms    # waktu dinding decode di worker
+        self.cpu_ms = cpu_ms          # waktu CPU proses worker selama decode
+        self.latency_ms = latency_ms  # submit -> hasil diterima collector
+        self.worker = worker
+        self.error = error            # pesan exception decode di worker, None jika tidak ada
+
+    def __repr__(self):
+        return "FarmResult(frame={}, worker={}, {!r}, {:.2f} ms)".format(
+            self.frame_id, self.worker, self.text, self.decode_ms)
+
+
+def _error(e):
+    return "{}: {}".format(type(e).__name__, e)
+
+
+def _worker(index, shm_name, slot_size, decoder_name, decoder_kwargs, tasks, results):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        try:
+            decoder = decoders.create(decoder_name, **decoder_kwargs)
+        except Exception as e:
+            # frame_id None: worker tidak bisa dipakai dan berhenti
+            results.put((None, None, "", None, 0.0, 0.0, index, _error(e)))
+            return
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            frame_id, slot, height, width = task
+            gray = np.ndarray((height, width), dtype=np.uint8, buffer=shm.buf, offset=slot * slot_size)
+            start, cpu_start = time.perf_counter(), time.process_time()
+            text, quad, error = "", None, None
+            try:
+                result = decoder.decode(gray)
+                text, quad = result.text, result.quad
+            except Exception as e:
+                error = _error(e)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            del gray    # view harus dilepas sebelum shm.close()
+            # Hasil selalu dikirim, juga saat decode gagal, agar slot kembali ke daftar kosong
+            results.put((frame_id, slot, text, quad, elapsed_ms, cpu_ms, index, error))
+        decoder.close()
+    finally:
+        shm.close()
+
+
+class DecodeFarm(object):
+    def __init__(self, workers=None, max_shape=(1024, 1280), slots=None, decoder="opencv", decoder_kwargs=None,
+                 max_results=1024):
+        if decoder not in decoders.DECODERS:
+            raise ValueError("Unknown decoder {!r}, available: {}".format(decoder, decoders.names()))
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_shape = max_shape
+        self.slots = slots or 2 * self.workers    # satu sedang di-decode + satu menunggu per worker
+        self.slot_size = max_shape[0] * max_shape[1]
+        self.decoder = decoder
+        self.decoder_kwargs = decoder_kwargs or {}
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0               # frame yang ditolak karena semua slot terpakai
+        self.busy_ms = [0.0] * self.workers    # waktu dinding decode per worker
+        self.cpu_ms = [0.0] * self.workers     # waktu CPU decode per worker
+        self.done = [0] * self.workers
+        self.errors = 0                # decode yang melempar exception di worker
+        self.dead = {}                 # indeks worker -> sebab worker berhenti
+        self.started_at = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._shm = None
+        self._tasks = None
+        self._results_queue = None
+        self._processes = []
+        self._free = queue.Queue()
+        self._submit_time = {}
+        self._lock = threading.Lock()
+        self._ready = collections.deque(maxlen=max_results)
+        self._cond = threading.Condition(self._lock)
+        self._collector = None
+        self._closing = False
+
+    def start(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_size)
+        self._tasks = self._ctx.Queue()
+        self._results_queue = self._ctx.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        for index in range(self.workers):
+            process = self._ctx.Process(target=_worker, name="decode-farm-{}".format(index), daemon=True, args=(
+                index, self._shm.name, self.slot_size, self.decoder, self.decoder_kwargs, self._tasks,
+                self._results_queue))
+            process.start()
+            self._processes.append(process)
+        self._collector = threading.Thread(target=self._collect, name="decode-farm-collector", daemon=True)
+        self._collector.start()
+        self.started_at = time.perf_counter()
+        return self
+
+    def submit(self, frame_id, gray, timeout=0):
+        """Salin frame ke slot kosong dan antrekan decode. False jika tidak ada slot dalam timeout (detik).
+
+        RuntimeError jika ada worker yang mati.
+        """
+        self._check_workers()
+        height, width = gray.shape[:2]
+        if height > self.max_shape[0] or width > self.max_shape[1]:
+            raise ValueError("Frame {}x{} larger than farm slot {}x{}".format(width, height, *self.max_shape[::-1]))
+        try:
+            slot = self._free.get(timeout=timeout) if timeout else self._free.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.dropped += 1
+            return False
+        view = np.ndarray((height, width), dtype=np.uint8, buffer=self._shm.buf, offset=slot * self.slot_size)
+        np.copyto(view, gray[:, :, 0] if gray.ndim == 3 else gray)
+        with self._lock:
+            self.submitted += 1
+            self._submit_time[frame_id] = time.perf_counter()
+        self._tasks.put((frame_id, slot, height, width))
+        return True
+
+    def _collect(self):
+        while True:
+            try:
+                item = self._results_queue.get(timeout=0.5)
+            except queue.Empty:
+                # Worker yang crash (tanpa sempat mengirim error) hanya terlihat dari prosesnya
+                self._reap()
+                continue
+            if item is None:
+                break
+            frame_id, slot, text, quad, decode_ms, cpu_ms, worker, error = item
+            if frame_id is None:
+                with self._cond:
+                    self.dead[worker] = error
+                    self._cond.notify_all()
+                continue
+            self._free.put(slot)
+            now = time.perf_counter()
+            with self._cond:
+                submitted = self._submit_time.pop(frame_id, now)
+                self.completed += 1
+                self.busy_ms[worker] += decode_ms
+                self.cpu_ms[worker] += cpu_ms
+                self.done[worker] += 1
+                if error is not None:
+                    self.errors += 1
+                self._ready.append(FarmResult(frame_id, text, quad, decode_ms, cpu_ms, (now - submitted) * 1000,
+                                              worker, error))
+                self._cond.notify_all()
+
+    def _reap(self):
+        with self._cond:
+            if self._closing:
+                return
+            for index, process in enumerate(self._processes):
+                if index not in self.dead and not process.is_alive():
+                    self.dead[index] = "exited with code {}".format(process.exitcode)
+                    self._cond.notify_all()
+
+    def _check_workers(self):
+        with self._lock:
+            dead = dict(self.dead)
+        if dead:
+            raise RuntimeError("Decode farm worker(s) died: " + "; ".join(
+                "worker {}: {}".format(index, reason) for index, reason in sorted(dead.items())))
+
+    def results(self, timeout=0):
+        """Semua hasil yang sudah selesai (urutan selesai). Dengan timeout, tunggu sampai ada satu hasil.
+
+        RuntimeError jika ada worker yang mati (hasil yang sudah selesai sebelumnya tetap dikembalikan dulu).
+        """
+        with self._cond:
+            if not self._ready and not self.dead and timeout:
+                self._cond.wait(timeout)
+            ready = list(self._ready)
+            self._ready.clear()
+        if not ready:
+            self._check_workers()
+        return ready
+
+    def queue_depth(self):
+        """Frame yang sudah di-submit tetapi hasilnya belum kembali."""
+        with self._lock:
+            return self.submitted - self.completed
+
+    def reset_stats(self):
+        """Mulai ulang waktu per worker dan jam utilisation (misalnya setelah warm-up)."""
+        with self._lock:
+            self.busy_ms = [0.0] * self.workers
+            self.cpu_ms = [0.0] * self.workers
+            self.done = [0] * self.workers
+            self.started_at = time.perf_counter()
+
+    def stats(self):
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000 if self.started_at else 0.0
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "slots": self.slots,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "dead_workers": dict(self.dead),
+                "queue_depth": self.submitted - self.completed,
+                "utilisation": [cpu / elapsed_ms if elapsed_ms else 0.0 for cpu in self.cpu_ms],
+                "busy": [busy / elapsed_ms if elapsed_ms else 0.0 for busy in self.busy_ms],
+                "per_worker_decoded": list(self.done),
+            }
+
+    def close(self):
+        if self._shm is None:
+            return
+        with self._lock:
+            self._closing = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._results_queue.put(None)
+        self._collector.join()
+        self._processes = []
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,552 @@
+"""Satu antarmuka Decoder untuk semua backend decode QR yang pernah dicoba di repo ini.
+
+    decoder = decoders.create("opencv")
+    result = decoder.decode(gray)        # DecodeResult: text ("" jika gagal), quad (4x2) atau None, elapsed_ms
+    if result:
+        print(result.text, result.quad)
+
+Backend: opencv (detectAndDecode, Otsu), opencv_multi (detectAndDecodeMulti), pyzbar, zxing (zxing-cpp,
+in-process), pyzxing (ZXing Java, satu proses JVM per frame), qreader, coarse_to_fine (lokalisasi pada
+frame yang diperkecil, decode crop resolusi penuh dengan backend lain), multiscale (beberapa level
+piramida paralel dengan batas waktu), cascade (binarisasi bertingkat yang urutannya menyesuaikan diri) dan
+cached (decode dilewati jika sidik jari QR ada di cache, decode_cache.py).
+Library berat (pyzbar, zxing-cpp, pyzxing, qreader) baru di-import saat backend itu dibuat, jadi import modul ini
+hanya membutuhkan OpenCV. select() menjalankan backend pada frame replay dan memilih yang tercepat
+dengan decode rate >= target.
+"""
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cv2
+import numpy as np
+
+import detector_pool
+
+
+class DecodeResult(object):
+    __slots__ = ("text", "quad", "elapsed_ms", "backend")
+
+    def __init__(self, text, quad, elapsed_ms, backend):
+        self.text = text              # teks QR, "" jika tidak ter-decode
+        self.quad = quad              # sudut QR float32 (4, 2) dalam koordinat frame, None jika tidak ada
+        self.elapsed_ms = elapsed_ms
+        self.backend = backend
+
+    def __bool__(self):
+        return bool(self.text)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "DecodeResult({}, {!r}, {:.2f} ms)".format(self.backend, self.text, self.elapsed_ms)
+
+
+def _quad(points):
+    if points is None:
+        return None
+    quad = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    return quad[:4] if len(quad) >= 4 else None
+
+
+def otsu(gray):
+    return cv2.threshold(gray, 81, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+def crop_box(shape, quad, pad=0.3, min_pad=16):
+    """(x0, y0, x1, y1) kotak ber-padding di sekitar quad, dibatasi ukuran frame."""
+    quad = np.asarray(quad, dtype=np.float32).reshape(-1, 2)
+    lo, hi = quad.min(axis=0), quad.max(axis=0)
+    margin = np.maximum((hi - lo) * pad, min_pad)
+    x0, y0 = np.maximum(np.floor(lo - margin), 0).astype(int)
+    x1 = int(min(np.ceil(hi[0] + margin[0]), shape[1]))
+    y1 = int(min(np.ceil(hi[1] + margin[1]), shape[0]))
+    return x0, y0, x1, y1
+
+
+class Decoder(object):
+    """Protokol decoder: decode(gray) -> DecodeResult. Subclass cukup mengimplementasikan _decode."""
+
+    name = None
+
+    def decode(self, gray):
+        start = time.perf_counter()
+        text, quad = self._decode(gray)
+        return DecodeResult(text or "", quad, (time.perf_counter() - start) * 1000, self.name)
+
+    def _decode(self, gray):
+        """Mengembalikan (text, quad)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class OpenCVDecoder(Decoder):
+    """cv2.QRCodeDetector.detectAndDecode setelah threshold Otsu (seperti skrip FixCode/OptimationCode)."""
+
+    name = "opencv"
+
+    def __init__(self, threshold=True):
+        self.threshold = threshold
+
+    def _decode(self, gray):
+        image = otsu(gray) if self.threshold else gray
+        text, points, _ = detector_pool.get("opencv").detectAndDecode(image)
+        return text, _quad(points)
+
+
+class OpenCVMultiDecoder(OpenCVDecoder):
+    """detectAndDecodeMulti: decode() memberi teks pertama yang ter-decode, decode_all() semua kode
+    (FixCode/DetectQRusingOpenCVDouble_...)."""
+
+    name = "opencv_multi"
+
+    def decode_all(self, gray):
+        """Semua kode dalam satu pass deteksi: list DecodeResult, satu per payload.
+
+        Payload yang sama muncul dua kali (kode terdeteksi ganda) hanya disimpan sekali. Quad yang tidak
+        ter-decode tetap dikembalikan (text "") kecuali pusatnya berada di dalam quad kode lain.
+        """
+        start = time.perf_counter()
+        image = otsu(gray) if self.threshold else gray
+        ok, texts, points, _ = detector_pool.get("opencv").detectAndDecodeMulti(image)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not ok or points is None:
+            return []
+        decoded, undecoded = [], []
+        seen = set()
+        for text, quad in zip(texts, points):
+            quad = _quad(quad)
+            if quad is None:
+                continue
+            if not text:
+                undecoded.append(quad)
+            elif text not in seen:
+                seen.add(text)
+                decoded.append(DecodeResult(text, quad, elapsed_ms, self.name))
+        results = list(decoded)
+        for quad in undecoded:
+            center = tuple(float(c) for c in quad.mean(axis=0))
+            if not any(cv2.pointPolygonTest(other.quad, center, False) >= 0 for other in results):
+                results.append(DecodeResult("", quad, elapsed_ms, self.name))
+        return results
+
+    def _decode(self, gray):
+        image = otsu(gray) if self.threshold else gray
+        ok, texts, points, _ = detector_pool.get("opencv").detectAndDecodeMulti(image)
+        if not ok:
+            return "", None
+        for i, text in enumerate(texts):
+            if text:
+                return text, _quad(points[i])
+        return "", _quad(points[0])
+
+
+class PyzbarDecoder(Decoder):
+    name = "pyzbar"
+
+    def __init__(self):
+        from pyzbar import pyzbar
+        self._pyzbar = pyzbar
+        self._symbols = [pyzbar.ZBarSymbol.QRCODE]
+
+    def _decode(self, gray):
+        for obj in self._pyzbar.decode(gray, symbols=self._symbols):
+            return obj.data.decode('utf-8'), _quad([(p.x, p.y) for p in obj.polygon])
+        return "", None
+
+
+class ZxingDecoder(Decoder):
+    """ZXing (port C++ zxing-cpp) di dalam proses: buffer numpy dibaca langsung, tanpa file PNG dan JVM.
+
+    Pengganti pyzxing, yang menulis frame ke PNG lalu menjalankan java -jar untuk setiap decode.
+    """
+
+    name = "zxing"
+
+    def __init__(self, try_harder=True):
+        import zxingcpp
+        self._read = zxingcpp.read_barcodes
+        self._format = zxingcpp.BarcodeFormat.QRCode
+        self.try_harder = try_harder
+
+    def _decode(self, gray):
+        # read_barcodes menerima array uint8 2D/3D C-contiguous tanpa salinan
+        if not gray.flags.c_contiguous:
+            gray = np.ascontiguousarray(gray)
+        for barcode in self._read(gray, formats=self._format, try_rotate=self.try_harder,
+                                  try_downscale=self.try_harder):
+            if barcode.valid and barcode.text:
+                p = barcode.position
+                quad = np.array([[p.top_left.x, p.top_left.y], [p.top_right.x, p.top_right.y],
+                                 [p.bottom_right.x, p.bottom_right.y], [p.bottom_left.x, p.bottom_left.y]],
+                                dtype=np.float32)
+                return barcode.text, quad
+        return "", None
+
+
+class PyzxingDecoder(Decoder):
+    """ZXing Java lewat pyzxing. Versi pyzxing tanpa decode_array memakai file PNG sementara.
+
+    Setiap decode menjalankan proses JVM baru; gunakan "zxing" jika zxing-cpp terpasang.
+    """
+
+    name = "pyzxing"
+
+    def __init__(self):
+        self.reader = detector_pool.get("pyzxing")
+        self._path = None
+
+    def _decode(self, gray):
+        if hasattr(self.reader, "decode_array"):
+            results = self.reader.decode_array(gray)
+        else:
+            if self._path is None:
+                fd, self._path = tempfile.mkstemp(suffix=".png")
+                os.close(fd)
+            cv2.imwrite(self._path, gray)
+            results = self.reader.decode(self._path)
+        for r in results or ():
+            parsed = r.get('parsed')
+            if parsed:
+                text = parsed.decode('utf-8') if isinstance(parsed, bytes) else parsed
+                return text, _quad(r.get('points'))
+        return "", None
+
+    def close(self):
+        if self._path is not None:
+            os.remove(self._path)
+            self._path = None
+
+
+class QReaderDecoder(Decoder):
+    name = "qreader"
+
+    def __init__(self):
+        self.reader = detector_pool.get("qreader")
+
+    def _decode(self, gray):
+        rgb = cv2.cvtColor(otsu(gray), cv2.COLOR_GRAY2RGB)
+        texts, detections = self.reader.detect_and_decode(image=rgb, return_detections=True)
+        for text, detection in zip(texts, detections):
+            if text:
+                return text, _quad(detection.get('quad_xy'))
+        return "", None
+
+
+class CoarseToFineDecoder(Decoder):
+    """Lokalisasi QR pada level piramida 1/scale, lalu decode hanya crop resolusi penuh di sekitar quad.
+
+    scales dicoba berurutan, dimulai dari level yang terakhir berhasil. Jika tidak ada level yang menemukan kode atau crop gagal
+    di-decode, fallback=True men-decode frame penuh sehingga kode kecil (1 cm) tidak hilang.
+
+    Kode yang modulnya terlalu kecil untuk level kasar membuat setiap frame membayar locate yang gagal ditambah decode
+    frame penuh. Dengan fallback, setelah bypass_after locate gagal berturut-turut level kasar dilewati selama beberapa
+    frame (langsung frame penuh); jumlahnya berlipat dua tiap kali percobaan ulang gagal, sampai max_bypass.
+    """
+
+    name = "coarse_to_fine"
+
+    def __init__(self, inner="opencv", scales=(4, 2), pad=0.3, min_pad=16, fallback=True, bypass_after=2,
+                 max_bypass=32):
+        self.inner = create(inner) if isinstance(inner, str) else inner
+        self.scales = tuple(scales)
+        self.pad = pad
+        self.min_pad = min_pad
+        self.fallback = fallback
+        self.frames = 0
+        self.located = 0         # frame dengan quad dari level kasar
+        self.crop_decoded = 0    # frame yang ter-decode dari crop saja
+        self.fallbacks = 0       # frame yang di-decode ulang pada resolusi penuh
+        self.bypassed = 0        # frame tanpa locate karena level kasar terus gagal
+        self.crop_pixels = 0
+        self.bypass_after = bypass_after
+        self.max_bypass = max_bypass
+        self._last_scale = None
+        self._misses = 0
+        self._skip = 0
+        self._backoff = bypass_after
+
+    def locate(self, gray):
+        """Quad (4, 2) dalam koordinat resolusi penuh dari level piramida pertama yang menemukan kode.
+
+        None jika tidak ditemukan atau level kasar sedang dilewati (bypass).
+        """
+        if self._skip > 0:
+            self._skip -= 1
+            self.bypassed += 1
+            return None
+        h, w = gray.shape[:2]
+        detector = detector_pool.get("opencv")
+        scales = self.scales
+        if self._last_scale is not None:
+            scales = (self._last_scale,) + tuple(s for s in scales if s != self._last_scale)
+        for scale in scales:
+            small = cv2.resize(gray, (w // scale, h // scale), interpolation=cv2.INTER_AREA)
+            ok, points = detector.detect(otsu(small))
+            if ok and points is not None:
+                self._last_scale = scale
+                self._misses = 0
+                self._backoff = self.bypass_after
+                # Pusat piksel level kecil -> koordinat piksel resolusi penuh
+                return (points.reshape(-1, 2) + 0.5) * scale - 0.5
+        self._misses += 1
+        if self.fallback and self.bypass_after and self._misses >= self.bypass_after:
+            self._skip = self._backoff
+            self._backoff = min(2 * self._backoff, self.max_bypass)
+        return None
+
+    def crop_box(self, shape, quad):
+        return crop_box(shape, quad, self.pad, self.min_pad)
+
+    def decode_at(self, gray, quad):
+        """Decode crop di sekitar quad (hasil locate), fallback ke frame penuh. Mengembalikan (text, quad)."""
+        self.frames += 1
+        if quad is not None:
+            self.located += 1
+            x0, y0, x1, y1 = self.crop_box(gray.shape, quad)
+            self.crop_pixels += (x1 - x0) * (y1 - y0)
+            result = self.inner.decode(gray[y0:y1, x0:x1])
+            if result:
+                self.crop_decoded += 1
+                return result.text, (result.quad + (x0, y0)) if result.quad is not None else quad
+        if not self.fallback:
+            return "", quad
+        self.fallbacks += 1
+        result = self.inner.decode(gray)
+        return result.text, result.quad if result.quad is not None else quad
+
+    def _decode(self, gray):
+        return self.decode_at(gray, self.locate(gray))
+
+    def stats(self):
+        return {"frames": self.frames, "located": self.located, "crop_decoded": self.crop_decoded,
+                "fallbacks": self.fallbacks, "bypassed": self.bypassed,
+                "mean_crop_pixels": float(self.crop_pixels) / self.located if self.located else 0}
+
+
+class MultiScaleDecoder(Decoder):
+    """Decode beberapa level piramida (diperbesar dan diperkecil) paralel di thread pool, berhenti pada
+    decode pertama yang berhasil atau saat budget_ms habis.
+
+    Kode kecil dari jauh (20 cm / 1 cm) sering baru terbaca setelah diperbesar. OpenCV melepas GIL selama
+    resize/threshold/detectAndDecode, dan setiap thread memakai detektornya sendiri dari detector_pool.
+    Paling banyak satu level per worker yang berjalan; level berikutnya (urutan scales) baru dikirim saat
+    satu level selesai, jadi setelah decode berhasil tidak ada level sisa yang memakan CPU frame berikutnya.
+    Level yang sedang berjalan saat budget habis tidak bisa dihentikan; hasilnya dibuang.
+
+    Default paling banyak 2 worker: dengan worker sebanyak core, semua level berjalan bersamaan dan level
+    besar (2.0, 4x piksel) tetap jalan setelah level 1 berhasil, merebut CPU dari frame berikutnya. budget_ms
+    sebaiknya tidak lebih dari periode frame kamera (skrip realtime mengaturnya dari timestamp sensor).
+    """
+
+    name = "multiscale"
+
+    def __init__(self, scales=(1.0, 1.5, 2.0, 0.5), budget_ms=120, workers=None):
+        self.scales = tuple(scales)
+        self.budget_ms = budget_ms
+        self.workers = workers or min(2, os.cpu_count() or 1)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.frames = 0
+        self.wins = dict.fromkeys(self.scales, 0)   # decode berhasil per level
+        self.timeouts = 0                           # frame yang berhenti karena budget habis
+
+    @staticmethod
+    def _level(gray, scale):
+        if scale == 1:
+            image = gray
+        else:
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+            image = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+        text, points, _ = detector_pool.get("opencv").detectAndDecode(otsu(image))
+        quad = _quad(points)
+        return scale, text, None if quad is None else quad / scale
+
+    def _decode(self, gray):
+        self.frames += 1
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        queue = list(self.scales)
+        pending = set()
+        located = None
+        while queue or pending:
+            while queue and len(pending) < self.workers:
+                pending.add(self.pool.submit(self._level, gray, queue.pop(0)))
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self.timeouts += 1
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                scale, text, quad = future.result()
+                if text:
+                    self.wins[scale] += 1
+                    return text, quad
+                if located is None:
+                    located = quad
+        return "", located
+
+    def stats(self):
+        return {"frames": self.frames, "timeouts": self.timeouts, "wins": dict(self.wins)}
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+
+
+_clahe = threading.local()
+
+
+def _clahe_otsu(gray):
+    clahe = getattr(_clahe, "clahe", None)
+    if clahe is None:
+        clahe = _clahe.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return otsu(clahe.apply(gray))
+
+
+# Langkah binarisasi cascade: nama -> gray -> citra untuk detectAndDecode
+BINARIZATIONS = {
+    "raw": lambda gray: gray,
+    "otsu": otsu,
+    "adaptive": lambda gray: cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 31, 5),
+    "clahe_otsu": _clahe_otsu,
+    # QR terang di atas latar gelap
+    "inverted": lambda gray: cv2.bitwise_not(otsu(gray)),
+}
+
+
+class CascadeDecoder(Decoder):
+    """Coba beberapa binarisasi berurutan, berhenti pada decode pertama yang berhasil.
+
+    Setiap langkah mencatat jumlah percobaan, keberhasilan dan waktu. Setiap retune_every frame urutan
+    disusun ulang menurut perkiraan biaya per keberhasilan (rata-rata ms / peluang berhasil), jadi langkah
+    yang murah dan sering berhasil pada pencahayaan saat ini naik ke depan.
+    """
+
+    name = "cascade"
+
+    def __init__(self, steps=("raw", "otsu", "adaptive", "clahe_otsu", "inverted"), retune_every=50):
+        for step in steps:
+            if step not in BINARIZATIONS:
+                raise ValueError("Unknown binarization {!r}, available: {}".format(step, sorted(BINARIZATIONS)))
+        self.order = list(steps)
+        self.retune_every = retune_every
+        self.frames = 0
+        self.step_stats = dict((step, {"attempts": 0, "successes": 0, "total_ms": 0.0}) for step in steps)
+
+    def _decode(self, gray):
+        self.frames += 1
+        if self.retune_every and self.frames % self.retune_every == 0:
+            self.retune()
+        detector = detector_pool.get("opencv")
+        located = None
+        for step in self.order:
+            start = time.perf_counter()
+            text, points, _ = detector.detectAndDecode(BINARIZATIONS[step](gray))
+            stats = self.step_stats[step]
+            stats["attempts"] += 1
+            stats["total_ms"] += (time.perf_counter() - start) * 1000
+            if text:
+                stats["successes"] += 1
+                return text, _quad(points)
+            if located is None:
+                located = _quad(points)
+        return "", located
+
+    def cost(self, step):
+        """Perkiraan ms per decode berhasil; peluang berhasil dengan prior Laplace (s + 1) / (n + 2)."""
+        stats = self.step_stats[step]
+        if not stats["attempts"]:
+            return 0.0
+        mean_ms = stats["total_ms"] / stats["attempts"]
+        return mean_ms * (stats["attempts"] + 2) / (stats["successes"] + 1)
+
+    def retune(self):
+        self.order.sort(key=self.cost)
+
+    def stats(self):
+        return {"frames": self.frames, "order": list(self.order), "steps": dict(
+            (step, dict(s, cost_ms=self.cost(step))) for step, s in self.step_stats.items())}
+
+
+def _cached_decoder(**kwargs):
+    # Import saat dipakai: decode_cache mengimpor modul ini
+    import decode_cache
+    return decode_cache.CachedDecoder(**kwargs)
+
+
+def _dnn_decoder(**kwargs):
+    # Import saat dipakai: dnn_localizer mengimpor modul ini dan memuat model YOLO
+    import dnn_localizer
+    return dnn_localizer.DnnDecoder(**kwargs)
+
+
+DECODERS = {
+    "opencv": OpenCVDecoder,
+    "opencv_multi": OpenCVMultiDecoder,
+    "pyzbar": PyzbarDecoder,
+    "zxing": ZxingDecoder,
+    "pyzxing": PyzxingDecoder,
+    "qreader": QReaderDecoder,
+    "coarse_to_fine": CoarseToFineDecoder,
+    "multiscale": MultiScaleDecoder,
+    "cascade": CascadeDecoder,
+    "cached": _cached_decoder,
+    "dnn": _dnn_decoder,
+}
+
+
+def names():
+    return sorted(DECODERS)
+
+
+def create(name="opencv", **kwargs):
+    """Buat decoder backend name. ImportError jika library backend tidak terpasang, IOError jika file model
+    backend (dnn) tidak ada."""
+    try:
+        cls = DECODERS[name]
+    except KeyError:
+        raise ValueError("Unknown decoder {!r}, available: {}".format(name, names()))
+    return cls(**kwargs)
+
+
+def evaluate(decoder, frames):
+    """Decode semua frame: (decode_rate, mean_ms, p95_ms)."""
+    elapsed = []
+    decoded = 0
+    for gray in frames:
+        result = decoder.decode(gray)
+        elapsed.append(result.elapsed_ms)
+        if result:
+            decoded += 1
+    if not elapsed:
+        return 0.0, 0.0, 0.0
+    return decoded / len(elapsed), float(np.mean(elapsed)), float(np.percentile(elapsed, 95))
+
+
+def select(frames, target_rate=0.95, candidates=None):
+    """Pilih backend tercepat (rata-rata ms) dengan decode rate >= target_rate pada frames.
+
+    Backend yang tidak terpasang dilewati. Jika tidak ada yang memenuhi target, dipilih decode rate
+    tertinggi. Mengembalikan (nama backend, {nama: hasil evaluasi}).
+    """
+    report = {}
+    for name in candidates or names():
+        try:
+            decoder = create(name)
+        except (ImportError, IOError) as e:
+            report[name] = {"error": str(e)}
+            continue
+        try:
+            rate, mean_ms, p95_ms = evaluate(decoder, frames)
+        finally:
+            decoder.close()
+        report[name] = {"decode_rate": rate, "mean_ms": mean_ms, "p95_ms": p95_ms}
+    measured = [(name, r) for name, r in report.items() if "error" not in r]
+    if not measured:
+        raise RuntimeError("No decoder backend available")
+    passing = [(r["mean_ms"], name) for name, r in measured if r["decode_rate"] >= target_rate]
+    if passing:
+        return min(passing)[1], report
+    return max(measured, key=lambda item: (item[1]["decode_rate"], -item[1]["mean_ms"]))[0], report
@@ -0,0 +1,118 @@
+"""Registry detektor QR: setiap backend dibuat sekali per thread, di-warm-up, lalu dipakai ulang.
+
+Membuat detektor di dalam loop per frame (cv2.QRCodeDetector(), apalagi qreader.QReader() yang memuat
+model) memindahkan biaya konstruksi ke anggaran setiap frame. Instance detektor tidak aman dipakai
+bersamaan oleh beberapa thread, jadi pool menyimpan satu instance per backend per thread (threading.local).
+Library backend baru di-import saat backend itu pertama kali diminta.
+
+    import detector_pool
+    detector = detector_pool.get("opencv")     # instance milik thread ini, sudah di-warm-up
+    text, points, _ = detector.detectAndDecode(th)
+
+    detector_pool.preload("opencv", "qreader")  # bangun di awal, bukan pada frame pertama
+"""
+import threading
+import time
+
+import cv2
+
+WARMUP_TEXT = "warmup"
+
+
+def warmup_image(module_px=4):
+    """Citra abu-abu kecil berisi satu kode QR untuk warm-up."""
+    qr = cv2.QRCodeEncoder.create().encode(WARMUP_TEXT)
+    qr = cv2.resize(qr, None, fx=module_px, fy=module_px, interpolation=cv2.INTER_NEAREST)
+    return cv2.copyMakeBorder(qr, 4 * module_px, 4 * module_px, 4 * module_px, 4 * module_px,
+                              cv2.BORDER_CONSTANT, value=255)
+
+
+def _opencv():
+    return cv2.QRCodeDetector()
+
+
+def _opencv_warmup(detector):
+    detector.detectAndDecode(warmup_image())
+
+
+def _opencv_aruco():
+    return cv2.QRCodeDetectorAruco()
+
+
+def _qreader():
+    import qreader
+    return qreader.QReader()
+
+
+def _qreader_warmup(reader):
+    # Inferensi pertama mengalokasikan tensor model; lakukan di sini, bukan pada frame produk
+    reader.detect_and_decode(cv2.cvtColor(warmup_image(), cv2.COLOR_GRAY2RGB))
+
+
+def _pyzxing():
+    import pyzxing
+    return pyzxing.BarCodeReader()
+
+
+class DetectorPool(object):
+    def __init__(self):
+        self._factories = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.created = {}      # jumlah instance per backend (satu per thread)
+        self.create_ms = {}    # total waktu konstruksi + warm-up per backend
+
+    def register(self, name, factory, warmup=None):
+        """Daftarkan backend: factory() -> detektor, warmup(detektor) opsional."""
+        with self._lock:
+            self._factories[name] = (factory, warmup)
+
+    def names(self):
+        return sorted(self._factories)
+
+    def get(self, name="opencv"):
+        """Detektor backend name milik thread pemanggil, dibuat saat pertama kali diminta."""
+        detectors = getattr(self._local, "detectors", None)
+        if detectors is None:
+            detectors = self._local.detectors = {}
+        detector = detectors.get(name)
+        if detector is None:
+            detector = detectors[name] = self._create(name)
+        return detector
+
+    def preload(self, *names):
+        """Bangun dan warm-up backend untuk thread pemanggil sekarang."""
+        for name in names or ("opencv",):
+            self.get(name)
+
+    def _create(self, name):
+        try:
+            factory, warmup = self._factories[name]
+        except KeyError:
+            raise ValueError("Unknown detector backend {!r}, available: {}".format(name, self.names()))
+        start = time.perf_counter()
+        detector = factory()
+        if warmup is not None:
+            warmup(detector)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.created[name] = self.created.get(name, 0) + 1
+            self.create_ms[name] = self.create_ms.get(name, 0.0) + elapsed_ms
+        return detector
+
+    def stats(self):
+        with self._lock:
+            return dict((name, {"instances": self.created[name], "create_ms": self.create_ms[name]})
+                        for name in self.created)
+
+
+_default = DetectorPool()
+_default.register("opencv", _opencv, _opencv_warmup)
+_default.register("opencv_aruco", _opencv_aruco, _opencv_warmup)
+_default.register("qreader", _qreader, _qreader_warmup)
+_default.register("pyzxing", _pyzxing)
+
+register = _default.register
+get = _default.get
+preload = _default.preload
+stats = _default.stats
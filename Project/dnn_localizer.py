@@ -0,0 +1,228 @@
+"""Lokalisasi QR dengan jaringan YOLO di CPU (cv2.dnn), kotak kandidatnya di-decode decoder klasik.
+
+Model dimuat sekali (shared() untuk seluruh proses) dan dijalankan pada input yang diperkecil (default 416,
+bukan 608 seperti yolov4.cfg), tanpa CuPy/GPU. BatchLocalizer mengumpulkan frame dari beberapa kamera
+(thread CameraWorker) menjadi satu blob dan satu forward pass. DnnDecoder men-decode crop di sekitar setiap
+kotak dengan backend decoders.py, jadi jaringan hanya perlu menemukan letak QR.
+
+Model: Darknet cfg + weights (FixCode/yolov4.cfg dengan weights hasil training kelas QR; butuh OpenCV 4.x,
+OpenCV 5 tidak lagi membaca Darknet) atau ONNX dengan keluaran bergaya YOLO: baris (cx, cy, w, h, objectness,
+skor kelas...). Lokasi bisa diatur dengan QR_YOLO_MODEL dan QR_YOLO_CONFIG.
+
+    localizer = dnn_localizer.shared()                   # dimuat sekali, dipakai semua kamera
+    manager = CameraManager(decoder_factory=lambda: dnn_localizer.DnnDecoder(localizer))
+
+    boxes = dnn_localizer.DnnLocalizer().localize([gray_cam0, gray_cam1])   # satu forward untuk dua frame
+"""
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import decoders
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _find(name):
+    for path in (os.path.join(_HERE, name), os.path.join(_HERE, "FixCode", name)):
+        if os.path.isfile(path):
+            return path
+    return os.path.join(_HERE, name)
+
+
+DEFAULT_CONFIG = os.environ.get("QR_YOLO_CONFIG") or _find("yolov4.cfg")
+DEFAULT_MODEL = os.environ.get("QR_YOLO_MODEL") or os.path.splitext(DEFAULT_CONFIG)[0] + ".weights"
+
+
+class Box(object):
+    __slots__ = ("x", "y", "w", "h", "score", "class_id")
+
+    def __init__(self, x, y, w, h, score, class_id):
+        self.x, self.y, self.w, self.h = x, y, w, h    # piksel frame asli
+        self.score = score
+        self.class_id = class_id
+
+    def quad(self):
+        return np.array([[self.x, self.y], [self.x + self.w, self.y], [self.x + self.w, self.y + self.h],
+                         [self.x, self.y + self.h]], dtype=np.float32)
+
+    def __repr__(self):
+        return "Box({:.0f}, {:.0f}, {:.0f}x{:.0f}, {:.2f}, class {})".format(
+            self.x, self.y, self.w, self.h, self.score, self.class_id)
+
+
+class DnnLocalizer(object):
+    """Satu jaringan cv2.dnn di CPU. localize() tidak aman dipanggil bersamaan; pakai BatchLocalizer untuk
+    beberapa thread."""
+
+    def __init__(self, model=DEFAULT_MODEL, config=DEFAULT_CONFIG, input_size=416, conf_threshold=0.25,
+                 nms_threshold=0.45, class_ids=None, threads=None):
+        if not os.path.isfile(model):
+            raise IOError("YOLO model not found: {} (set QR_YOLO_MODEL)".format(model))
+        if model.lower().endswith(".onnx"):
+            self.net = cv2.dnn.readNetFromONNX(model)
+        else:
+            self.net = cv2.dnn.readNet(model, config)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        if threads:
+            cv2.setNumThreads(threads)
+        self.output_names = self.net.getUnconnectedOutLayersNames()
+        self.input_size = input_size        # kelipatan 32; lebih kecil = lebih cepat, kode kecil lebih sulit
+        self.conf_threshold = conf_threshold
+        self.nms_threshold = nms_threshold
+        self.class_ids = class_ids          # None = semua kelas dianggap QR
+        self.forwards = 0
+        self.frames = 0
+        self.forward_ms = 0.0
+
+    def localize(self, frames):
+        """List frame (abu-abu atau BGR) -> list kotak per frame, satu forward pass untuk semua frame."""
+        images = [cv2.cvtColor(f, cv2.COLOR_GRAY2BGR) if f.ndim == 2 or f.shape[2] == 1 else f for f in frames]
+        size = (self.input_size, self.input_size)
+        blob = cv2.dnn.blobFromImages(images, 1 / 255.0, size, swapRB=True, crop=False)
+        self.net.setInput(blob)
+        start = time.perf_counter()
+        outputs = self.net.forward(self.output_names)
+        self.forward_ms += (time.perf_counter() - start) * 1000
+        self.forwards += 1
+        self.frames += len(images)
+        batch = len(images)
+        # Darknet: (batch * baris, 5 + kelas) per layer yolo; ONNX: (batch, baris, 5 + kelas)
+        rows = [np.asarray(o).reshape(batch, -1, np.asarray(o).shape[-1]) for o in outputs]
+        rows = np.concatenate(rows, axis=1)
+        return [self._boxes(rows[i], image.shape) for i, image in enumerate(images)]
+
+    def _boxes(self, rows, shape):
+        height, width = shape[:2]
+        scores = rows[:, 5:] * rows[:, 4:5] if rows.shape[1] > 5 else rows[:, 4:5]
+        if self.class_ids is not None:
+            keep_classes = np.zeros(scores.shape[1], dtype=bool)
+            keep_classes[list(self.class_ids)] = True
+            scores = np.where(keep_classes, scores, 0)
+        class_ids = scores.argmax(axis=1)
+        confidence = scores[np.arange(len(scores)), class_ids]
+        keep = confidence >= self.conf_threshold
+        if not keep.any():
+            return []
+        cx, cy, w, h = rows[keep, 0], rows[keep, 1], rows[keep, 2], rows[keep, 3]
+        if max(float(w.max()), float(h.max())) > 2.0:
+            # Koordinat dalam piksel input jaringan, bukan 0..1
+            cx, cy, w, h = cx / self.input_size, cy / self.input_size, w / self.input_size, h / self.input_size
+        rects = np.stack([(cx - w / 2) * width, (cy - h / 2) * height, w * width, h * height], axis=1)
+        confidence, class_ids = confidence[keep], class_ids[keep]
+        indices = cv2.dnn.NMSBoxes(rects.tolist(), confidence.tolist(), self.conf_threshold, self.nms_threshold)
+        return [Box(*rects[i], score=float(confidence[i]), class_id=int(class_ids[i]))
+                for i in np.array(indices).reshape(-1)]
+
+    def stats(self):
+        return {"forwards": self.forwards, "frames": self.frames,
+                "mean_batch": self.frames / self.forwards if self.forwards else 0.0,
+                "mean_forward_ms": self.forward_ms / self.forwards if self.forwards else 0.0}
+
+
+class BatchLocalizer(threading.Thread):
+    """Satu thread inferensi untuk banyak pemanggil: frame yang datang dalam max_wait_ms digabung menjadi
+    satu batch (paling banyak batch_size frame)."""
+
+    def __init__(self, localizer=None, batch_size=4, max_wait_ms=5.0):
+        super(BatchLocalizer, self).__init__(name="dnn-localizer", daemon=True)
+        self.localizer = localizer if localizer is not None else DnnLocalizer()
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.start()
+
+    def localize(self, frame, timeout=None):
+        """Kotak untuk satu frame; menunggu batch tempat frame itu ikut selesai."""
+        request = [frame, None, threading.Event()]
+        with self._cond:
+            self._pending.append(request)
+            self._cond.notify_all()
+        if not request[2].wait(timeout):
+            raise RuntimeError("DNN localizer timed out")
+        if isinstance(request[1], Exception):
+            raise request[1]
+        return request[1]
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                # Tunggu sebentar agar frame kamera lain ikut dalam forward pass yang sama
+                deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+                while len(self._pending) < self.batch_size and not self._stopped:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            try:
+                results = self.localizer.localize([request[0] for request in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            for request, boxes in zip(batch, results):
+                request[1] = boxes
+                request[2].set()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def stats(self):
+        return self.localizer.stats()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared(**kwargs):
+    """BatchLocalizer tunggal untuk proses ini; model dimuat pada panggilan pertama."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BatchLocalizer(DnnLocalizer(**kwargs))
+        return _shared
+
+
+class DnnDecoder(decoders.Decoder):
+    """Kotak dari localizer (DnnLocalizer atau BatchLocalizer) -> crop ber-padding -> decoder klasik."""
+
+    name = "dnn"
+
+    def __init__(self, localizer=None, inner="opencv", pad=0.15, max_boxes=4):
+        self.localizer = shared() if localizer is None else localizer
+        self.inner = decoders.create(inner) if isinstance(inner, str) else inner
+        self.pad = pad
+        self.max_boxes = max_boxes
+
+    def boxes(self, gray):
+        if isinstance(self.localizer, BatchLocalizer):
+            return self.localizer.localize(gray)
+        return self.localizer.localize([gray])[0]
+
+    def _decode(self, gray):
+        if gray.ndim == 3:
+            gray = gray[:, :, 0] if gray.shape[2] == 1 else cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+        boxes = sorted(self.boxes(gray), key=lambda b: -b.score)[:self.max_boxes]
+        for box in boxes:
+            x0, y0, x1, y1 = decoders.crop_box(gray.shape, box.quad(), self.pad)
+            result = self.inner.decode(gray[y0:y1, x0:x1])
+            if result:
+                return result.text, (result.quad + (x0, y0)) if result.quad is not None else box.quad()
+        return "", boxes[0].quad() if boxes else None
+
+    def __call__(self, frame):
+        # Antarmuka decoder CameraManager: decoder(frame) -> (text, points)
+        result = self.decode(frame)
+        return result.text, result.quad
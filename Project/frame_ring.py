@@ -0,0 +1,254 @@
+"""Ring buffer frame dengan beberapa slot memori ter-align (CameraAlignMalloc).
+
+Thread capture mengisi slot kosong lewat ISP lalu mempublikasikannya; thread decode
+mengambil slot, membaca frame sebagai view numpy tanpa copy, lalu mengembalikannya.
+Slot yang sedang dipegang konsumen tidak pernah ditimpa oleh capture, sehingga tidak
+ada frame sobek dan tidak perlu frame.copy() di bawah lock.
+
+    ring = FrameRing.for_camera(cap, modeMono)
+    # thread capture
+    frame_ring.grab(hCamera, ring, 200)
+    # thread decode
+    slot = ring.get(timeout=0.1)
+    if slot is not None:
+        with slot:
+            decode(slot.frame)
+
+Dengan numpy_owned=True slot berupa array numpy ter-align (bukan CameraAlignMalloc), dan
+grab_ex3() mengisinya lewat satu panggilan CameraGetImageBufferEx3 yang sekaligus memberi timestamp SDK.
+"""
+import platform
+import threading
+
+import numpy as np
+
+import mvsdk
+
+# Status kepemilikan slot
+FREE = 0      # bisa diisi capture
+WRITING = 1   # sedang diisi capture
+READY = 2     # berisi frame yang belum diambil konsumen
+READING = 3   # sedang dipegang konsumen
+
+IS_WINDOWS = platform.system() == "Windows"
+
+
+class FrameSlot(object):
+    """Satu buffer frame. Dipakai sebagai context manager untuk mengembalikan slot ke ring."""
+
+    def __init__(self, ring, index, address, size, buffer=None):
+        self.ring = ring
+        self.index = index
+        self.address = address
+        self.size = size
+        self.buffer = buffer
+        self.state = FREE
+        self.seq = -1
+        self.head = None
+        self.frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.ring.release(self)
+
+
+def aligned_empty(size, align=16):
+    """Array uint8 milik numpy dengan alamat awal kelipatan align."""
+    raw = np.empty(size + align, dtype=np.uint8)
+    offset = -raw.ctypes.data % align
+    return raw[offset:offset + size]
+
+
+class FrameRing(object):
+    def __init__(self, n_slots, slot_size, align=16, numpy_owned=False):
+        if n_slots < 2:
+            raise ValueError("FrameRing needs at least 2 slots")
+        self.slot_size = slot_size
+        self.numpy_owned = numpy_owned
+        if numpy_owned:
+            buffers = [aligned_empty(slot_size, align) for _ in range(n_slots)]
+            self.slots = [FrameSlot(self, i, buf.ctypes.data, slot_size, buf) for i, buf in enumerate(buffers)]
+        else:
+            self.slots = [FrameSlot(self, i, mvsdk.CameraAlignMalloc(slot_size, align), slot_size) for i in range(n_slots)]
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._closed = False
+        self._array_types = {}
+        self.published = 0
+        self.dropped = 0
+
+    @classmethod
+    def for_camera(cls, cap, mono, n_slots=4, numpy_owned=False):
+        """Ring dengan ukuran slot sesuai resolusi maksimum kamera."""
+        size = cap.sResolutionRange.iWidthMax * cap.sResolutionRange.iHeightMax * (1 if mono else 3)
+        return cls(n_slots, size, numpy_owned=numpy_owned)
+
+    def acquire_write(self, timeout=None, recycle=True):
+        """Slot untuk diisi capture. Jika semua slot penuh, frame READY tertua dibuang dan slotnya dipakai ulang.
+
+        recycle=False tidak pernah membuang frame READY, hanya menunggu slot FREE.
+        Mengembalikan None jika tidak ada slot sampai timeout habis atau ring sudah ditutup.
+        """
+        with self._cond:
+            while not self._closed:
+                slot = self._pick(FREE, oldest=True)
+                if slot is None and recycle:
+                    slot = self._pick(READY, oldest=True)
+                    if slot is not None:
+                        self.dropped += 1
+                if slot is not None:
+                    slot.state = WRITING
+                    return slot
+                if not self._cond.wait(timeout):
+                    return None
+            return None
+
+    def publish(self, slot, FrameHead):
+        """Tandai slot berisi frame baru dan buat view numpy-nya.
+
+        Mengembalikan slot, atau None jika ring ditutup selama capture (buffer slot dibebaskan di sini).
+        """
+        with self._cond:
+            if self._closed:
+                self._free(slot)
+                slot.state = FREE
+                self._cond.notify_all()
+                return None
+            if slot.buffer is not None:
+                frame = slot.buffer[:FrameHead.uBytes]
+            else:
+                array_type = self._array_types.get(FrameHead.uBytes)
+                if array_type is None:
+                    array_type = self._array_types[FrameHead.uBytes] = mvsdk.c_ubyte * FrameHead.uBytes
+                frame = np.frombuffer(array_type.from_address(slot.address), dtype=np.uint8)
+            slot.frame = frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+            slot.head = FrameHead
+            slot.seq = self._seq
+            self._seq += 1
+            self.published += 1
+            slot.state = READY
+            self._cond.notify_all()
+            return slot
+
+    def cancel(self, slot):
+        """Kembalikan slot yang gagal diisi (misalnya timeout) tanpa mempublikasikannya."""
+        with self._cond:
+            slot.state = FREE
+            if self._closed:
+                self._free(slot)
+            self._cond.notify_all()
+
+    def get(self, timeout=None, latest=True):
+        """Ambil frame READY untuk dibaca. Kembalikan dengan release() atau blok `with slot:`.
+
+        latest=True mengambil frame terbaru dan membuang frame READY yang lebih lama,
+        latest=False mengambil frame tertua (tidak ada frame yang dilewati).
+        Mengembalikan None jika tidak ada frame sampai timeout habis atau ring sudah ditutup.
+        """
+        with self._cond:
+            slot = self._pick(READY, oldest=not latest)
+            while slot is None:
+                if self._closed or not self._cond.wait(timeout):
+                    return None
+                slot = self._pick(READY, oldest=not latest)
+            if latest:
+                skipped = False
+                for other in self.slots:
+                    if other.state == READY and other is not slot:
+                        other.state = FREE
+                        self.dropped += 1
+                        skipped = True
+                if skipped:
+                    # Slot yang dibebaskan bisa langsung dipakai capture yang sedang menunggu
+                    self._cond.notify_all()
+            slot.state = READING
+            return slot
+
+    def release(self, slot):
+        with self._cond:
+            slot.state = FREE
+            if self._closed:
+                self._free(slot)
+            self._cond.notify_all()
+
+    def close(self):
+        """Bebaskan buffer. Slot yang masih diisi capture (WRITING) baru dibebaskan saat publish()/cancel(),
+        slot yang masih dipegang konsumen (READING) saat release(). Sebaiknya thread capture dihentikan dan
+        di-join lebih dulu."""
+        with self._cond:
+            self._closed = True
+            for slot in self.slots:
+                if slot.state in (FREE, READY):
+                    self._free(slot)
+            self.slots = []
+            self._cond.notify_all()
+
+    def _free(self, slot):
+        # View numpy ke buffer yang akan dibebaskan tidak boleh lagi terlihat dari slot
+        slot.frame = None
+        slot.head = None
+        if slot.buffer is not None:
+            slot.buffer = None
+        elif slot.address:
+            mvsdk.CameraAlignFree(slot.address)
+        slot.address = 0
+
+    def _pick(self, state, oldest):
+        chosen = None
+        for slot in self.slots:
+            if slot.state != state:
+                continue
+            if chosen is None or (slot.seq < chosen.seq if oldest else slot.seq > chosen.seq):
+                chosen = slot
+        return chosen
+
+
+def grab(hCamera, ring, wTimes, flip=IS_WINDOWS):
+    """GetImageBuffer -> ImageProcess ke slot ring -> Release, lalu publikasikan.
+
+    Mengembalikan slot yang dipublikasikan, atau None jika tidak ada slot bebas atau ring sudah ditutup.
+    CameraException (termasuk timeout) diteruskan ke pemanggil.
+    """
+    slot = ring.acquire_write(wTimes / 1000.0)
+    if slot is None:
+        return None
+    try:
+        pRawData, FrameHead = mvsdk.CameraGetImageBuffer(hCamera, wTimes)
+        mvsdk.CameraImageProcess(hCamera, pRawData, slot.address, FrameHead)
+        mvsdk.CameraReleaseImageBuffer(hCamera, pRawData)
+        # Di Windows, data gambar terbalik vertikal (format BMP), balik agar sesuai OpenCV
+        if flip:
+            mvsdk.CameraFlipFrameBuffer(slot.address, FrameHead, 1)
+    except Exception:
+        ring.cancel(slot)
+        raise
+    return ring.publish(slot, FrameHead)
+
+
+def grab_ex3(hCamera, ring, out_format, wTimes, flip=IS_WINDOWS):
+    """Satu panggilan CameraGetImageBufferEx3: grab + ISP langsung ke slot ring, lalu publikasikan.
+
+    out_format adalah CAMERA_MEDIA_TYPE_MONO8 atau CAMERA_MEDIA_TYPE_BGR8. Ex3 tidak mengembalikan
+    tSdkFrameHead, jadi slot.head diisi sendiri (ukuran, format, uiTimeStamp dalam satuan 0.1 ms)
+    dan dipakai ulang antar frame. Mengembalikan slot yang dipublikasikan, atau None jika tidak ada slot bebas
+    atau ring sudah ditutup.
+    """
+    slot = ring.acquire_write(wTimes / 1000.0)
+    if slot is None:
+        return None
+    try:
+        width, height, timestamp = mvsdk.CameraGetImageBufferEx3(hCamera, slot.address, out_format, wTimes)
+        FrameHead = slot.head if slot.head is not None else mvsdk.tSdkFrameHead()
+        FrameHead.iWidth = width
+        FrameHead.iHeight = height
+        FrameHead.uiMediaType = out_format
+        FrameHead.uBytes = width * height * (1 if out_format == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3)
+        FrameHead.uiTimeStamp = timestamp
+        if flip:
+            mvsdk.CameraFlipFrameBuffer(slot.address, FrameHead, 1)
+    except Exception:
+        ring.cancel(slot)
+        raise
+    return ring.publish(slot, FrameHead)
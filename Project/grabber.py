@@ -0,0 +1,141 @@
+"""Pembungkus API CameraGrabber_* SDK sebagai context manager.
+
+Grabber SDK menjalankan thread capture + ISP sendiri di kode native dan memanggil:
+  - frame listener pada fase 0 (RAW, sebelum ISP) dan fase 1 (setelah ISP); mengembalikan 0
+    membuang frame di SDK, sehingga frame yang tidak dibutuhkan tidak pernah di-ISP atau diteruskan ke Python
+  - RGB callback dengan buffer hasil ISP, diteruskan ke on_frame sebagai view numpy tanpa copy
+
+    def on_frame(frame, FrameHead):
+        decode(frame)          # view hanya valid selama callback, copy jika perlu disimpan
+
+    with Grabber(DevInfo, on_frame) as g:
+        mvsdk.CameraSetIspOutFormat(g.hCamera, mvsdk.CAMERA_MEDIA_TYPE_MONO8)
+        g.start()
+        ...
+        print(g.metrics())
+"""
+import threading
+
+import numpy as np
+
+import mvsdk
+from frame_ring import IS_WINDOWS
+
+# Fase frame listener
+PHASE_RAW = 0       # setelah capture, sebelum ISP
+PHASE_RGB = 1       # setelah ISP
+PHASE_DISPLAY = 2   # sebelum ditampilkan ke hWnd
+
+
+class Grabber(object):
+    """on_frame(frame, FrameHead) menerima setiap frame hasil ISP dari thread SDK.
+
+    frame_filter(phase, FrameHead) -> bool dipanggil lebih dulu oleh frame listener;
+    False membuang frame di SDK. DevInfo=None membuka kamera dengan index.
+    """
+
+    def __init__(self, DevInfo=None, on_frame=None, frame_filter=None, index=0, flip=IS_WINDOWS):
+        self.on_frame = on_frame
+        self.frame_filter = frame_filter
+        self.flip = flip
+        self.delivered = 0
+        self.filtered = 0
+        self.callback_errors = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._array_types = {}
+        if DevInfo is not None:
+            self.handle = mvsdk.CameraGrabber_Create(DevInfo)
+        else:
+            self.handle = mvsdk.CameraGrabber_CreateByIndex(index)
+        self.hCamera = mvsdk.CameraGrabber_GetCameraHandle(self.handle)
+        mvsdk.CameraGrabber_SetRGBCallback(self.handle, self.RGBCallback, 0)
+        if frame_filter is not None:
+            mvsdk.CameraGrabber_SetFrameListener(self.handle, self.FrameListener, 0)
+        self.live = False
+
+    def start(self):
+        err_code = mvsdk.CameraGrabber_StartLive(self.handle)
+        if err_code != mvsdk.CAMERA_STATUS_SUCCESS:
+            raise mvsdk.CameraException(err_code)
+        self.live = True
+
+    def stop(self):
+        if self.live:
+            mvsdk.CameraGrabber_StopLive(self.handle)
+            self.live = False
+
+    def close(self):
+        if self.handle:
+            self.stop()
+            mvsdk.CameraGrabber_Destroy(self.handle)
+            self.handle = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def metrics(self):
+        """Statistik SDK (transport) dan sisi Python dalam satu dict.
+
+        lost/error naik: frame hilang di kamera/transport. capture naik tetapi delivered + filtered
+        tertinggal: frame tertahan di callback Python (python_backlog).
+        """
+        stat = mvsdk.CameraGrabber_GetStat(self.handle)
+        with self._lock:
+            delivered, filtered, errors = self.delivered, self.filtered, self.callback_errors
+        return {
+            "width": stat.Width,
+            "height": stat.Height,
+            "capture": stat.Capture,
+            "lost": stat.Lost,
+            "error": stat.Error,
+            "cap_fps": stat.CapFps,
+            "disp_fps": stat.DispFps,
+            "delivered": delivered,
+            "filtered": filtered,
+            "callback_errors": errors,
+            "python_backlog": max(0, stat.Capture - delivered - filtered),
+        }
+
+    def _view(self, pFrameBuffer, FrameHead):
+        array_type = self._array_types.get(FrameHead.uBytes)
+        if array_type is None:
+            array_type = self._array_types[FrameHead.uBytes] = mvsdk.c_ubyte * FrameHead.uBytes
+        frame = np.frombuffer(array_type.from_address(pFrameBuffer), dtype=np.uint8)
+        return frame.reshape((FrameHead.iHeight, FrameHead.iWidth, 1 if FrameHead.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3))
+
+    @mvsdk.method(mvsdk.pfnCameraGrabberFrameListener)
+    def FrameListener(self, Grabber, Phase, pFrameBuffer, pFrameHead, Context):
+        # Exception tidak boleh keluar dari callback SDK; frame diteruskan jika filter gagal
+        try:
+            keep = self.frame_filter(Phase, pFrameHead[0])
+        except Exception as e:
+            with self._lock:
+                self.callback_errors += 1
+                self.last_error = e
+            return 1
+        if not keep:
+            with self._lock:
+                self.filtered += 1
+            return 0
+        return 1
+
+    @mvsdk.method(mvsdk.pfnCameraGrabberFrameCallback)
+    def RGBCallback(self, Grabber, pFrameBuffer, pFrameHead, Context):
+        FrameHead = pFrameHead[0]
+        try:
+            # Di Windows, data gambar terbalik vertikal (format BMP), balik agar sesuai OpenCV
+            if self.flip:
+                mvsdk.CameraFlipFrameBuffer(pFrameBuffer, FrameHead, 1)
+            if self.on_frame is not None:
+                self.on_frame(self._view(pFrameBuffer, FrameHead), FrameHead)
+        except Exception as e:
+            with self._lock:
+                self.callback_errors += 1
+                self.last_error = e
+        finally:
+            with self._lock:
+                self.delivered += 1
@@ -0,0 +1,994 @@
+#coding=utf-8
+# Kamera simulasi untuk mvsdk. Mengekspor fungsi Camera* dengan ABI yang sama seperti libMVSDK
+# (argumen ctypes, kode status sebagai nilai kembali), sehingga semua skrip capture bisa dijalankan
+# dan di-benchmark tanpa kamera maupun SDK vendor:
+#
+#   MVSDK_BACKEND=sim python cv_grab.py
+#
+# Konfigurasi lewat variabel lingkungan:
+#   MVSDK_SIM_SOURCE        folder/file gambar yang diputar ulang (default: frame QR sintetis)
+#   MVSDK_SIM_CAMERAS       jumlah kamera (default 1)
+#   MVSDK_SIM_FPS           frame rate sensor, 0 = secepat mungkin (default 30)
+#   MVSDK_SIM_JITTER_MS     simpangan baku jitter waktu frame dalam ms (default 0)
+#   MVSDK_SIM_TIMEOUT_RATE  peluang CameraGetImageBuffer mengembalikan CAMERA_STATUS_TIME_OUT (default 0)
+#   MVSDK_SIM_MONO          1 = sensor hitam putih (default 0)
+#   MVSDK_SIM_SEED          seed untuk jitter/timeout
+#   MVSDK_SIM_NULL_ISP      1 = CameraImageProcess tidak menyalin piksel (mengukur overhead Python saja)
+#   MVSDK_SIM_PRODUCT_GAP   jumlah frame konveyor kosong di antara dua produk pada frame sintetis (default 0)
+#
+# Mode trigger: CameraSoftTrigger/Ex menghasilkan CameraSetTriggerCount frame per trigger. Pada mode
+# trigger hardware (2) sinyal IO berasal dari photo-eye simulasi yang aktif saat produk berada di tengah frame.
+import collections
+import glob
+import os
+import random
+import threading
+import time
+from ctypes import *
+
+import cv2
+import numpy as np
+
+import mvsdk
+
+IMAGE_EXTENSIONS = ('.bmp', '.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
+# Jumlah frame yang ditahan buffer internal SDK sebelum frame lama dibuang
+SIM_BUFFER_FRAMES = 2
+
+def _value(arg):
+	"""Ambil nilai Python dari argumen ctypes (c_double, c_void_p, dll.) atau angka biasa."""
+	return arg.value if hasattr(arg, 'value') else arg
+
+def _target(ref):
+	"""Objek ctypes di balik byref()/pointer()."""
+	return ref._obj if hasattr(ref, '_obj') else ref.contents
+
+def _view(address, size):
+	return np.ctypeslib.as_array((c_ubyte * size).from_address(address))
+
+def _load_frames(source, width, height):
+	if os.path.isdir(source):
+		paths = sorted(p for p in glob.glob(os.path.join(source, '*')) if p.lower().endswith(IMAGE_EXTENSIONS))
+	else:
+		paths = [source]
+	frames = []
+	for path in paths:
+		img = cv2.imread(path, cv2.IMREAD_COLOR)
+		if img is None:
+			continue
+		if img.shape[1] != width or img.shape[0] != height:
+			img = cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+		frames.append(img)
+	if not frames:
+		raise ValueError("No readable images in {}".format(source))
+	return frames
+
+def synthetic_frames(width=1280, height=1024, count=32, module_px=6, seed=0, gap=0):
+	"""Frame BGR berisi satu kode QR yang bergerak melintasi frame seperti di konveyor, diikuti gap frame kosong."""
+	rng = np.random.RandomState(seed)
+	text = "No. Produksi: SIM-0001\nNo. Seri: 000001\nJenis Produk: Simulasi"
+	qr = cv2.QRCodeEncoder.create().encode(text)
+	qr = cv2.resize(qr, None, fx=module_px, fy=module_px, interpolation=cv2.INTER_NEAREST)
+	qr = cv2.copyMakeBorder(qr, 4 * module_px, 4 * module_px, 4 * module_px, 4 * module_px, cv2.BORDER_CONSTANT, value=255)
+	qh, qw = qr.shape
+	# Satu medan noise sensor, digeser per frame agar noise tidak statis
+	noise = rng.randint(-6, 7, size=(height, width)).astype(np.int16)
+	frames = []
+	for i in range(count):
+		gray = np.full((height, width), 90, np.int16)
+		x = int((width - qw) * i / max(count - 1, 1))
+		y = (height - qh) // 2
+		gray[y:y + qh, x:x + qw] = qr
+		gray += np.roll(noise, i * 37, axis=1)
+		gray = np.clip(gray, 0, 255).astype(np.uint8)
+		frames.append(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+	for i in range(gap):
+		gray = np.clip(np.roll(noise, (count + i) * 37, axis=1) + 90, 0, 255).astype(np.uint8)
+		frames.append(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+	return frames
+
+def _mosaic(bgr):
+	"""BGR -> RAW Bayer GR8 (baris genap G R, baris ganjil B G), sama seperti data mentah sensor warna."""
+	raw = np.empty(bgr.shape[:2], np.uint8)
+	raw[0::2, 0::2] = bgr[0::2, 0::2, 1]
+	raw[0::2, 1::2] = bgr[0::2, 1::2, 2]
+	raw[1::2, 0::2] = bgr[1::2, 0::2, 0]
+	raw[1::2, 1::2] = bgr[1::2, 1::2, 1]
+	return raw
+
+class _SimExport(object):
+	"""Fungsi simulasi yang, seperti fungsi ctypes, menerima atribut restype/argtypes."""
+	def __init__(self, func):
+		self.func = func
+		self.restype = c_int
+		self.argtypes = None
+
+	def __call__(self, *args):
+		return self.func(*args)
+
+class _SimCamera(object):
+	def __init__(self, index, width, height, mono):
+		self.index = index
+		self.width = width
+		self.height = height
+		self.mono = mono
+		self.lock = threading.Lock()
+		self.opened = False
+		self.playing = False
+		self.isp_format = mvsdk.CAMERA_MEDIA_TYPE_MONO8 if mono else mvsdk.CAMERA_MEDIA_TYPE_BGR8
+		self.trigger_mode = 0
+		self.trigger_count = 1
+		# Waktu selesai readout frame burst trigger yang belum diambil
+		self.trigger_frames = collections.deque()
+		self.trigger_cond = threading.Condition(self.lock)
+		self.next_hard = None
+		self.triggers = 0
+		self.exposure_us = 10000.0
+		self.analog_gain = 8
+		self.roi = (0, 0, width, height)
+		self.t0 = 0.0
+		self.seq = 0
+		self.next_due = 0.0
+		# Jadwal frame relatif terhadap (sched_t0, sched_seq), di-rebase saat periode berubah (ROI)
+		self.sched_t0 = 0.0
+		self.sched_seq = 0
+		self.transfer_roi = (0, 0, width, height)
+		self.transfer_enabled = False
+		self.frame_id = 0
+		self.timestamp = 0
+		self.lost = 0
+		self.timeouts = 0
+		self.outstanding = set()
+		self.roi_buffers = []
+		self.callback = None
+		self.callback_context = None
+		self.callback_thread = None
+
+	def dev_info(self):
+		info = mvsdk.tSdkCameraDevInfo()
+		info.acProductSeries = b"SIM"
+		info.acProductName = b"MV-SIM-MONO" if self.mono else b"MV-SIM-COLOR"
+		info.acFriendlyName = "SimCam{}".format(self.index).encode()
+		info.acLinkName = "sim{}".format(self.index).encode()
+		info.acDriverVersion = b"sim"
+		info.acSensorType = b"sim"
+		info.acPortType = b"SIM"
+		info.acSn = "SIM{:05d}".format(self.index).encode()
+		info.uInstance = self.index
+		return info
+
+class _SimGrabber(object):
+	"""Status satu objek CameraGrabber (thread capture milik SDK + callback pengguna)."""
+	_next_handle = [1]
+
+	def __init__(self, cam, hCamera):
+		self.handle = _SimGrabber._next_handle[0]
+		_SimGrabber._next_handle[0] += 1
+		self.cam = cam
+		self.hCamera = hCamera
+		self.lock = threading.Lock()
+		self.live = False
+		self.thread = None
+		self.listener = None
+		self.rgb_callback = None
+		self.buffer = (c_ubyte * (cam.width * cam.height * 3))()
+		self.width = 0
+		self.height = 0
+		self.capture = 0
+		self.error = 0
+		self.capture_times = collections.deque(maxlen=30)
+
+class SimulatedSdk(object):
+	"""Pengganti libMVSDK: memutar ulang frame dengan FPS, jitter, dan timeout yang bisa diatur."""
+
+	def __init__(self, source=None, cameras=1, fps=30.0, jitter_ms=0.0, timeout_rate=0.0,
+				 mono=False, width=1280, height=1024, seed=None, null_isp=False, product_gap=0):
+		self.fps = float(fps)
+		self.null_isp = null_isp
+		self.jitter_ms = float(jitter_ms)
+		self.timeout_rate = float(timeout_rate)
+		self.rng = random.Random(seed)
+		self.rng_lock = threading.Lock()
+
+		frames = _load_frames(source, width, height) if source else synthetic_frames(width, height, gap=product_gap)
+		# Indeks frame adegan saat produk melewati photo-eye (trigger hardware simulasi)
+		self.trigger_index = 0 if source else 16
+		self.width = frames[0].shape[1]
+		self.height = frames[0].shape[0]
+		self.mono = mono
+		# Data RAW disimpan sekali di memori ctypes, CameraGetImageBuffer cukup mengembalikan alamatnya
+		self.raw_frames = []
+		for bgr in frames:
+			raw = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY) if mono else _mosaic(bgr)
+			buf = (c_ubyte * raw.size)()
+			np.ctypeslib.as_array(buf)[:] = raw.ravel()
+			self.raw_frames.append(buf)
+		self.raw_by_address = dict((addressof(buf), buf) for buf in self.raw_frames)
+
+		self.cameras = [_SimCamera(i, self.width, self.height, mono) for i in range(int(cameras))]
+		self.aligned = {}
+		self.grabbers = {}
+
+		# Fungsi yang diekspor dibungkus agar wrapper mvsdk bisa menulis restype seperti pada library ctypes
+		for name in dir(type(self)):
+			if name.startswith('Camera'):
+				setattr(self, name, _SimExport(getattr(self, name)))
+
+	@classmethod
+	def from_env(cls, environ=os.environ):
+		seed = environ.get("MVSDK_SIM_SEED")
+		return cls(source=environ.get("MVSDK_SIM_SOURCE") or None,
+				   cameras=int(environ.get("MVSDK_SIM_CAMERAS", 1)),
+				   fps=float(environ.get("MVSDK_SIM_FPS", 30)),
+				   jitter_ms=float(environ.get("MVSDK_SIM_JITTER_MS", 0)),
+				   timeout_rate=float(environ.get("MVSDK_SIM_TIMEOUT_RATE", 0)),
+				   mono=environ.get("MVSDK_SIM_MONO", "0") == "1",
+				   seed=int(seed) if seed is not None else None,
+				   null_isp=environ.get("MVSDK_SIM_NULL_ISP", "0") == "1",
+				   product_gap=int(environ.get("MVSDK_SIM_PRODUCT_GAP", 0)))
+
+	def __getattr__(self, name):
+		# Fungsi SDK lain (gamma, kontras, white balance, ...) diterima dan diabaikan
+		if name.startswith('Camera'):
+			return _SimExport(lambda *args: mvsdk.CAMERA_STATUS_SUCCESS)
+		raise AttributeError(name)
+
+	def _camera(self, hCamera):
+		index = _value(hCamera) - 1
+		if index < 0 or index >= len(self.cameras) or not self.cameras[index].opened:
+			return None
+		return self.cameras[index]
+
+	def _period(self, cam):
+		# Waktu readout sensor sebanding dengan jumlah baris yang dibaca, jadi ROI yang lebih pendek menaikkan FPS
+		if self.fps <= 0:
+			return 0.0
+		rows = cam.transfer_roi[3] if cam.transfer_enabled else cam.roi[3]
+		return 1.0 / self.fps * rows / cam.height
+
+	def _rebase(self, cam):
+		"""Panggil dengan cam.lock dipegang setelah ROI berubah agar jadwal frame berlanjut dengan periode baru."""
+		cam.sched_t0 = cam.next_due
+		cam.sched_seq = cam.seq
+
+	def _jitter(self, period):
+		if self.jitter_ms <= 0 or period <= 0:
+			return 0.0
+		with self.rng_lock:
+			j = self.rng.gauss(0.0, self.jitter_ms / 1000.0)
+		return max(-period / 2, min(period / 2, j))
+
+	def _inject_timeout(self):
+		if self.timeout_rate <= 0:
+			return False
+		with self.rng_lock:
+			return self.rng.random() < self.timeout_rate
+
+	#----------------------------------- Enumerasi & inisialisasi ------------------------------------------
+
+	def CameraSdkInit(self, iLanguageSel):
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraEnumerateDevice(self, pCameraList, pNums):
+		nums = _target(pNums)
+		count = min(nums.value, len(self.cameras))
+		for i in range(count):
+			pCameraList[i] = self.cameras[i].dev_info()
+		nums.value = count
+		return mvsdk.CAMERA_STATUS_SUCCESS if count else mvsdk.CAMERA_STATUS_NO_DEVICE_FOUND
+
+	def CameraIsOpened(self, pCameraInfo, pOpened):
+		info = _target(pCameraInfo)
+		_target(pOpened).value = int(any(c.opened for c in self.cameras if c.dev_info().acSn == info.acSn))
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraInit(self, pCameraInfo, emParamLoadMode, emTeam, pCameraHandle):
+		info = _target(pCameraInfo)
+		for cam in self.cameras:
+			if cam.dev_info().acSn == info.acSn:
+				if cam.opened:
+					return mvsdk.CAMERA_STATUS_DEVICE_IS_OPENED
+				cam.opened = True
+				_target(pCameraHandle).value = cam.index + 1
+				return mvsdk.CAMERA_STATUS_SUCCESS
+		return mvsdk.CAMERA_STATUS_NO_DEVICE_FOUND
+
+	def CameraInitEx(self, iDeviceIndex, emParamLoadMode, emTeam, pCameraHandle):
+		if iDeviceIndex < 0 or iDeviceIndex >= len(self.cameras):
+			return mvsdk.CAMERA_STATUS_NO_DEVICE_FOUND
+		return self.CameraInit(byref(self.cameras[iDeviceIndex].dev_info()), emParamLoadMode, emTeam, pCameraHandle)
+
+	def CameraUnInit(self, hCamera):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		cam.playing = False
+		cam.opened = False
+		self._join_callback(cam)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetCapability(self, hCamera, pCameraInfo):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		cap = _target(pCameraInfo)
+		cap.sResolutionRange.iWidthMax = cam.width
+		cap.sResolutionRange.iHeightMax = cam.height
+		cap.sResolutionRange.iWidthMin = 16
+		cap.sResolutionRange.iHeightMin = 16
+		cap.sIspCapacity.bMonoSensor = int(cam.mono)
+		cap.sIspCapacity.bAutoExposure = 1
+		cap.sIspCapacity.bManualExposure = 1
+		cap.sExposeDesc.uiAnalogGainMin = 8
+		cap.sExposeDesc.uiAnalogGainMax = 132
+		cap.sExposeDesc.fAnalogGainStep = 0.125
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetErrorString(self, iStatusCode):
+		for name in dir(mvsdk):
+			if name.startswith('CAMERA_STATUS_') and getattr(mvsdk, name) == iStatusCode:
+				return name.encode()
+		return b"CAMERA_STATUS_UNKNOW"
+
+	#----------------------------------- Parameter ------------------------------------------
+
+	def CameraSetIspOutFormat(self, hCamera, uFormat):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		if uFormat not in (mvsdk.CAMERA_MEDIA_TYPE_MONO8, mvsdk.CAMERA_MEDIA_TYPE_BGR8):
+			return mvsdk.CAMERA_STATUS_NOT_SUPPORTED
+		cam.isp_format = uFormat
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetIspOutFormat(self, hCamera, puFormat):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(puFormat).value = cam.isp_format
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetTriggerMode(self, hCamera, iModeSel):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		with cam.trigger_cond:
+			cam.trigger_mode = _value(iModeSel)
+			cam.trigger_frames.clear()
+			cam.next_hard = None
+			if cam.trigger_mode == 0 and cam.playing:
+				# Kembali free-run: jadwal frame dimulai dari sekarang, bukan mengejar waktu selama mode trigger
+				cam.next_due = time.perf_counter()
+				self._rebase(cam)
+			cam.trigger_cond.notify_all()
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetTriggerMode(self, hCamera, piModeSel):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(piModeSel).value = cam.trigger_mode
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetTriggerCount(self, hCamera, iCount):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		if _value(iCount) < 1:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		cam.trigger_count = _value(iCount)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetTriggerCount(self, hCamera, piCount):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(piCount).value = cam.trigger_count
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSoftTrigger(self, hCamera):
+		return self.CameraSoftTriggerEx(hCamera, 0)
+
+	def CameraSoftTriggerEx(self, hCamera, uFlags):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		if cam.trigger_mode != 1:
+			return mvsdk.CAMERA_STATUS_NOT_SUPPORTED
+		with cam.trigger_cond:
+			if _value(uFlags) & mvsdk.CAMERA_ST_CLEAR_BUFFER_BEFORE:
+				self._clear_buffer(cam, time.perf_counter())
+			self._trigger_burst(cam, time.perf_counter())
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraClearBuffer(self, hCamera):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		with cam.trigger_cond:
+			now = time.perf_counter()
+			if cam.trigger_mode != 0:
+				self._clear_buffer(cam, now)
+			elif cam.playing and cam.next_due < now:
+				cam.next_due = now
+				self._rebase(cam)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def _clear_buffer(self, cam, now):
+		"""Buang frame trigger yang sudah selesai readout (sudah ada di buffer). Panggil dengan cam.lock dipegang."""
+		while cam.trigger_frames and cam.trigger_frames[0] <= now:
+			cam.trigger_frames.popleft()
+
+	def _trigger_burst(self, cam, t):
+		"""Satu trigger pada waktu t: trigger_count frame berurutan. Panggil dengan cam.lock dipegang."""
+		period = self._period(cam)
+		first = t + cam.exposure_us / 1e6
+		cam.trigger_frames.extend(first + k * period for k in range(cam.trigger_count))
+		cam.triggers += 1
+		cam.trigger_cond.notify_all()
+
+	def _fire_hard(self, cam, now):
+		"""Sinyal photo-eye simulasi: satu trigger setiap kali produk melewati indeks trigger_index."""
+		if self.fps <= 0:
+			return
+		n = len(self.raw_frames)
+		if cam.next_hard is None:
+			k = -(-((now - cam.t0) * self.fps - self.trigger_index) // n)
+			cam.next_hard = cam.t0 + (k * n + self.trigger_index) / self.fps
+		while cam.next_hard <= now:
+			self._trigger_burst(cam, cam.next_hard)
+			cam.next_hard += n / self.fps
+
+	def CameraSetExposureTime(self, hCamera, fExposureTime):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		cam.exposure_us = _value(fExposureTime)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetExposureTime(self, hCamera, pfExposureTime):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(pfExposureTime).value = cam.exposure_us
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetAnalogGain(self, hCamera, iAnalogGain):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		cam.analog_gain = iAnalogGain
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetAnalogGain(self, hCamera, piAnalogGain):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(piAnalogGain).value = cam.analog_gain
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetImageResolution(self, hCamera, pImageResolution):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		res = _target(pImageResolution)
+		if res.iIndex != 0xFF:
+			with cam.lock:
+				cam.roi = (0, 0, cam.width, cam.height)
+				self._rebase(cam)
+			return mvsdk.CAMERA_STATUS_SUCCESS
+		# Offset dan ukuran dibulatkan ke kelipatan 2 agar pola Bayer tetap sama
+		x, y = res.iHOffsetFOV & ~1, res.iVOffsetFOV & ~1
+		w, h = res.iWidthFOV & ~1, res.iHeightFOV & ~1
+		if w < 16 or h < 16 or x < 0 or y < 0 or x + w > cam.width or y + h > cam.height:
+			return mvsdk.CAMERA_STATUS_PARAMETER_OUT_OF_BOUND
+		with cam.lock:
+			cam.roi = (x, y, w, h)
+			self._rebase(cam)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetTransferRoi(self, hCamera, index, X1, Y1, X2, Y2):
+		# Hanya satu region (index 0); ukuran frame tetap, piksel di luar region tidak dikirim (hitam)
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		if index != 0:
+			return mvsdk.CAMERA_STATUS_NOT_SUPPORTED
+		x1, y1, x2, y2 = X1 & ~1, Y1 & ~1, (X2 + 1) & ~1, (Y2 + 1) & ~1
+		if x1 < 0 or y1 < 0 or x2 > cam.width or y2 > cam.height or x2 - x1 < 16 or y2 - y1 < 16:
+			return mvsdk.CAMERA_STATUS_PARAMETER_OUT_OF_BOUND
+		with cam.lock:
+			cam.transfer_roi = (x1, y1, x2 - x1, y2 - y1)
+			self._rebase(cam)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetTransferRoi(self, hCamera, index, pX1, pY1, pX2, pY2):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		x, y, w, h = cam.transfer_roi
+		_target(pX1).value, _target(pY1).value = x, y
+		_target(pX2).value, _target(pY2).value = x + w, y + h
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraEnableTransferRoi(self, hCamera, uEnableMask):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		with cam.lock:
+			cam.transfer_enabled = bool(uEnableMask & 1)
+			self._rebase(cam)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetImageResolution(self, hCamera, psCurVideoSize):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		res = _target(psCurVideoSize)
+		x, y, w, h = cam.roi
+		full = (w, h) == (cam.width, cam.height)
+		res.iIndex = 0 if full else 0xFF
+		res.iHOffsetFOV, res.iVOffsetFOV = x, y
+		res.iWidthFOV, res.iHeightFOV = w, h
+		res.iWidth, res.iHeight = w, h
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	#----------------------------------- Akuisisi ------------------------------------------
+
+	def CameraPlay(self, hCamera):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		with cam.lock:
+			if not cam.playing:
+				cam.playing = True
+				cam.t0 = time.perf_counter()
+				cam.seq = 0
+				cam.next_due = cam.t0
+				cam.sched_t0 = cam.t0
+				cam.sched_seq = 0
+				cam.trigger_frames.clear()
+				cam.next_hard = None
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraPause(self, hCamera):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		cam.playing = False
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	CameraStop = CameraPause
+
+	def _wait_frame(self, cam, wTimes):
+		"""Tunggu frame sensor berikutnya. Mengembalikan (seq, due) atau None jika timeout."""
+		timeout = wTimes / 1000.0
+		if not cam.playing:
+			time.sleep(timeout)
+			return None
+		if cam.trigger_mode != 0:
+			return self._wait_trigger(cam, timeout)
+
+		now = time.perf_counter()
+		period = self._period(cam)
+		with cam.lock:
+			if period > 0 and now - cam.next_due > SIM_BUFFER_FRAMES * period:
+				# Konsumen terlambat: buffer internal penuh, frame lama dibuang
+				skipped = int((now - cam.next_due) / period) - SIM_BUFFER_FRAMES
+				cam.lost += skipped
+				cam.seq += skipped
+				cam.next_due += skipped * period
+			seq, due = cam.seq, (cam.next_due if period > 0 else now)
+			if due - now > timeout:
+				wait = None
+			else:
+				wait = max(0.0, due - now)
+				cam.seq += 1
+				cam.next_due = cam.sched_t0 + (cam.seq - cam.sched_seq) * period + self._jitter(period)
+		if wait is None:
+			time.sleep(timeout)
+			cam.timeouts += 1
+			return None
+		if wait:
+			time.sleep(wait)
+		if self._inject_timeout():
+			# Frame hilang di transport, pemanggil melihat timeout
+			cam.lost += 1
+			cam.timeouts += 1
+			time.sleep(timeout)
+			return None
+		return seq, due
+
+	def _wait_trigger(self, cam, timeout):
+		"""Mode trigger: tunggu frame burst berikutnya tanpa polling (thread tidur di condition variable)."""
+		deadline = time.perf_counter() + timeout
+		with cam.trigger_cond:
+			while True:
+				now = time.perf_counter()
+				if cam.trigger_mode == 2:
+					self._fire_hard(cam, now)
+				if cam.trigger_frames and cam.trigger_frames[0] <= deadline:
+					due = cam.trigger_frames.popleft()
+					seq = cam.seq
+					cam.seq += 1
+					break
+				if now >= deadline or cam.trigger_mode == 0 or not cam.playing:
+					cam.timeouts += 1
+					return None
+				wait = deadline - now
+				if cam.trigger_mode == 2 and cam.next_hard is not None:
+					wait = min(wait, cam.next_hard - now)
+				cam.trigger_cond.wait(max(wait, 0.0))
+		wait = due - time.perf_counter()
+		if wait > 0:
+			time.sleep(wait)
+		if self._inject_timeout():
+			cam.lost += 1
+			cam.timeouts += 1
+			time.sleep(timeout)
+			return None
+		return seq, due
+
+	def _readout(self, cam, seq, due):
+		"""Alamat data RAW untuk frame seq sesuai ROI saat ini, beserta ukurannya."""
+		# Adegan maju menurut waktu (laju fps full frame), bukan nomor frame, agar kecepatan
+		# konveyor tetap sama saat ROI kecil menaikkan FPS
+		index = int((due - cam.t0) * self.fps) if self.fps > 0 else seq
+		raw = self.raw_frames[index % len(self.raw_frames)]
+		x, y, w, h = cam.roi
+		transfer = cam.transfer_enabled and cam.transfer_roi != (0, 0, cam.width, cam.height)
+		if (w, h) == (cam.width, cam.height) and not transfer:
+			return addressof(raw), w, h
+		src = np.ctypeslib.as_array(raw).reshape(cam.height, cam.width)
+		slot = seq % (SIM_BUFFER_FRAMES + 2)
+		while len(cam.roi_buffers) <= slot:
+			buf = (c_ubyte * (cam.width * cam.height))()
+			cam.roi_buffers.append(buf)
+			self.raw_by_address[addressof(buf)] = buf
+		buf = cam.roi_buffers[slot]
+		dst = np.ctypeslib.as_array(buf)[:w * h].reshape(h, w)
+		if transfer:
+			# Transfer ROI berada dalam koordinat sensor; bagian di luar region tetap hitam
+			tx, ty, tw, th = cam.transfer_roi
+			dst[:] = 0
+			x0, y0 = max(tx, x), max(ty, y)
+			x1, y1 = min(tx + tw, x + w), min(ty + th, y + h)
+			if x1 > x0 and y1 > y0:
+				dst[y0 - y:y1 - y, x0 - x:x1 - x] = src[y0:y1, x0:x1]
+		else:
+			dst[:] = src[y:y + h, x:x + w]
+		return addressof(buf), w, h
+
+	def _fill_head(self, cam, head, seq, due, width, height):
+		head.uiMediaType = mvsdk.CAMERA_MEDIA_TYPE_MONO8 if cam.mono else mvsdk.CAMERA_MEDIA_TYPE_BAYGR8
+		head.uBytes = width * height
+		head.iWidth = width
+		head.iHeight = height
+		head.iWidthZoomSw = 0
+		head.iHeightZoomSw = 0
+		head.bIsTrigger = int(cam.trigger_mode != 0)
+		head.uiTimeStamp = int((due - cam.t0) * 10000) & 0xFFFFFFFF
+		head.uiExpTime = int(cam.exposure_us)
+		head.fAnalogGain = cam.analog_gain * 0.125
+		head.iGamma = -1
+		head.iContrast = -1
+		head.iSaturation = 0 if cam.mono else 100
+		head.fRgain = head.fGgain = head.fBgain = 1.0
+		cam.frame_id = seq
+		cam.timestamp = head.uiTimeStamp
+
+	def CameraGetImageBuffer(self, hCamera, pFrameInfo, pbyBuffer, wTimes):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		frame = self._wait_frame(cam, wTimes)
+		if frame is None:
+			return mvsdk.CAMERA_STATUS_TIME_OUT
+		seq, due = frame
+		address, width, height = self._readout(cam, seq, due)
+		self._fill_head(cam, _target(pFrameInfo), seq, due, width, height)
+		cam.outstanding.add(address)
+		_target(pbyBuffer).value = address
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraSetCallbackFunction(self, hCamera, pCallBack, pContext, pCallbackOld):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		# Seperti SDK asli, callback dipanggil dari thread milik SDK; pointer NULL menghentikannya
+		cam.callback = pCallBack if pCallBack else None
+		cam.callback_context = _value(pContext)
+		if cam.callback is None:
+			self._join_callback(cam)
+		elif cam.callback_thread is None:
+			cam.callback_thread = threading.Thread(target=self._callback_loop, args=(cam, _value(hCamera)),
+												   name="SimCam{}-callback".format(cam.index), daemon=True)
+			cam.callback_thread.start()
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def _callback_loop(self, cam, hCamera):
+		head = mvsdk.tSdkFrameHead()
+		pHead = pointer(head)
+		while cam.opened and cam.callback is not None:
+			frame = self._wait_frame(cam, 100)
+			callback = cam.callback
+			if frame is None or callback is None:
+				continue
+			seq, due = frame
+			address, width, height = self._readout(cam, seq, due)
+			self._fill_head(cam, head, seq, due, width, height)
+			cam.outstanding.add(address)
+			callback(hCamera, address, pHead, cam.callback_context)
+			# Buffer yang tidak dilepas oleh callback dikembalikan oleh SDK
+			cam.outstanding.discard(address)
+
+	def _join_callback(self, cam):
+		thread, cam.callback_thread = cam.callback_thread, None
+		if thread is not None and thread is not threading.current_thread():
+			thread.join()
+
+	def CameraGetImageBufferPriority(self, hCamera, pFrameInfo, pbyBuffer, wTimes, Priority):
+		return self.CameraGetImageBuffer(hCamera, pFrameInfo, pbyBuffer, wTimes)
+
+	def CameraReleaseImageBuffer(self, hCamera, pbyBuffer):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		address = _value(pbyBuffer)
+		if address not in cam.outstanding:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		cam.outstanding.discard(address)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def _isp(self, cam, in_address, out_address, width, height, out_format):
+		"""Konversi RAW -> out_format ke buffer tujuan, mengembalikan jumlah byte hasil."""
+		size = width * height * (1 if out_format == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3)
+		if self.null_isp:
+			return size
+		raw = _view(in_address, width * height).reshape(height, width)
+		if out_format == mvsdk.CAMERA_MEDIA_TYPE_MONO8:
+			out = _view(out_address, size).reshape(height, width)
+			if cam.mono:
+				out[:] = raw
+			else:
+				cv2.cvtColor(raw, cv2.COLOR_BayerGB2GRAY, dst=out)
+		else:
+			out = _view(out_address, size).reshape(height, width, 3)
+			cv2.cvtColor(raw, cv2.COLOR_GRAY2BGR if cam.mono else cv2.COLOR_BayerGB2BGR, dst=out)
+		return size
+
+	def CameraImageProcess(self, hCamera, pbyIn, pbyOut, pFrInfo):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		head = _target(pFrInfo)
+		head.uBytes = self._isp(cam, _value(pbyIn), _value(pbyOut), head.iWidth, head.iHeight, cam.isp_format)
+		head.uiMediaType = cam.isp_format
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraImageProcessEx(self, hCamera, pbyIn, pbyOut, pFrInfo, uOutFormat, uReserved):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		out_format = _value(uOutFormat)
+		if out_format not in (mvsdk.CAMERA_MEDIA_TYPE_MONO8, mvsdk.CAMERA_MEDIA_TYPE_BGR8):
+			return mvsdk.CAMERA_STATUS_NOT_SUPPORTED
+		head = _target(pFrInfo)
+		head.uBytes = self._isp(cam, _value(pbyIn), _value(pbyOut), head.iWidth, head.iHeight, out_format)
+		head.uiMediaType = out_format
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetImageBufferEx3(self, hCamera, pImageData, uOutFormat, piWidth, piHeight, puTimeStamp, wTimes):
+		# Grab + ISP langsung ke buffer pemanggil, buffer RAW tidak pernah keluar dari SDK
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		out_format = _value(uOutFormat)
+		if out_format not in (mvsdk.CAMERA_MEDIA_TYPE_MONO8, mvsdk.CAMERA_MEDIA_TYPE_BGR8):
+			return mvsdk.CAMERA_STATUS_NOT_SUPPORTED
+		frame = self._wait_frame(cam, _value(wTimes))
+		if frame is None:
+			return mvsdk.CAMERA_STATUS_TIME_OUT
+		seq, due = frame
+		address, width, height = self._readout(cam, seq, due)
+		head = mvsdk.tSdkFrameHead()
+		self._fill_head(cam, head, seq, due, width, height)
+		self._isp(cam, address, _value(pImageData), width, height, out_format)
+		_target(piWidth).value = width
+		_target(piHeight).value = height
+		if puTimeStamp is not None:
+			_target(puTimeStamp).value = head.uiTimeStamp
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetImageBufferEx2(self, hCamera, pImageData, uOutFormat, piWidth, piHeight, wTimes):
+		return self.CameraGetImageBufferEx3(hCamera, pImageData, uOutFormat, piWidth, piHeight, None, wTimes)
+
+	def CameraFlipFrameBuffer(self, pFrameBuffer, pFrameHead, Flags):
+		head = _target(pFrameHead)
+		channels = 1 if head.uiMediaType == mvsdk.CAMERA_MEDIA_TYPE_MONO8 else 3
+		img = _view(_value(pFrameBuffer), head.iWidth * head.iHeight * channels).reshape(head.iHeight, head.iWidth, channels)
+		if Flags & 1:
+			img[:] = img[::-1].copy()
+		if Flags & 2:
+			img[:] = img[:, ::-1].copy()
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetFrameID(self, hCamera, FrameID):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		_target(FrameID).value = cam.frame_id
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetFrameTimeStamp(self, hCamera, TimeStampL, TimeStampH):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		# Satuan mikrodetik seperti pada SDK
+		us = cam.timestamp * 100
+		_target(TimeStampL).value = us & 0xFFFFFFFF
+		_target(TimeStampH).value = us >> 32
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGetFrameStatistic(self, hCamera, psFrameStatistic):
+		cam = self._camera(hCamera)
+		if cam is None:
+			return mvsdk.CAMERA_STATUS_DEVICE_IS_CLOSED
+		stat = _target(psFrameStatistic)
+		stat.iCapture = cam.frame_id + 1 - cam.lost if cam.playing else 0
+		stat.iLost = cam.lost
+		stat.iTotal = stat.iCapture + stat.iLost
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	#----------------------------------- CameraGrabber ------------------------------------------
+
+	def _grabber_create(self, pGrabber, pDevInfo):
+		hCamera = c_int()
+		err_code = self.CameraInit(pDevInfo, -1, -1, byref(hCamera))
+		if err_code != mvsdk.CAMERA_STATUS_SUCCESS:
+			return err_code
+		cam = self._camera(hCamera.value)
+		grabber = _SimGrabber(cam, hCamera.value)
+		self.grabbers[grabber.handle] = grabber
+		_target(pGrabber).value = grabber.handle
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_Create(self, pGrabber, pDevInfo):
+		return self._grabber_create(pGrabber, pDevInfo)
+
+	def CameraGrabber_CreateByIndex(self, pGrabber, Index):
+		if Index < 0 or Index >= len(self.cameras):
+			return mvsdk.CAMERA_STATUS_NO_DEVICE_FOUND
+		return self._grabber_create(pGrabber, byref(self.cameras[Index].dev_info()))
+
+	def CameraGrabber_CreateByName(self, pGrabber, Name):
+		name = _value(Name)
+		for cam in self.cameras:
+			if cam.dev_info().acFriendlyName == name:
+				return self._grabber_create(pGrabber, byref(cam.dev_info()))
+		return mvsdk.CAMERA_STATUS_NO_DEVICE_FOUND
+
+	def CameraGrabber_Destroy(self, Grabber):
+		grabber = self.grabbers.pop(_value(Grabber), None)
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		self._grabber_stop(grabber)
+		return self.CameraUnInit(grabber.hCamera)
+
+	def CameraGrabber_GetCameraHandle(self, Grabber, phCamera):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		_target(phCamera).value = grabber.hCamera
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_GetCameraDevInfo(self, Grabber, pDevInfo):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		info = grabber.cam.dev_info()
+		memmove(addressof(_target(pDevInfo)), addressof(info), sizeof(info))
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_SetFrameListener(self, Grabber, Listener, Context):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		grabber.listener = (Listener, _value(Context)) if Listener else None
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_SetRGBCallback(self, Grabber, Callback, Context):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		grabber.rgb_callback = (Callback, _value(Context)) if Callback else None
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_StartLive(self, Grabber):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		if grabber.thread is None:
+			self.CameraPlay(grabber.hCamera)
+			grabber.live = True
+			grabber.thread = threading.Thread(target=self._grabber_loop, args=(grabber,),
+											  name="SimGrabber{}".format(grabber.handle), daemon=True)
+			grabber.thread.start()
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def CameraGrabber_StopLive(self, Grabber):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		self._grabber_stop(grabber)
+		return self.CameraPause(grabber.hCamera)
+
+	def CameraGrabber_GetStat(self, Grabber, stat):
+		grabber = self.grabbers.get(_value(Grabber))
+		if grabber is None:
+			return mvsdk.CAMERA_STATUS_PARAMETER_INVALID
+		stat = _target(stat)
+		with grabber.lock:
+			stat.Width, stat.Height = grabber.width, grabber.height
+			stat.Capture = grabber.capture
+			stat.Disp = 0
+			stat.Lost = grabber.cam.lost
+			stat.Error = grabber.error
+			times = grabber.capture_times
+			stat.CapFps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+			stat.DispFps = 0.0
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+	def _grabber_stop(self, grabber):
+		grabber.live = False
+		thread, grabber.thread = grabber.thread, None
+		if thread is not None and thread is not threading.current_thread():
+			thread.join()
+
+	def _grabber_loop(self, grabber):
+		# Urutan seperti thread grabber SDK: RAW -> listener fase 0 -> ISP -> listener fase 1 -> RGB callback
+		cam = grabber.cam
+		head = mvsdk.tSdkFrameHead()
+		pHead = pointer(head)
+		out_address = addressof(grabber.buffer)
+		while grabber.live and cam.opened:
+			frame = self._wait_frame(cam, 100)
+			if frame is None:
+				continue
+			seq, due = frame
+			address, width, height = self._readout(cam, seq, due)
+			self._fill_head(cam, head, seq, due, width, height)
+			with grabber.lock:
+				grabber.capture += 1
+				grabber.width, grabber.height = width, height
+				grabber.capture_times.append(time.perf_counter())
+			listener = grabber.listener
+			if listener is not None and not listener[0](grabber.handle, 0, address, pHead, listener[1]):
+				continue
+			head.uBytes = self._isp(cam, address, out_address, width, height, cam.isp_format)
+			head.uiMediaType = cam.isp_format
+			listener = grabber.listener
+			if listener is not None and not listener[0](grabber.handle, 1, out_address, pHead, listener[1]):
+				continue
+			rgb_callback = grabber.rgb_callback
+			if rgb_callback is not None:
+				rgb_callback[0](grabber.handle, out_address, pHead, rgb_callback[1])
+
+	#----------------------------------- Memori ------------------------------------------
+
+	def CameraAlignMalloc(self, size, align):
+		buf = (c_ubyte * (size + align))()
+		address = (addressof(buf) + align - 1) // align * align
+		self.aligned[address] = buf
+		return address
+
+	def CameraAlignFree(self, membuffer):
+		self.aligned.pop(_value(membuffer), None)
+		return mvsdk.CAMERA_STATUS_SUCCESS
+
+def install(**kwargs):
+	"""Pasang kamera simulasi sebagai backend mvsdk dan kembalikan objeknya."""
+	sdk = SimulatedSdk(**kwargs)
+	mvsdk.SetBackend(sdk)
+	return sdk
@@ -0,0 +1,228 @@
+"""Tracker QR antar frame: deteksi hanya di jendela prediksi, pencarian frame penuh hanya saat track hilang.
+
+Di konveyor kode yang sama terlihat di banyak frame berturut-turut dan bergerak hampir lurus dengan kecepatan
+tetap. QrTracker menyimpan quad terakhir dan kecepatan pusatnya (piksel/detik, dihaluskan), memprediksi quad
+pada timestamp frame berikutnya, lalu men-decode hanya crop jendela di sekitar prediksi. Biaya per frame
+mengikuti ukuran jendela, bukan ukuran sensor. Jika jendela gagal, frame penuh dicari dengan decoder search
+(misalnya coarse_to_fine) dan track dimulai ulang dari hasilnya.
+
+    tracker = QrTracker(search=decoders.create("coarse_to_fine"))
+    text, quad = tracker.track(gray, meta.sensor_time)
+    if auto_roi.update(quad, FrameHead):
+        tracker.reset()       # koordinat frame berubah bersama ROI sensor
+
+MultiTracker menerima semua kode satu frame (OpenCVMultiDecoder.decode_all) dan menempelkan setiap kode ke
+track-nya sendiri, untuk produk dengan dua label:
+
+    tracks = MultiTracker()
+    for track, is_new in tracks.update(decoder.decode_all(gray), now):
+        if is_new and track.text:
+            print(track.id, track.text)
+"""
+import time
+
+import numpy as np
+
+import decoders
+
+
+class QrTracker(decoders.Decoder):
+    name = "tracker"
+
+    def __init__(self, inner="opencv", search=None, margin=0.5, min_margin=24, smoothing=0.5):
+        self.inner = decoders.create(inner) if isinstance(inner, str) else inner
+        self.search = self.inner if search is None else (
+            decoders.create(search) if isinstance(search, str) else search)
+        self.margin = margin            # padding jendela, relatif terhadap ukuran quad
+        self.min_margin = min_margin    # padding minimum (piksel)
+        self.smoothing = smoothing      # bobot kecepatan baru pada estimasi kecepatan
+        self.frames = 0
+        self.window_searches = 0        # frame yang dicari di jendela prediksi
+        self.window_hits = 0            # frame yang ter-decode dari jendela prediksi
+        self.full_searches = 0          # frame yang dicari di frame penuh
+        self.losses = 0                 # track yang hilang (jendela dan frame penuh gagal)
+        self.window_pixels = 0
+        self.reset()
+
+    def reset(self):
+        """Lupakan track, misalnya setelah ROI sensor atau resolusi berubah."""
+        self.quad = None
+        self.time = None
+        self.velocity = None
+
+    def predict(self, now):
+        """Quad yang diharapkan pada waktu now (detik), None jika belum ada track."""
+        if self.quad is None:
+            return None
+        if self.velocity is None:
+            return self.quad
+        return self.quad + self.velocity * (now - self.time)
+
+    def window(self, shape, now):
+        """(x0, y0, x1, y1) jendela pencarian di sekitar prediksi, None jika belum ada track."""
+        quad = self.predict(now)
+        if quad is None:
+            return None
+        lo, hi = quad.min(axis=0), quad.max(axis=0)
+        margin = (hi - lo) * self.margin + self.min_margin
+        if self.velocity is not None:
+            # Ketidakpastian prediksi bertambah dengan jarak tempuh sejak deteksi terakhir
+            margin = margin + np.abs(self.velocity * (now - self.time)) * 0.25
+        x0, y0 = np.maximum(np.floor(lo - margin), 0).astype(int)
+        x1 = int(min(np.ceil(hi[0] + margin[0]), shape[1]))
+        y1 = int(min(np.ceil(hi[1] + margin[1]), shape[0]))
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return None    # prediksi sudah keluar frame
+        return x0, y0, x1, y1
+
+    def update(self, quad, now):
+        """Masukkan quad hasil deteksi (koordinat frame) pada waktu now."""
+        quad = np.asarray(quad, dtype=np.float32).reshape(-1, 2)
+        if self.quad is not None and now > self.time:
+            v = (quad.mean(axis=0) - self.quad.mean(axis=0)) / (now - self.time)
+            self.velocity = v if self.velocity is None else (
+                self.smoothing * v + (1 - self.smoothing) * self.velocity)
+        self.quad = quad
+        self.time = now
+
+    def track(self, gray, now=None):
+        """Decode satu frame dengan timestamp now (detik). Mengembalikan (text, quad)."""
+        if now is None:
+            now = time.perf_counter()
+        self.frames += 1
+        box = self.window(gray.shape, now)
+        if box is not None:
+            x0, y0, x1, y1 = box
+            self.window_searches += 1
+            self.window_pixels += (x1 - x0) * (y1 - y0)
+            result = self.inner.decode(gray[y0:y1, x0:x1])
+            if result and result.quad is not None:
+                self.window_hits += 1
+                quad = result.quad + (x0, y0)
+                self.update(quad, now)
+                return result.text, quad
+        self.full_searches += 1
+        result = self.search.decode(gray)
+        if result.quad is None:
+            if self.quad is not None:
+                self.losses += 1
+            self.reset()
+            return result.text, None
+        if box is None:
+            # Track baru: kecepatan lama tidak berlaku untuk kode berikutnya
+            self.reset()
+        self.update(result.quad, now)
+        return result.text, result.quad
+
+    def _decode(self, gray):
+        return self.track(gray)
+
+    def stats(self):
+        return {"frames": self.frames, "window_searches": self.window_searches, "window_hits": self.window_hits,
+                "full_searches": self.full_searches, "losses": self.losses,
+                "mean_window_pixels": float(self.window_pixels) / self.window_searches if self.window_searches else 0}
+
+
+class Track(object):
+    """Satu kode yang diikuti MultiTracker: quad terakhir, kecepatan pusat dan payload."""
+
+    def __init__(self, track_id, text, quad, now):
+        self.id = track_id
+        self.text = text
+        self.quad = quad
+        self.time = now
+        self.first_seen = now
+        self.velocity = None
+        self.hits = 1
+        # True pada frame saat track pertama kali mendapat payload (bisa setelah beberapa frame tanpa decode)
+        self.text_acquired = bool(text)
+
+    def predict(self, now):
+        if self.velocity is None:
+            return self.quad
+        return self.quad + self.velocity * (now - self.time)
+
+    def update(self, text, quad, now, smoothing):
+        if now > self.time:
+            v = (quad.mean(axis=0) - self.quad.mean(axis=0)) / (now - self.time)
+            self.velocity = v if self.velocity is None else smoothing * v + (1 - smoothing) * self.velocity
+        self.text_acquired = bool(text) and not self.text
+        if text:
+            self.text = text
+        self.quad = quad
+        self.time = now
+        self.hits += 1
+
+    def __repr__(self):
+        return "Track({}, {!r}, hits={})".format(self.id, self.text, self.hits)
+
+
+class MultiTracker(object):
+    """Hubungkan hasil decode_all() antar frame ke track per kode.
+
+    Kode dengan payload sama masuk ke track dengan payload itu. Kode lain (atau yang tidak ter-decode)
+    dipasangkan dengan track terdekat dari posisi prediksinya, jika jaraknya kurang dari gate x ukuran
+    kode. Track yang tidak terlihat selama max_age detik dihapus.
+    """
+
+    def __init__(self, gate=1.0, max_age=0.5, smoothing=0.5):
+        self.gate = gate
+        self.max_age = max_age
+        self.smoothing = smoothing
+        self.tracks = []
+        self.next_id = 0
+        self.created = 0
+        self.expired = 0
+
+    def update(self, results, now=None):
+        """results: list DecodeResult satu frame. Mengembalikan list (Track, is_new) dengan urutan results.
+
+        Laporkan payload saat track.text_acquired, bukan saat is_new: kode yang pertama terlihat tanpa
+        ter-decode membuat track baru dengan text "" dan baru mendapat payload di frame berikutnya.
+        """
+        if now is None:
+            now = time.perf_counter()
+        alive = [t for t in self.tracks if now - t.time <= self.max_age]
+        self.expired += len(self.tracks) - len(alive)
+        self.tracks = alive
+        for track in self.tracks:
+            track.text_acquired = False
+        free = list(self.tracks)
+        matched = []
+        for result in results:
+            quad = np.asarray(result.quad, dtype=np.float32).reshape(-1, 2)
+            track = None
+            if result.text:
+                track = next((t for t in free if t.text == result.text), None)
+            if track is None:
+                track = self._nearest(free, quad, now, result.text)
+            if track is None:
+                track = Track(self.next_id, result.text, quad, now)
+                self.next_id += 1
+                self.created += 1
+                self.tracks.append(track)
+                matched.append((track, True))
+                continue
+            free.remove(track)
+            track.update(result.text, quad, now, self.smoothing)
+            matched.append((track, False))
+        return matched
+
+    def _nearest(self, tracks, quad, now, text):
+        center = quad.mean(axis=0)
+        size = float(np.ptp(quad, axis=0).max())
+        best, best_distance = None, self.gate * size
+        for track in tracks:
+            if text and track.text and track.text != text:
+                continue    # payload berbeda = kode berbeda, walaupun berdekatan
+            distance = float(np.linalg.norm(track.predict(now).mean(axis=0) - center))
+            if distance < best_distance:
+                best, best_distance = track, distance
+        return best
+
+    def reset(self):
+        self.expired += len(self.tracks)
+        self.tracks = []
+
+    def stats(self):
+        return {"active": len(self.tracks), "created": self.created, "expired": self.expired}
@@ -0,0 +1,27 @@
+"""Test logika murni modul Project dengan kamera simulasi (tanpa SDK vendor dan tanpa kamera)."""
+import os
+import sys
+
+os.environ.setdefault("MVSDK_BACKEND", "sim")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import cv2
+import numpy as np
+import pytest
+
+
+def qr_frame(text, module_px=4, size=(480, 640), pos=(100, 100), background=90):
+    """Frame abu-abu berisi satu kode QR text di pos (x, y)."""
+    qr = cv2.QRCodeEncoder.create().encode(text)
+    qr = cv2.resize(qr, None, fx=module_px, fy=module_px, interpolation=cv2.INTER_NEAREST)
+    qr = cv2.copyMakeBorder(qr, 4 * module_px, 4 * module_px, 4 * module_px, 4 * module_px,
+                            cv2.BORDER_CONSTANT, value=255)
+    gray = np.full(size, background, np.uint8)
+    x, y = pos
+    gray[y:y + qr.shape[0], x:x + qr.shape[1]] = qr
+    return gray
+
+
+@pytest.fixture
+def make_qr_frame():
+    return qr_frame
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+import decode_cache
+import decoders
+
+
+def detect(gray):
+    found, points = cv2.QRCodeDetector().detect(decoders.otsu(gray))
+    assert found
+    return points
+
+
+def blurred(gray, seed):
+    noise = np.random.RandomState(seed).randint(-10, 11, gray.shape)
+    return np.clip(cv2.GaussianBlur(gray, (3, 3), 0) + noise, 0, 255).astype(np.uint8)
+
+
+def test_same_code_same_key_at_any_scale(make_qr_frame):
+    keys = set()
+    for module_px in (3, 4, 6, 8):
+        gray = blurred(make_qr_frame("SN-2024-000123", module_px=module_px, pos=(60, 40)), module_px)
+        fp = decode_cache.fingerprint(gray, detect(gray))
+        assert fp is not None
+        keys.add(fp.tobytes())
+    assert len(keys) == 1
+
+
+def test_other_serial_misses(make_qr_frame):
+    cache = decode_cache.DecodeCache()
+    gray = make_qr_frame("SN-2024-000123")
+    cache.store(decode_cache.fingerprint(gray, detect(gray)), "SN-2024-000123", 20.0)
+    for serial in ("SN-2024-000124", "SN-2024-000133", "SN-2024-001123"):
+        gray = make_qr_frame(serial)
+        fp = decode_cache.fingerprint(gray, detect(gray))
+        assert cache.lookup(fp) is None
+    gray = blurred(make_qr_frame("SN-2024-000123", module_px=5), 0)
+    assert cache.lookup(decode_cache.fingerprint(gray, detect(gray))) == "SN-2024-000123"
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_no_fingerprint_is_never_cached():
+    cache = decode_cache.DecodeCache()
+    cache.store(None, "SN-2024-000123", 20.0)
+    assert cache.lookup(None) is None
+    assert len(cache._entries) == 0
+    assert decode_cache.fingerprint(np.full((200, 200), 128, np.uint8),
+                                    np.array([[20, 20], [180, 20], [180, 180], [20, 180]])) is None
+
+
+class Scripted(decoders.Decoder):
+    name = "scripted"
+
+    def __init__(self, text):
+        self.text = text
+        self.shapes = []
+
+    def _decode(self, gray):
+        self.shapes.append(gray.shape)
+        return self.text, None
+
+
+def test_cached_decoder_chain(make_qr_frame):
+    inner, fallback = Scripted(""), Scripted("FROM-FALLBACK")
+    decoder = decoders.create("cached", inner=inner, fallback=fallback)
+    gray = make_qr_frame("SN-2024-000123")
+    # Miss: crop di-decode inner lalu fallback; hit: keduanya dilewati
+    assert decoder.decode(gray).text == "FROM-FALLBACK"
+    assert decoder.decode(gray).text == "FROM-FALLBACK"
+    assert len(inner.shapes) == len(fallback.shapes) == 1
+    assert inner.shapes[0][0] < gray.shape[0]
+    assert decoder.stats()["hits"] == 1
+    # Tanpa QR: frame penuh ke inner, fallback tidak dijalankan
+    empty = np.full_like(gray, 90)
+    assert not decoder.decode(empty)
+    assert inner.shapes[-1] == gray.shape and len(fallback.shapes) == 1
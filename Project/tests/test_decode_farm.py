@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from decode_farm import DecodeFarm
+
+
+def wait_results(farm, count, timeout=30):
+    results = []
+    for _ in range(int(timeout / 0.1)):
+        results.extend(farm.results(timeout=0.1))
+        if len(results) >= count:
+            break
+    return results
+
+
+def test_unknown_decoder_is_rejected_before_spawning():
+    with pytest.raises(ValueError):
+        DecodeFarm(workers=1, decoder="no_such_decoder")
+
+
+def test_worker_that_cannot_create_its_decoder_is_reported():
+    with DecodeFarm(workers=1, max_shape=(64, 64), decoder_kwargs={"no_such_option": 1}) as farm:
+        farm.submit(0, np.zeros((64, 64), np.uint8))
+        with pytest.raises(RuntimeError, match="TypeError"):
+            wait_results(farm, 1)
+        assert 0 in farm.stats()["dead_workers"]
+
+
+def test_decode_exception_returns_error_result_and_slot(make_qr_frame):
+    # Level piramida 1/0: ZeroDivisionError di dalam decode, bukan saat decoder dibuat
+    with DecodeFarm(workers=1, max_shape=(480, 640), slots=2, decoder="coarse_to_fine",
+                    decoder_kwargs={"scales": (0,)}) as farm:
+        gray = make_qr_frame("FARM-0001")
+        for frame_id in range(4):
+            assert farm.submit(frame_id, gray, timeout=30)
+        results = wait_results(farm, 4)
+        assert [r.frame_id for r in results] == [0, 1, 2, 3]
+        assert all("ZeroDivisionError" in r.error for r in results)
+        stats = farm.stats()
+        assert stats["errors"] == 4 and stats["queue_depth"] == 0 and not stats["dead_workers"]
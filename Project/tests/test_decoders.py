@@ -0,0 +1,55 @@
+import decoders
+import mvsdk_sim
+
+
+def sim_gray(count=4, module_px=4):
+    return [f[:, :, 0].copy() for f in mvsdk_sim.synthetic_frames(count=count, module_px=module_px)]
+
+
+def test_coarse_to_fine_bypasses_coarse_level_for_tiny_codes():
+    # 2 px/modul dengan noise sensor: level 1/2 dan 1/4 tidak menemukan kode, frame penuh bisa
+    frames = sim_gray(module_px=2) * 3
+    c2f = decoders.CoarseToFineDecoder(bypass_after=2, max_bypass=4)
+    assert all(c2f.decode(gray) for gray in frames)
+    stats = c2f.stats()
+    assert stats["located"] == 0 and stats["fallbacks"] == 12
+    assert stats["bypassed"] >= 6
+
+
+def test_coarse_to_fine_crops_large_codes(make_qr_frame):
+    gray = make_qr_frame("LARGE-0001", module_px=8, size=(720, 960), pos=(500, 300))
+    c2f = decoders.CoarseToFineDecoder()
+    for _ in range(3):
+        assert c2f.decode(gray).text == "LARGE-0001"
+    stats = c2f.stats()
+    assert stats["crop_decoded"] == 3 and stats["bypassed"] == 0
+
+
+def test_multiscale_runs_at_most_two_levels_at_once(make_qr_frame):
+    decoder = decoders.MultiScaleDecoder(budget_ms=1000)
+    try:
+        assert decoder.workers <= 2
+        assert decoder.decode(make_qr_frame("SCALE-0001")).text == "SCALE-0001"
+        assert decoder.stats()["wins"][1.0] == 1
+    finally:
+        decoder.close()
+
+
+def test_cascade_retune_orders_by_cost_per_success():
+    cascade = decoders.CascadeDecoder(steps=("raw", "otsu", "inverted"))
+    # raw murah tetapi jarang berhasil, inverted lebih mahal tetapi selalu berhasil, otsu belum pernah dicoba
+    cascade.step_stats["raw"].update(attempts=10, successes=0, total_ms=10.0)      # 1 ms * 12 / 1 = 12
+    cascade.step_stats["inverted"].update(attempts=10, successes=10, total_ms=40.0)  # 4 ms * 12 / 11
+    cascade.retune()
+    assert cascade.order == ["otsu", "inverted", "raw"]
+
+
+def test_cascade_moves_successful_step_to_front(make_qr_frame):
+    # QR terang di atas latar gelap: hanya langkah inverted yang berhasil
+    gray = 255 - make_qr_frame("INV-0001", background=165)
+    cascade = decoders.CascadeDecoder(steps=("raw", "otsu", "inverted"), retune_every=2)
+    for _ in range(20):
+        assert cascade.decode(gray).text == "INV-0001"
+    assert cascade.order[0] == "inverted"
+    steps = cascade.stats()["steps"]
+    assert steps["inverted"]["attempts"] == 20 and steps["raw"]["attempts"] < 20
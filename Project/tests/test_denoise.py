@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import denoise
+
+
+def noisy(gray, sigma, seed=0):
+    noise = np.random.RandomState(seed).normal(0, sigma, gray.shape)
+    return np.clip(gray + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("sigma", [3.0, 6.0, 12.0])
+def test_estimate_noise_matches_sensor_sigma(sigma):
+    gray = noisy(np.full((480, 640), 120.0), sigma)
+    assert abs(denoise.estimate_noise(gray) - sigma) <= 0.25 * sigma + 0.5
+
+
+def test_estimate_noise_ignores_qr_contrast(make_qr_frame):
+    # np.std() pada frame QR bersih besar (kontras), sigma noise yang sebenarnya 0
+    gray = make_qr_frame("SN-2024-000123", module_px=6)
+    assert gray.std() > 30
+    assert denoise.estimate_noise(gray) < 1.0
+    assert abs(denoise.estimate_noise(noisy(gray, 6.0)) - 6.0) <= 2.0
+
+
+def test_denoiser_filters_only_noisy_frames(make_qr_frame):
+    clean = make_qr_frame("SN-2024-000123")
+    denoiser = denoise.NoiseGatedDenoiser(threshold=6.0, budget_ms=50.0, estimate_every=1)
+    assert denoiser.denoise(clean) is clean
+    grainy = noisy(clean, 12.0)
+    out = denoiser.denoise(grainy, box=(100, 100, 300, 300))
+    assert out is not grainy and out.shape == grainy.shape
+    assert np.array_equal(out[:100], grainy[:100])
+    assert sum(denoiser.stats()["filtered"].values()) == 1
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import dnn_localizer
+
+
+def localizer(**kwargs):
+    # Tanpa model: hanya parsing keluaran YOLO dan NMS yang diuji
+    loc = dnn_localizer.DnnLocalizer.__new__(dnn_localizer.DnnLocalizer)
+    loc.input_size = 416
+    loc.conf_threshold = 0.25
+    loc.nms_threshold = 0.45
+    loc.class_ids = None
+    loc.__dict__.update(kwargs)
+    return loc
+
+
+def row(cx, cy, w, h, objectness, *classes):
+    return [cx, cy, w, h, objectness] + list(classes)
+
+
+def test_normalised_rows_are_scaled_and_suppressed():
+    rows = np.array([
+        row(0.5, 0.5, 0.2, 0.25, 0.9, 1.0),      # QR
+        row(0.51, 0.5, 0.2, 0.25, 0.8, 1.0),     # kotak ganda untuk QR yang sama, dibuang NMS
+        row(0.1, 0.1, 0.05, 0.05, 0.9, 1.0),     # QR kedua
+        row(0.8, 0.8, 0.1, 0.1, 0.2, 1.0),       # di bawah conf_threshold
+    ], dtype=np.float32)
+    boxes = localizer()._boxes(rows, (480, 640))
+    assert len(boxes) == 2
+    best = max(boxes, key=lambda b: b.score)
+    assert best.score == pytest.approx(0.9)
+    assert (best.x, best.y, best.w, best.h) == pytest.approx((256, 180, 128, 120))
+    np.testing.assert_allclose(best.quad()[2], (384, 300))
+
+
+def test_pixel_rows_are_normalised_by_input_size():
+    rows = np.array([row(208, 208, 104, 52, 0.9, 1.0)], dtype=np.float32)
+    box, = localizer()._boxes(rows, (1024, 1280))
+    assert (box.x, box.y, box.w, box.h) == pytest.approx((480, 448, 320, 128))
+
+
+def test_class_filter_and_objectness_only_rows():
+    rows = np.array([row(0.5, 0.5, 0.2, 0.2, 0.9, 0.1, 0.9),
+                     row(0.2, 0.2, 0.1, 0.1, 0.9, 0.9, 0.1)], dtype=np.float32)
+    box, = localizer(class_ids=[1])._boxes(rows, (100, 100))
+    assert box.class_id == 1 and box.score == pytest.approx(0.81)
+    objectness = np.array([row(0.5, 0.5, 0.2, 0.2, 0.6)], dtype=np.float32)
+    box, = localizer()._boxes(objectness, (100, 100))
+    assert box.class_id == 0 and box.score == pytest.approx(0.6)
+    assert localizer(conf_threshold=0.7)._boxes(objectness, (100, 100)) == []
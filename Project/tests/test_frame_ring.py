@@ -0,0 +1,106 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import mvsdk
+import mvsdk_sim
+from frame_ring import FREE, READING, FrameRing
+
+
+@pytest.fixture(autouse=True)
+def sim_sdk():
+    mvsdk_sim.install()
+
+
+def frame_head(width=8, height=4):
+    head = mvsdk.tSdkFrameHead()
+    head.iWidth = width
+    head.iHeight = height
+    head.uiMediaType = mvsdk.CAMERA_MEDIA_TYPE_MONO8
+    head.uBytes = width * height
+    return head
+
+
+def fill(ring, value):
+    slot = ring.acquire_write(0)
+    if slot.buffer is not None:
+        slot.buffer[:32] = value
+    ring.publish(slot, frame_head())
+    return slot
+
+
+@pytest.mark.parametrize("numpy_owned", [True, False])
+def test_get_latest_skips_older_frames(numpy_owned):
+    ring = FrameRing(3, 32, numpy_owned=numpy_owned)
+    for value in (1, 2, 3):
+        fill(ring, value)
+    slot = ring.get(timeout=0)
+    assert slot.seq == 2 and slot.frame.shape == (4, 8, 1)
+    assert ring.dropped == 2
+    ring.release(slot)
+    assert ring.get(timeout=0) is None
+    ring.close()
+
+
+def test_get_oldest_keeps_order():
+    ring = FrameRing(3, 32, numpy_owned=True)
+    for value in (1, 2, 3):
+        fill(ring, value)
+    seqs = []
+    for _ in range(3):
+        with ring.get(timeout=0, latest=False) as slot:
+            seqs.append(int(slot.frame[0, 0, 0]))
+    assert seqs == [1, 2, 3]
+
+
+def test_get_latest_wakes_blocked_producer():
+    ring = FrameRing(2, 32, numpy_owned=True)
+    fill(ring, 1)
+    fill(ring, 2)
+    got = []
+    producer = threading.Thread(target=lambda: got.append(ring.acquire_write(timeout=5, recycle=False)))
+    producer.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    slot = ring.get(timeout=0)          # membebaskan frame lama yang dilewati
+    producer.join(timeout=5)
+    assert got and got[0] is not None and got[0] is not slot
+    assert time.perf_counter() - start < 1.0
+    ring.release(slot)
+
+
+def test_close_defers_free_of_slot_in_use():
+    sdk = mvsdk_sim.install()
+    ring = FrameRing(2, 32)
+    slots = list(ring.slots)
+    fill(ring, 0)
+    slot = ring.get(timeout=0)
+    assert slot.state == READING
+    address = slot.address
+    other = [s for s in slots if s is not slot][0]
+    ring.close()
+    assert address in sdk.aligned            # masih dibaca konsumen
+    assert other.address == 0 and other.frame is None
+    ring.release(slot)
+    assert address not in sdk.aligned
+    assert slot.frame is None and slot.state == FREE
+
+
+@pytest.mark.parametrize("finish", ["publish", "cancel"])
+def test_close_defers_free_of_slot_being_written(finish):
+    sdk = mvsdk_sim.install()
+    ring = FrameRing(2, 32)
+    slot = ring.acquire_write(0)
+    address = slot.address
+    ring.close()
+    # grab() yang sedang berjalan masih menulis ke buffer ini
+    assert slot.address == address and address in sdk.aligned
+    if finish == "publish":
+        assert ring.publish(slot, frame_head()) is None
+    else:
+        ring.cancel(slot)
+    assert address not in sdk.aligned
+    assert slot.address == 0 and slot.frame is None and slot.state == FREE
+    assert ring.acquire_write(0) is None and ring.get(timeout=0) is None
@@ -0,0 +1,48 @@
+import numpy as np
+
+import decoders
+import mvsdk_sim
+from qr_tracker import MultiTracker, QrTracker
+
+
+def result(text, x, y=100, size=80):
+    quad = np.array([[x, y], [x + size, y], [x + size, y + size], [x, y + size]], dtype=np.float32)
+    return decoders.DecodeResult(text, quad, 0.0, "test")
+
+
+def test_text_acquired_after_undecoded_first_sighting():
+    tracker = MultiTracker()
+    (track, is_new), = tracker.update([result("", 100)], now=0.0)
+    assert is_new and track.text == "" and not track.text_acquired
+    (same, is_new), = tracker.update([result("ABC", 110)], now=0.03)
+    assert same is track and not is_new
+    assert track.text == "ABC" and track.text_acquired
+    (same, _), = tracker.update([result("ABC", 120)], now=0.06)
+    assert same is track and not track.text_acquired       # dilaporkan sekali saja
+    (same, _), = tracker.update([result("", 130)], now=0.09)
+    assert same is track and track.text == "ABC" and not track.text_acquired
+
+
+def test_new_decoded_track_acquires_text_once():
+    tracker = MultiTracker()
+    (track, is_new), = tracker.update([result("A", 100)], now=0.0)
+    assert is_new and track.text_acquired
+    (other, is_new), (same, _) = tracker.update([result("B", 400), result("A", 105)], now=0.03)
+    assert is_new and other.text_acquired and other is not track
+    assert same is track and not same.text_acquired
+
+
+def test_tracks_expire_after_max_age():
+    tracker = MultiTracker(max_age=0.1)
+    tracker.update([result("A", 100)], now=0.0)
+    (track, is_new), = tracker.update([result("A", 100)], now=0.5)
+    assert is_new and tracker.stats()["expired"] == 1
+
+
+def test_qr_tracker_searches_predicted_window():
+    frames = [f[:, :, 0].copy() for f in mvsdk_sim.synthetic_frames(count=12, module_px=4)]
+    tracker = QrTracker()
+    texts = [tracker.track(gray, i / 30.0)[0] for i, gray in enumerate(frames)]
+    assert all(texts)
+    stats = tracker.stats()
+    assert stats["window_hits"] >= 8 and stats["full_searches"] <= 3
@@ -0,0 +1,250 @@
+"""Akuisisi berbasis trigger: kamera hanya mengambil burst N frame per produk, bukan free-run.
+
+Pada mode free-run sebagian besar frame adalah konveyor kosong yang tetap di-ISP dan di-decode. Dengan
+CameraSetTriggerMode kamera diam sampai ada trigger, lalu mengambil CameraSetTriggerCount frame. Di antara
+produk, thread konsumen tidur di dalam CameraGetImageBuffer sehingga CPU hampir idle.
+
+Sumber trigger:
+    TRIGGER_HARD   jalur I/O kamera (photo-eye/PLC), tanpa kode Python di antara produk
+    SerialTrigger  pesan serial b"TRIGGER" (seperti TriggerFlash.py) -> CameraSoftTriggerEx
+    MotionTrigger  deteksi gerak pada frame probe beresolusi rendah -> CameraSoftTriggerEx
+
+    acq = TriggeredAcquisition(hCamera, burst=3, mode=TRIGGER_SOFT)
+    SerialTrigger(acq.trigger, port="COM3").start()
+    while running:
+        for frame, FrameHead in acq.frames(1000):   # kosong jika tidak ada produk dalam 1 detik
+            if decode(frame):
+                break                               # sisa burst dibuang
+    acq.close()
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import mvsdk
+from frame_ring import IS_WINDOWS
+
+TRIGGER_CONTINUOUS = 0
+TRIGGER_SOFT = 1
+TRIGGER_HARD = 2
+
+# Jalur input yang dipakai untuk trigger hardware
+TRIGGER_INPUT = 0
+
+
+class TriggeredAcquisition(object):
+    """Kamera dalam mode trigger dengan burst frame per trigger.
+
+    frame_timeout_ms adalah batas tunggu frame ke-2..N dalam satu burst.
+    """
+
+    def __init__(self, hCamera, burst=3, mode=TRIGGER_SOFT, signal_type=mvsdk.EXT_TRIG_LEADING_EDGE,
+                 frame_timeout_ms=200, flip=IS_WINDOWS):
+        if mode not in (TRIGGER_SOFT, TRIGGER_HARD):
+            raise ValueError("mode must be TRIGGER_SOFT or TRIGGER_HARD")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.hCamera = hCamera
+        self.burst = burst
+        self.mode = mode
+        self.frame_timeout_ms = frame_timeout_ms
+        self.triggers = 0
+        self.bursts = 0
+        self.frames_grabbed = 0
+        self.incomplete = 0
+        self.discarded = 0
+        self.last_trigger = None
+        self._lock = threading.Lock()
+
+        mvsdk.CameraSetTriggerMode(hCamera, mode)
+        if mode == TRIGGER_HARD:
+            mvsdk.CameraSetInPutIOMode(hCamera, TRIGGER_INPUT, mvsdk.IOMODE_TRIG_INPUT)
+            mvsdk.CameraSetExtTrigSignalType(hCamera, signal_type)
+        self._count = None
+        self._set_count(burst)
+        self.grabber = mvsdk.FastGrabber(hCamera, flip=flip)
+
+    def _set_count(self, count):
+        if count != self._count:
+            mvsdk.CameraSetTriggerCount(self.hCamera, count)
+            self._count = count
+
+    def trigger(self):
+        """Soft trigger satu burst. Aman dipanggil dari thread sumber trigger (serial, dll.)."""
+        if self.mode != TRIGGER_SOFT:
+            raise RuntimeError("trigger() requires TRIGGER_SOFT")
+        with self._lock:
+            self._set_count(self.burst)
+            # Frame sisa produk sebelumnya di buffer kamera dibuang sebelum burst baru
+            err_code = mvsdk.CameraSoftTriggerEx(self.hCamera, mvsdk.CAMERA_ST_CLEAR_BUFFER_BEFORE)
+            if err_code != mvsdk.CAMERA_STATUS_SUCCESS:
+                raise mvsdk.CameraException(err_code)
+            self.triggers += 1
+            self.last_trigger = time.perf_counter()
+
+    def probe(self, wTimes=200):
+        """Ambil satu frame (trigger count 1) untuk deteksi gerak. Mengembalikan view frame atau None."""
+        with self._lock:
+            self._set_count(1)
+            mvsdk.CameraSoftTriggerEx(self.hCamera, mvsdk.CAMERA_ST_CLEAR_BUFFER_BEFORE)
+        try:
+            return self.grabber.Grab(wTimes)
+        except mvsdk.CameraException as e:
+            if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                raise
+            return None
+
+    def frames(self, wTimes):
+        """Generator frame satu burst: (frame, FrameHead) untuk tiap frame.
+
+        Frame pertama ditunggu hingga wTimes ms (di sinilah thread tidur di antara produk), frame
+        berikutnya hingga frame_timeout_ms. View frame hanya valid sampai frame berikutnya diambil.
+        Jika konsumen berhenti lebih awal (break), sisa burst dibuang dari buffer kamera.
+        """
+        remaining = self.burst
+        timeout = wTimes
+        try:
+            while remaining > 0:
+                try:
+                    frame = self.grabber.Grab(timeout)
+                except mvsdk.CameraException as e:
+                    if e.error_code != mvsdk.CAMERA_STATUS_TIME_OUT:
+                        raise
+                    if remaining < self.burst:
+                        self.incomplete += 1
+                    return
+                if remaining == self.burst:
+                    self.bursts += 1
+                remaining -= 1
+                self.frames_grabbed += 1
+                timeout = self.frame_timeout_ms
+                yield frame, self.grabber.head
+        finally:
+            if 0 < remaining < self.burst:
+                self.discarded += remaining
+                mvsdk.CameraClearBuffer(self.hCamera)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "burst": self.burst,
+            "triggers": self.triggers,
+            "bursts": self.bursts,
+            "frames": self.frames_grabbed,
+            "incomplete": self.incomplete,
+            "discarded": self.discarded,
+        }
+
+    def close(self):
+        """Kembalikan kamera ke free-run dan lepas buffer."""
+        if self.grabber is not None:
+            mvsdk.CameraSetTriggerCount(self.hCamera, 1)
+            mvsdk.CameraSetTriggerMode(self.hCamera, TRIGGER_CONTINUOUS)
+            self.grabber.Close()
+            self.grabber = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SerialTrigger(threading.Thread):
+    """Memanggil on_trigger() setiap menerima baris message dari port serial (pyserial).
+
+    Thread tidur di readline() selama tidak ada data; timeout hanya dipakai untuk memeriksa stop().
+    """
+
+    def __init__(self, on_trigger, port="COM3", baudrate=9600, message=b"TRIGGER", timeout=1.0):
+        super(SerialTrigger, self).__init__(name="serial-trigger-{}".format(port), daemon=True)
+        try:
+            import serial
+        except ImportError:
+            raise ImportError("SerialTrigger requires pyserial (pip install pyserial)")
+        self.on_trigger = on_trigger
+        self.message = message
+        self.received = 0
+        self.errors = 0
+        self.last_error = None
+        self._stop_event = threading.Event()
+        self.ser = serial.Serial(port, baudrate, timeout=timeout)
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                line = self.ser.readline()
+                if line.strip() != self.message:
+                    continue
+                self.received += 1
+                try:
+                    self.on_trigger()
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = e
+        finally:
+            self.ser.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class MotionTrigger(object):
+    """Deteksi gerak pada frame probe kecil, lalu soft trigger satu burst.
+
+    Probe diambil setiap interval detik dengan trigger count 1 dan diperkecil scale kali sebelum
+    dibandingkan dengan background. Gerak = fraksi piksel yang berubah > threshold melebihi min_fraction.
+    Setelah trigger, detektor baru aktif lagi setelah adegan tenang kembali (produk sudah lewat).
+    """
+
+    def __init__(self, acq, interval=0.2, scale=8, threshold=20, min_fraction=0.01, learning_rate=0.1):
+        self.acq = acq
+        self.interval = interval
+        self.scale = scale
+        self.threshold = threshold
+        self.min_fraction = min_fraction
+        self.learning_rate = learning_rate
+        self.probes = 0
+        self.triggers = 0
+        self.armed = True
+        self._background = None
+        self._next_probe = 0.0
+
+    def _small(self, frame):
+        gray = frame[:, :, 0] if frame.shape[2] == 1 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape
+        small = cv2.resize(gray, (max(1, w // self.scale), max(1, h // self.scale)), interpolation=cv2.INTER_AREA)
+        return small.astype(np.float32)
+
+    def wait(self, timeout):
+        """Probe sampai ada gerak (burst sudah di-trigger, True) atau timeout detik habis (False)."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return False
+            if now < self._next_probe:
+                time.sleep(min(self._next_probe, deadline) - now)
+                continue
+            self._next_probe = now + self.interval
+            frame = self.acq.probe()
+            if frame is None:
+                continue
+            self.probes += 1
+            small = self._small(frame)
+            if self._background is None or self._background.shape != small.shape:
+                self._background = small
+                continue
+            moving = np.count_nonzero(cv2.absdiff(small, self._background) > self.threshold) > self.min_fraction * small.size
+            if not moving:
+                # Background hanya diperbarui saat tenang agar produk tidak ikut dipelajari
+                cv2.accumulateWeighted(small, self._background, self.learning_rate)
+                self.armed = True
+                continue
+            if self.armed:
+                self.armed = False
+                self.triggers += 1
+                self.acq.trigger()
+                return True